@@ -1,32 +1,35 @@
-# MainCodeFile.py v4.1
+# MainCodeFile.py v4.8
+# Startup only builds the window and the visible tab; other tabs are built the
+# first time they are shown, and settings/status loading runs in the background
+# after the first paint (gui_code/startup_worker.py)
 
 import sys
-import shutil
 import logging
-import re  # Added missing import for regex
 from pathlib import Path
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QPushButton, QLabel,
-    QTextEdit, QTabWidget, QListWidget, QAbstractItemView, QProgressBar, QFileDialog,
-    QMessageBox
+    QTabWidget, QListView, QAbstractItemView, QProgressBar, QFileDialog,
+    QMessageBox, QCheckBox
 )
-from PyQt5.QtCore import Qt
+from collections import deque
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QDragEnterEvent, QDropEvent
 
-# Add access to the sorting logic files
-sys.path.append(str(Path(__file__).resolve().parent / "file_sorter_code"))
-sys.path.append(str(Path(__file__).resolve().parent / "movie_code"))
-import file_sorter
-from settings.settings_manager import get_settings_widget
-
 # LOGGING SETUP:
-# Configures logging to write to gui_log.txt
-log_file = "gui_log.txt"
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# One queue-backed setup for the whole app (see log_code/log_setup.py)
+from log_code.log_setup import setup_logging
+setup_logging()
+
+from settings.settings_manager import get_settings_widget
+from settings.settings_service import get_settings_service
+from status.status_checker import get_status_summary
+from gui_code.sort_workers import SortFilesWorker, SortMoviesWorker
+from gui_code.watch_worker import WatchWorker
+from gui_code.ingest_worker import IngestWorker
+from gui_code.file_queue_model import FileQueueModel
+from gui_code.log_view import LogView, level_for_message, MAX_LINES
+from gui_code.startup_worker import StartupWorker
+from file_sorter_code.progress_tracker import format_progress
 
 # UTILITY FUNCTION:
 # Finds the root directory of the MediaSorter application
@@ -38,16 +41,20 @@ def find_mediasorter_root():
     return current
 
 # CUSTOM WIDGET CLASS:
-# Custom QListWidget with drag-and-drop functionality for files
-class FileListWidget(QListWidget):
+# List view over a FileQueueModel with drag-and-drop for files. Rows are
+# drawn straight from the model, so a million queued paths stay cheap.
+class FileListWidget(QListView):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.setDragDropMode(QAbstractItemView.DropOnly)
         self.setAlternatingRowColors(True)
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
         self.main_window = None
-        self.file_paths = []  # Store actual file paths
+        self.queue_model = FileQueueModel(self)
+        self.setModel(self.queue_model)
 
     def set_main_window(self, main_window):
         self.main_window = main_window
@@ -74,39 +81,12 @@ class FileListWidget(QListWidget):
             event.ignore()
     
     def add_files(self, file_paths):
-        for file_path in file_paths:
-            path = Path(file_path)
-            if path.is_file():
-                self.file_paths.append(str(path))
-                self.addItem(path.name)
+        # Duplicates are skipped; non-files are removed once the background stat reaches them
+        self.queue_model.add_paths(file_paths)
 
 # CUSTOM WIDGET CLASS:
-# Custom QListWidget with drag-and-drop functionality for movie files
-class MovieListWidget(QListWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setAcceptDrops(True)
-        self.setDragDropMode(QAbstractItemView.DropOnly)
-        self.setAlternatingRowColors(True)
-        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.main_window = None
-
-    def set_main_window(self, main_window):
-        self.main_window = main_window
-
-    def dragEnterEvent(self, event):
-        if event.mimeData().hasUrls():
-            event.accept()
-        else:
-            event.ignore()
-
-    def dragMoveEvent(self, event):
-        if event.mimeData().hasUrls():
-            event.setDropAction(Qt.CopyAction)
-            event.accept()
-        else:
-            event.ignore()
-
+# Same list view for movie files; drops are handed to the main window
+class MovieListWidget(FileListWidget):
     def dropEvent(self, event):
         if event.mimeData().hasUrls() and self.main_window:
             file_paths = [url.toLocalFile() for url in event.mimeData().urls()]
@@ -127,13 +107,26 @@ class MainWindow(QMainWindow):
 
         self.main_folder = find_mediasorter_root()
         self.sorting_folder = self.main_folder / "0.1 Sorting Folder"
-        self.sorting_folder.mkdir(parents=True, exist_ok=True)
 
-        # Initialize movie files list
-        self.movie_files = []
+        # Background sort workers (None while idle)
+        self.sort_worker = None
+        self.movie_worker = None
+        self.watch_worker = None
+        # One ingest worker per drop on the main window
+        self.ingest_workers = []
+        self.startup_worker = None
+
+        # Tabs not built yet (placeholder widget -> builder), and log lines
+        # waiting for the Logs tab
+        self._tab_builders = {}
+        self.logs_display = None
+        self._log_backlog = deque(maxlen=MAX_LINES)
 
         self.initUI()
 
+        # Runs once the event loop starts, i.e. after the window is first painted
+        QTimer.singleShot(0, self.start_background_startup)
+
     # UI INITIALIZATION:
     # Creates the main UI components and tab structure
     def initUI(self):
@@ -144,6 +137,7 @@ class MainWindow(QMainWindow):
 
         self.tabs = QTabWidget()
         # --- Status Tab ---
+        # Shown first, so built right away; the summary arrives from the startup worker
         self.status_tab = QWidget()
         self.status_layout = QVBoxLayout()
 
@@ -153,37 +147,50 @@ class MainWindow(QMainWindow):
         self.status_tab.setLayout(self.status_layout)
         self.tabs.addTab(self.status_tab, "Status")
 
-        self.update_status_tab()
-
         layout.addWidget(self.tabs)
 
-        self.tabs.addTab(self.create_sort_tab(), "Sort Files")
-        self.tabs.addTab(self.create_settings_tab(), "Settings")
-        self.tabs.addTab(self.create_logs_tab(), "Logs")
-        self.tabs.addTab(self.create_status_tab(), "Status")
-        self.tabs.addTab(self.create_movies_tab(), "Movies")
+        self.add_lazy_tab(self.create_sort_tab, "Sort Files")
+        self.add_lazy_tab(self.create_settings_tab, "Settings")
+        self.add_lazy_tab(self.create_logs_tab, "Logs")
+        self.add_lazy_tab(self.create_status_tab, "Status")
+        self.add_lazy_tab(self.create_movies_tab, "Movies")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+
+    # LAZY TABS:
+    # Each tab starts as an empty placeholder and is built the first time it is shown
+    def add_lazy_tab(self, builder, title):
+        placeholder = QWidget()
+        placeholder_layout = QVBoxLayout()
+        placeholder_layout.setContentsMargins(0, 0, 0, 0)
+        placeholder.setLayout(placeholder_layout)
+        self._tab_builders[placeholder] = builder
+        self.tabs.addTab(placeholder, title)
+
+    def on_tab_changed(self, index):
+        self.ensure_tab_built(self.tabs.widget(index))
+
+    def ensure_tab_built(self, placeholder):
+        builder = self._tab_builders.pop(placeholder, None)
+        if builder is not None:
+            placeholder.layout().addWidget(builder())
+
+    # BACKGROUND STARTUP:
+    # Settings validation and status parsing can take seconds on a sleeping network share
+    def start_background_startup(self):
+        self.startup_worker = StartupWorker(self.sorting_folder, self)
+        self.startup_worker.settings_ready.connect(self.on_settings_ready)
+        self.startup_worker.status_ready.connect(self.status_label.setText)
+        self.startup_worker.start()
+
+    def on_settings_ready(self):
+        # Reload settings when the file changes instead of re-reading it per file
+        # (the watcher must be created on the GUI thread)
+        get_settings_service().attach_watcher()
 
     # STATUS TAB FUNCTIONALITY:
-    # Updates the status tab with information from the log file
+    # Updates the status tab with information from the log file (new lines only)
     def update_status_tab(self):
-        log_path = Path("file_sorter_log.txt")
-        total, sorted_count, unsorted_count, last_file = 0, 0, 0, "N/A"
-
-        if log_path.exists():
-            lines = log_path.read_text(encoding="utf-8").splitlines()
-            for line in lines:
-                if "Processing:" in line:
-                    total += 1
-                    last_match = re.search(r"Processing: (.+?)$", line)
-                    if last_match:
-                        last_file = last_match.group(1)
-                if "Successfully moved" in line:
-                    sorted_count += 1
-                if "Failed to move" in line:
-                    unsorted_count += 1
-
-        status_msg = f"Total Files Processed: {total}\nSorted: {sorted_count}\nUnsorted: {unsorted_count}\nLast File: {last_file}"
-        self.status_label.setText(status_msg)
+        self.status_label.setText(get_status_summary())
 
     # SORT TAB CREATION:
     # Creates the "Sort Files" tab for sorting general media files
@@ -205,13 +212,31 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(0)
         layout.addWidget(self.progress_bar)
 
+        # Files, data, speed and time left for the running batch
+        self.sort_stats_label = QLabel("")
+        layout.addWidget(self.sort_stats_label)
+
         add_files_button = QPushButton("Add Files")
         add_files_button.clicked.connect(self.add_files)
         layout.addWidget(add_files_button)
 
-        sort_button = QPushButton("Sort Now")
-        sort_button.clicked.connect(self.sort_files)
-        layout.addWidget(sort_button)
+        self.sort_button = QPushButton("Sort Now")
+        self.sort_button.clicked.connect(self.sort_files)
+        layout.addWidget(self.sort_button)
+
+        self.sort_pause_button = QPushButton("Pause")
+        self.sort_pause_button.setEnabled(False)
+        self.sort_pause_button.clicked.connect(lambda: self.toggle_pause(self.sort_worker, self.sort_pause_button))
+        layout.addWidget(self.sort_pause_button)
+
+        self.sort_cancel_button = QPushButton("Cancel")
+        self.sort_cancel_button.setEnabled(False)
+        self.sort_cancel_button.clicked.connect(lambda: self.cancel_worker(self.sort_worker))
+        layout.addWidget(self.sort_cancel_button)
+
+        self.watch_toggle = QCheckBox("Watch sorting folder (sort new files automatically)")
+        self.watch_toggle.toggled.connect(self.toggle_watch_mode)
+        layout.addWidget(self.watch_toggle)
 
         return tab
 
@@ -221,15 +246,14 @@ class MainWindow(QMainWindow):
         return get_settings_widget()
 
     # LOGS TAB CREATION:
-    # Creates the logs tab that displays application logs
+    # Creates the logs tab (buffered, capped and filterable by level)
     def create_logs_tab(self):
-        tab = QWidget()
-        layout = QVBoxLayout()
-        tab.setLayout(layout)
-        self.logs_display = QTextEdit()
-        self.logs_display.setReadOnly(True)
-        layout.addWidget(self.logs_display)
-        return tab
+        self.logs_display = LogView()
+        # Lines logged before the tab was first opened
+        for message, level in self._log_backlog:
+            self.logs_display.append(message, level)
+        self._log_backlog.clear()
+        return self.logs_display
 
     # STATUS TAB CREATION:
     # Creates another status tab (seems to be duplicated in the code)
@@ -260,14 +284,27 @@ class MainWindow(QMainWindow):
         add_button.clicked.connect(self.add_movie_files)
         layout.addWidget(add_button)
 
-        sort_button = QPushButton("Sort Movies")
-        sort_button.clicked.connect(self.sort_movies)
-        layout.addWidget(sort_button)
+        self.movie_sort_button = QPushButton("Sort Movies")
+        self.movie_sort_button.clicked.connect(self.sort_movies)
+        layout.addWidget(self.movie_sort_button)
+
+        self.movie_pause_button = QPushButton("Pause")
+        self.movie_pause_button.setEnabled(False)
+        self.movie_pause_button.clicked.connect(lambda: self.toggle_pause(self.movie_worker, self.movie_pause_button))
+        layout.addWidget(self.movie_pause_button)
+
+        self.movie_cancel_button = QPushButton("Cancel")
+        self.movie_cancel_button.setEnabled(False)
+        self.movie_cancel_button.clicked.connect(lambda: self.cancel_worker(self.movie_worker))
+        layout.addWidget(self.movie_cancel_button)
 
         self.movie_progress = QProgressBar()
         self.movie_progress.setValue(0)
         layout.addWidget(self.movie_progress)
 
+        self.movie_stats_label = QLabel("")
+        layout.addWidget(self.movie_stats_label)
+
         return tab
 
     # DRAG AND DROP EVENT HANDLING:
@@ -281,22 +318,37 @@ class MainWindow(QMainWindow):
 
     def dropEvent(self, event: QDropEvent):
         logging.info("Main Window Drop Event Triggered")
-        for url in event.mimeData().urls():
-            file_path = Path(url.toLocalFile())
-            try:
-                if file_path.is_file():
-                    destination = self.sorting_folder / file_path.name
-                    shutil.move(str(file_path), str(destination))
-                    self.log_action(f"Moved file to sorting folder: {destination}")
-                elif file_path.is_dir():
-                    for item in file_path.iterdir():
-                        dest = self.sorting_folder / item.name
-                        shutil.move(str(item), str(dest))
-                    self.log_action(f"Moved file from folder to sorting folder: {dest}")
-                else:
-                    self.log_action(f"Skipped unsupported item: {file_path}")
-            except Exception as e:
-                self.log_action(f"Error moving {file_path}: {e}")
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if not paths:
+            event.ignore()
+            return
+        event.accept()
+
+        # Walk and move in the background; folders are searched recursively for media files
+        worker = IngestWorker(paths, self.sorting_folder, self)
+        worker.progress.connect(self.on_ingest_progress)
+        worker.ingest_finished.connect(
+            lambda moved, failed, cancelled: self.on_ingest_finished(worker, moved, failed, cancelled))
+        worker.failed.connect(lambda error: self.on_ingest_failed(worker, error))
+        self.ingest_workers.append(worker)
+        worker.start()
+        self.log_action(f"Bringing {len(paths)} dropped item(s) into the sorting folder...")
+
+    def on_ingest_progress(self, done, message):
+        self.log_action(message, level_for_message(message))
+        self.statusBar().showMessage(f"Moved {done} file(s) into the sorting folder")
+
+    def on_ingest_finished(self, worker, moved, failed, cancelled):
+        self.ingest_workers.remove(worker)
+        summary = f"Drop finished. Moved: {moved}, Failed: {failed}"
+        if cancelled:
+            summary = f"Drop cancelled. Moved: {moved}, Failed: {failed}"
+        self.log_action(summary)
+        self.statusBar().showMessage(summary, 5000)
+
+    def on_ingest_failed(self, worker, error):
+        self.ingest_workers.remove(worker)
+        self.log_action(f"Error bringing in dropped files: {error}", logging.ERROR)
 
     # FILE HANDLING METHODS:
     # Methods for adding and sorting general files
@@ -308,57 +360,140 @@ class MainWindow(QMainWindow):
 
     # Updated sort_files method to process files in the GUI list
     def sort_files(self):
-        file_paths = self.file_list.file_paths
+        if self.sort_worker is not None:
+            return
+
+        file_paths = self.file_list.queue_model.paths()
         if not file_paths:
             QMessageBox.information(self, "No Files", "No files to sort. Please add files first.")
             return
 
         total_files = len(file_paths)
         self.progress_bar.setMaximum(total_files)
+        self.progress_bar.setValue(0)
+        self.sort_stats_label.setText("")
         self.log_action(f"Starting to sort {total_files} files...")
 
-        try:
-            # Import the button sorter
-            from file_sorter_code.file_sorter_button import process_gui_files
-            
-            # First, get the current settings
-            from settings.settings_toggle_switch import get_season_folder_path
-            sorting_path = get_season_folder_path()
-            
-            # Log where we're sorting to
-            if sorting_path != "0.1 Sorting Folder":
-                self.log_action(f"Using custom sorting folder: {sorting_path}")
-            else:
-                self.log_action("Using default sorting folder")
-
-            # Update progress callback
-            def update_progress(current, total, message):
-                self.progress_bar.setValue(current)
-                self.log_action(message)
-
-            # Process the files
-            total, sorted_count, unsorted_count = process_gui_files(file_paths, update_progress)
-            
-            # Clear the list after sorting
-            self.file_list.clear()
-            self.file_list.file_paths = []
-            
-            # Show results
+        # First, get the current settings
+        from settings.settings_toggle_switch import get_season_folder_path
+        sorting_path = get_season_folder_path()
+
+        # Log where we're sorting to
+        if sorting_path != "0.1 Sorting Folder":
+            self.log_action(f"Using custom sorting folder: {sorting_path}")
+        else:
+            self.log_action("Using default sorting folder")
+
+        # Run the batch on a background thread
+        self.sort_done_paths = set()
+        self.sort_worker = SortFilesWorker(file_paths, self)
+        self.sort_worker.progress.connect(self.on_sort_progress)
+        self.sort_worker.file_result.connect(self.on_sort_file_result)
+        self.sort_worker.batch_finished.connect(self.on_sort_finished)
+        self.sort_worker.failed.connect(self.on_sort_failed)
+
+        self.set_sort_running(True)
+        self.sort_worker.start()
+
+    # Coalesced by the worker's ProgressTracker, so this runs a few times a second at most
+    def on_sort_progress(self, snapshot):
+        self.progress_bar.setMaximum(max(snapshot.files_total, 1))
+        self.progress_bar.setValue(snapshot.files_done)
+        self.sort_stats_label.setText(format_progress(snapshot))
+
+    def on_sort_file_result(self, file_path, outcome, message):
+        self.sort_done_paths.add(file_path)
+        self.log_action(message, level_for_message(message))
+
+    def on_sort_finished(self, total, sorted_count, unsorted_count, cancelled):
+        # Keep anything that was not processed (e.g. after a cancel) in the list
+        self.file_list.queue_model.remove_paths(self.sort_done_paths)
+        remaining = self.file_list.queue_model.rowCount()
+
+        self.sort_worker = None
+        self.set_sort_running(False)
+
+        # Show results
+        if cancelled:
+            self.log_action(f"Sorting cancelled. Sorted: {sorted_count}, Unsorted: {unsorted_count}, Remaining: {remaining}")
+        else:
             self.log_action(f"Sorting complete. Total: {total}, Sorted: {sorted_count}, Unsorted: {unsorted_count}")
-            QMessageBox.information(
-                self, 
-                "Sorting Complete", 
-                f"Successfully processed {total} files.\n"
-                f"Sorted: {sorted_count}\n"
-                f"Unsorted: {unsorted_count}"
-            )
-            
-            # Update the status tab
-            self.update_status_tab()
-            
-        except Exception as e:
-            self.log_action(f"Error during sorting: {e}")
-            QMessageBox.critical(self, "Error", f"An error occurred while sorting files: {e}")
+        QMessageBox.information(
+            self,
+            "Sorting Cancelled" if cancelled else "Sorting Complete",
+            f"Successfully processed {len(self.sort_done_paths)} of {total} files.\n"
+            f"Sorted: {sorted_count}\n"
+            f"Unsorted: {unsorted_count}"
+        )
+
+        # Update the status tab
+        self.update_status_tab()
+
+    def on_sort_failed(self, error):
+        self.sort_worker = None
+        self.set_sort_running(False)
+        self.log_action(f"Error during sorting: {error}", logging.ERROR)
+        QMessageBox.critical(self, "Error", f"An error occurred while sorting files: {error}")
+
+    def set_sort_running(self, running):
+        self.sort_button.setEnabled(not running)
+        self.sort_pause_button.setEnabled(running)
+        self.sort_pause_button.setText("Pause")
+        self.sort_cancel_button.setEnabled(running)
+
+    # WORKER CONTROLS:
+    # Pause/resume and cancel for whichever background batch a button belongs to
+    def toggle_pause(self, worker, button):
+        if worker is None:
+            return
+        if worker.control.is_paused():
+            worker.control.resume()
+            button.setText("Pause")
+            self.log_action("Sorting resumed.")
+        else:
+            worker.control.pause()
+            button.setText("Resume")
+            self.log_action("Sorting paused after the current file.")
+
+    def cancel_worker(self, worker):
+        if worker is None:
+            return
+        worker.control.cancel()
+        self.log_action("Cancelling after the current file...")
+
+    # WATCH MODE:
+    # Sorts files dropped into the sorting folder as soon as they finish arriving
+    def toggle_watch_mode(self, enabled):
+        if enabled and self.watch_worker is None:
+            self.watch_worker = WatchWorker(self.sorting_folder, self)
+            self.watch_worker.progress.connect(self.on_watch_progress)
+            self.watch_worker.batch_finished.connect(self.on_watch_batch_finished)
+            self.watch_worker.failed.connect(self.on_watch_failed)
+            self.watch_worker.start()
+            self.log_action(f"Watching {self.sorting_folder} for new files")
+        elif not enabled and self.watch_worker is not None:
+            self.stop_watch_mode()
+            self.log_action("Watch mode stopped")
+
+    def stop_watch_mode(self):
+        if self.watch_worker is not None:
+            self.watch_worker.stop()
+            self.watch_worker.wait()
+            self.watch_worker = None
+
+    def on_watch_progress(self, current, total, message):
+        self.log_action(message, level_for_message(message))
+
+    def on_watch_batch_finished(self, total, sorted_count, unsorted_count):
+        self.log_action(f"Watch mode sorted a batch. Total: {total}, Sorted: {sorted_count}, Unsorted: {unsorted_count}")
+        self.update_status_tab()
+
+    def on_watch_failed(self, error):
+        self.watch_worker = None
+        self.watch_toggle.blockSignals(True)
+        self.watch_toggle.setChecked(False)
+        self.watch_toggle.blockSignals(False)
+        self.log_action(f"Watch mode stopped with an error: {error}", logging.ERROR)
 
     # MOVIE HANDLING METHODS:
     def add_movie_files(self):
@@ -368,56 +503,94 @@ class MainWindow(QMainWindow):
 
     def add_movie_files_from_drop(self, file_paths):
         """Process movie files that were dropped into the list widget"""
-        for file_path in file_paths:
-            path = Path(file_path)
-            if path.is_file():
-                self.movie_files.append(str(path))  # Store the full path as string
-                self.movie_list.addItem(path.name)  # Show only filename in list
-
+        self.movie_list.queue_model.add_paths(file_paths)
         self.log_action(f"Added {len(file_paths)} movie files for sorting")
 
     def sort_movies(self):
+        if self.movie_worker is not None:
+            return
+
         movie_folder = self.main_folder / "Movies"
         movie_folder.mkdir(exist_ok=True)
 
-        total_movies = len(self.movie_files)
+        movie_files = self.movie_list.queue_model.paths()
+        total_movies = len(movie_files)
         if total_movies == 0:
             self.log_action("No movie files to sort.")
             return
 
         self.movie_progress.setMaximum(total_movies)
-        sorted_count = 0
-
-        # Import the sort_movie function here to avoid circular imports
-        from movie_handler import sort_movie
-
-        for idx, file_path in enumerate(self.movie_files, start=1):
-            try:
-                path = Path(file_path)
-                if path.exists() and path.is_file():
-                    # Call the sort_movie function
-                    if sort_movie(path, movie_folder):
-                        sorted_count += 1
-                        self.log_action(f"Sorted movie: {path.name}")
-                    else:
-                        self.log_action(f"Failed to sort movie: {path.name}")
-                else:
-                    self.log_action(f"Movie file not found: {file_path}")
-            except Exception as e:
-                self.log_action(f"Error sorting movie {Path(file_path).name}: {e}")
-
-            self.movie_progress.setValue(idx)
-
-        # Clear the list after sorting
-        self.movie_list.clear()
-        self.movie_files = []
-        self.log_action(f"Movie sorting complete. Sorted {sorted_count} of {total_movies} movies.")
+        self.movie_progress.setValue(0)
+        self.movie_stats_label.setText("")
+
+        # Run the batch on a background thread
+        self.movie_done_paths = set()
+        self.movie_worker = SortMoviesWorker(movie_files, movie_folder, self)
+        self.movie_worker.progress.connect(self.on_movie_progress)
+        self.movie_worker.file_result.connect(self.on_movie_file_result)
+        self.movie_worker.batch_finished.connect(self.on_movies_finished)
+        self.movie_worker.failed.connect(self.on_movies_failed)
+
+        self.set_movies_running(True)
+        self.movie_worker.start()
+
+    def on_movie_progress(self, snapshot):
+        self.movie_progress.setMaximum(max(snapshot.files_total, 1))
+        self.movie_progress.setValue(snapshot.files_done)
+        self.movie_stats_label.setText(format_progress(snapshot))
+
+    def on_movie_file_result(self, file_path, outcome, message):
+        self.movie_done_paths.add(file_path)
+        self.log_action(message, level_for_message(message))
+
+    def on_movies_finished(self, total, sorted_count, unsorted_count, cancelled):
+        # Keep anything that was not processed (e.g. after a cancel) in the list
+        self.movie_list.queue_model.remove_paths(self.movie_done_paths)
+        remaining = self.movie_list.queue_model.rowCount()
+
+        self.movie_worker = None
+        self.set_movies_running(False)
+
+        if cancelled:
+            self.log_action(f"Movie sorting cancelled. Sorted {sorted_count} of {total} movies, {remaining} left in the list.")
+        else:
+            self.log_action(f"Movie sorting complete. Sorted {sorted_count} of {total} movies.")
+
+    def on_movies_failed(self, error):
+        self.movie_worker = None
+        self.set_movies_running(False)
+        self.log_action(f"Error during movie sorting: {error}", logging.ERROR)
+
+    def set_movies_running(self, running):
+        self.movie_sort_button.setEnabled(not running)
+        self.movie_pause_button.setEnabled(running)
+        self.movie_pause_button.setText("Pause")
+        self.movie_cancel_button.setEnabled(running)
 
     # LOGGING METHOD:
-    # Adds messages to the log display and logs to file
-    def log_action(self, message):
-        self.logs_display.append(message)
-        logging.info(message)
+    # Adds messages to the log display (shown on its next flush) and logs to file
+    def log_action(self, message, level=logging.INFO):
+        if self.logs_display is not None:
+            self.logs_display.append(message, level)
+        else:
+            self._log_backlog.append((message, level))
+        logging.log(level, message)
+
+    # SHUTDOWN HANDLING:
+    # Stops any running batch between files before the window closes
+    def closeEvent(self, event):
+        for worker in [self.sort_worker, self.movie_worker] + self.ingest_workers:
+            if worker is not None:
+                worker.control.cancel()
+                worker.wait()
+        self.stop_watch_mode()
+        if self.startup_worker is not None:
+            self.startup_worker.wait()
+        # Tabs that were never opened have no queue to shut down
+        for list_widget in [getattr(self, "file_list", None), getattr(self, "movie_list", None)]:
+            if list_widget is not None:
+                list_widget.queue_model.shutdown()
+        super().closeEvent(event)
 
 # APPLICATION ENTRY POINT:
 # Creates and runs the application when the script is executed directly
@@ -0,0 +1,34 @@
+# bench_classifier.py v1.1
+# Measures how many filenames per second the shared classifier handles
+# Run from the "0.3 Brain Folder": python -m benchmarks.bench_classifier --count 1000000
+
+import argparse
+import time
+
+from file_sorter_code import media_classifier
+from benchmarks.corpus import build_corpus, parse_scale
+
+def run(names):
+    start = time.perf_counter()
+    media_classifier.classify_many(names)
+    return len(names) / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Classifier throughput benchmark")
+    parser.add_argument("--count", type=parse_scale, default=1_000_000,
+                        help="number of names in the corpus (or 1k, 100k, 1m)")
+    args = parser.parse_args()
+
+    names = build_corpus(args.count)
+
+    media_classifier.clear_cache()
+    cold = run(names)
+    # Every name is unique, so this pass measures repeats of the most recent names
+    warm = run(names[-media_classifier.CACHE_SIZE:])
+
+    print(f"Corpus: {len(names)} names")
+    print(f"Cold (unique names): {cold:,.0f} names/sec")
+    print(f"Warm (cached names): {warm:,.0f} names/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# bench_pipelines.py v1.0
+# End-to-end throughput of the sort pipelines on a synthetic corpus:
+#   classify           names/sec through media_classifier (cold and cached)
+#   process_gui_files  files/sec and MB/s for the GUI/CLI TV pipeline
+#   process_files      files/sec and MB/s for the direct-run TV pipeline
+#   sort_movie         files/sec and MB/s for the movie pipeline
+# Results are saved as JSON so runs can be compared with --compare.
+#
+# Run from the "0.3 Brain Folder":
+#   python -m benchmarks.bench_pipelines --scale 100k --file-size 1M [--tmpfs] [--library-dir D:/bench]
+#
+# Each pipeline runs in a fresh process inside a throwaway copy of the Brain
+# Folder, so the library, catalog, journals and logs it writes never touch the
+# real MediaSorter folders and every run starts with cold caches. Generated
+# files are sparse: with the input and library on one filesystem the moves are
+# renames; put --library-dir on another device to measure real copies.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.corpus import (build_corpus, make_media_files, parse_scale, parse_size, default_scratch,
+                               TV_KINDS, MOVIE_KINDS)
+
+BRAIN_FOLDER = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Pipeline benchmarks: name -> corpus styles
+PIPELINES = {
+    "process_gui_files": TV_KINDS,
+    "process_files": TV_KINDS,
+    "sort_movie": MOVIE_KINDS,
+}
+
+# Left out of the sandbox copy: runtime state and the user's settings
+SANDBOX_IGNORE = shutil.ignore_patterns("__pycache__", "results", "journals", "*.db", "*.db-*", "*.txt",
+                                        "*.txt.*", "*.jsonl", "*.jsonl.*", "user_settings.json")
+
+# CLASSIFIER BENCHMARK:
+def bench_classify(count, seed):
+    from file_sorter_code import media_classifier
+    from benchmarks.bench_classifier import run
+
+    names = build_corpus(count, seed)
+    media_classifier.clear_cache()
+    cold = run(names)
+    warm = run(names[-media_classifier.CACHE_SIZE:])
+    return {"benchmark": "classify", "names": count, "names_per_sec": round(cold),
+            "cached_names_per_sec": round(warm)}
+
+# PIPELINE BENCHMARKS (PARENT SIDE):
+def make_sandbox(root):
+    """Copy the Brain Folder's code into root/MediaSorter so the app's folders resolve there."""
+    brain = Path(root) / "MediaSorter" / BRAIN_FOLDER.name
+    shutil.copytree(BRAIN_FOLDER, brain, ignore=SANDBOX_IGNORE)
+    return brain
+
+def bench_pipeline(name, count, args):
+    input_root = Path(tempfile.mkdtemp(prefix="mediasorter-bench-", dir=args.input_scratch))
+    library_root = Path(tempfile.mkdtemp(prefix="mediasorter-bench-", dir=args.library_dir or args.input_scratch))
+    try:
+        brain = make_sandbox(library_root)
+        names = build_corpus(count, args.seed, PIPELINES[name])
+        input_dir = input_root / "input"
+        start = time.perf_counter()
+        make_media_files(input_dir, names, args.file_size)
+        setup_seconds = time.perf_counter() - start
+
+        result_file = input_root / "result.json"
+        command = [sys.executable, "-m", "benchmarks.bench_pipelines", "--child", name,
+                   "--input", str(input_dir), "--result", str(result_file)]
+        if args.jobs:
+            command += ["--jobs", str(args.jobs)]
+        # process_files prints a line per file; that cost stays in, the output does not
+        subprocess.run(command, cwd=brain, stdout=subprocess.DEVNULL, check=True)
+        result = json.loads(result_file.read_text(encoding="utf-8"))
+    finally:
+        if not args.keep:
+            shutil.rmtree(input_root, ignore_errors=True)
+            shutil.rmtree(library_root, ignore_errors=True)
+
+    seconds = result["seconds"]
+    result.update({
+        "benchmark": name,
+        "files_per_sec": round(result["files"] / seconds, 1) if seconds else None,
+        "mb_per_sec": round(result["bytes"] / (1024 * 1024) / seconds, 1) if seconds else None,
+        "setup_seconds": round(setup_seconds, 3),
+    })
+    return result
+
+# PIPELINE BENCHMARKS (CHILD SIDE):
+# Runs inside the sandbox; only the pipeline call itself is timed
+def run_child(name, input_dir, result_file, jobs):
+    from log_code.log_setup import setup_logging, shutdown_logging
+    from file_sorter_code.file_sorter_button import find_mediasorter_root
+
+    setup_logging()
+    paths = sorted(os.path.join(input_dir, entry) for entry in os.listdir(input_dir))
+    total_bytes = sum(os.stat(path).st_size for path in paths)
+
+    if name == "process_gui_files":
+        from file_sorter_code.file_sorter_button import process_gui_files
+        start = time.perf_counter()
+        total, sorted_count, unsorted_count = process_gui_files(paths, jobs=jobs)
+    elif name == "process_files":
+        from file_sorter_code import file_sorter
+        start = time.perf_counter()
+        total, sorted_count, unsorted_count = file_sorter.process_files(paths)
+    else:
+        from movie_code.movie_handler import sort_movie
+        movies_folder = find_mediasorter_root() / "Movies"
+        start = time.perf_counter()
+        sorted_count = sum(1 for path in paths if sort_movie(path, movies_folder))
+        total, unsorted_count = len(paths), len(paths) - sorted_count
+    seconds = time.perf_counter() - start
+    # Writing out the queued log records is part of the pipeline's cost
+    shutdown_logging()
+    seconds_with_log_flush = time.perf_counter() - start
+
+    Path(result_file).write_text(json.dumps({
+        "files": len(paths), "bytes": total_bytes, "total": total, "sorted": sorted_count,
+        "unsorted": unsorted_count, "seconds": round(seconds, 4),
+        "seconds_with_log_flush": round(seconds_with_log_flush, 4),
+    }), encoding="utf-8")
+
+# COMPARISON:
+# Headline number per benchmark (higher is better)
+HEADLINE = {"classify": "names_per_sec"}
+
+def compare(old, new):
+    old_results = {entry["benchmark"]: entry for entry in old["results"]}
+    for entry in new["results"]:
+        metric = HEADLINE.get(entry["benchmark"], "files_per_sec")
+        before = old_results.get(entry["benchmark"], {}).get(metric)
+        after = entry.get(metric)
+        if not before or not after:
+            continue
+        change = (after - before) / before * 100
+        flag = "  <-- slower" if change < -10 else ""
+        print(f"  {entry['benchmark']:<18} {metric}: {before:,.1f} -> {after:,.1f} ({change:+.1f}%){flag}")
+
+# MAIN ENTRY POINT:
+def main():
+    parser = argparse.ArgumentParser(description="Sort pipeline throughput benchmarks")
+    parser.add_argument("--scale", type=parse_scale, default=1_000,
+                        help="corpus size: 1k, 100k, 1m or a number (default: 1k)")
+    parser.add_argument("--file-size", type=parse_size, default=1024 * 1024,
+                        help="size of each sparse fake file, e.g. 0, 64K, 10M (default: 1M)")
+    parser.add_argument("--only", action="append", choices=["classify"] + list(PIPELINES),
+                        help="run only this benchmark (repeatable)")
+    parser.add_argument("--tmpfs", action="store_true", help="create the input files on /dev/shm")
+    parser.add_argument("--scratch", help="folder for the input files (default: temp folder)")
+    parser.add_argument("--library-dir", help="folder for the sandboxed library (default: same as the input)")
+    parser.add_argument("--jobs", type=int, default=None, help="transfer workers per destination device")
+    parser.add_argument("--seed", type=int, default=1, help="corpus random seed")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/bench-<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--keep", action="store_true", help="keep the generated files and sandboxes")
+    # Internal: one pipeline run inside a sandbox
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.input, args.result, args.jobs)
+        return
+
+    args.input_scratch = Path(args.scratch) if args.scratch else default_scratch(args.tmpfs)
+    selected = args.only or ["classify"] + list(PIPELINES)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "file_size": args.file_size,
+        "input_dir": str(args.input_scratch),
+        "library_dir": str(args.library_dir or args.input_scratch),
+        "jobs": args.jobs,
+        "seed": args.seed,
+        "results": [],
+    }
+    for name in selected:
+        print(f"Running {name} on {args.scale:,} files...", flush=True)
+        if name == "classify":
+            result = bench_classify(args.scale, args.seed)
+            print(f"  {result['names_per_sec']:,} names/sec (cached: {result['cached_names_per_sec']:,})")
+        else:
+            result = bench_pipeline(name, args.scale, args)
+            print(f"  {result['files_per_sec']:,} files/sec, {result['mb_per_sec']:,} MB/s "
+                  f"({result['sorted']} sorted, {result['unsorted']} unsorted in {result['seconds']:.2f}s)")
+        report["results"].append(result)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        print(f"Compared with {args.compare}:")
+        compare(json.loads(Path(args.compare).read_text(encoding="utf-8")), report)
+
+if __name__ == "__main__":
+    main()
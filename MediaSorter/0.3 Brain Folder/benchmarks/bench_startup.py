@@ -0,0 +1,144 @@
+# bench_startup.py v1.0
+# Startup-time guard: how long a fresh process takes to import the sorting
+# modules and (with PyQt5 installed) to put the main window on screen, and
+# whether importing file_sorter creates any folders.
+#
+# Run from the "0.3 Brain Folder":
+#   python -m benchmarks.bench_startup [--repeat 5] [--max-seconds 2.0] [--compare OLD.json]
+#
+# Exits with 1 when a target's median is over --max-seconds or an import has
+# side effects, so it can gate a release.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.bench_pipelines import make_sandbox, RESULTS_DIR
+
+# Each target prints the seconds it took as its last line of output
+IMPORT_TEMPLATE = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+# Time to first paint: from before the app is imported until the window has
+# been shown and one round of events (the first paint) has been processed
+WINDOW_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+import MainCodeFile
+window = MainCodeFile.MainWindow()
+window.show()
+app.processEvents()
+elapsed = time.perf_counter() - start
+window.close()
+print(elapsed)
+"""
+
+TARGETS = {
+    "import_file_sorter": IMPORT_TEMPLATE.format(module="file_sorter_code.file_sorter"),
+    "import_cli": IMPORT_TEMPLATE.format(module="mediasorter.cli"),
+    "window_first_paint": WINDOW_SCRIPT,
+}
+
+# Targets that must not create anything next to the Brain Folder
+SIDE_EFFECT_FREE = {"import_file_sorter", "import_cli"}
+
+def have_pyqt():
+    try:
+        import PyQt5.QtWidgets  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+# MEASUREMENT:
+def time_target(name, repeat):
+    """Run one target repeat times, each in a fresh process inside a fresh sandbox."""
+    samples = []
+    side_effects = set()
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    for _ in range(repeat):
+        root = Path(tempfile.mkdtemp(prefix="mediasorter-startup-"))
+        try:
+            brain = make_sandbox(root)
+            before = set(os.listdir(brain.parent))
+            output = subprocess.run([sys.executable, "-c", TARGETS[name]], cwd=brain, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            samples.append(float(output.strip().splitlines()[-1]))
+            side_effects |= set(os.listdir(brain.parent)) - before
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    return {
+        "benchmark": name,
+        "runs": repeat,
+        "median_seconds": round(statistics.median(samples), 4),
+        "min_seconds": round(min(samples), 4),
+        "max_seconds": round(max(samples), 4),
+        "created": sorted(side_effects),
+    }
+
+def compare(old, new):
+    old_results = {entry["benchmark"]: entry for entry in old["results"]}
+    for entry in new["results"]:
+        before = old_results.get(entry["benchmark"], {}).get("median_seconds")
+        if not before:
+            continue
+        after = entry["median_seconds"]
+        change = (after - before) / before * 100
+        flag = "  <-- slower" if change > 10 else ""
+        print(f"  {entry['benchmark']:<20} {before:.3f}s -> {after:.3f}s ({change:+.1f}%){flag}")
+
+# MAIN ENTRY POINT:
+def main():
+    parser = argparse.ArgumentParser(description="Startup time benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh processes per target (default: 5)")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="fail if any target's median startup time is above this")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/startup-<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    names = [name for name in TARGETS if name != "window_first_paint" or have_pyqt()]
+    if "window_first_paint" not in names:
+        print("PyQt5 is not installed; skipping window_first_paint")
+
+    report = {"created": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+              "platform": platform.platform(), "results": []}
+    failed = False
+    for name in names:
+        result = time_target(name, args.repeat)
+        report["results"].append(result)
+        line = f"{name:<20} median {result['median_seconds']:.3f}s (min {result['min_seconds']:.3f}s)"
+        if name in SIDE_EFFECT_FREE and result["created"]:
+            line += f"  <-- created {', '.join(result['created'])} at import"
+            failed = True
+        if args.max_seconds is not None and result["median_seconds"] > args.max_seconds:
+            line += f"  <-- over the {args.max_seconds:.2f}s budget"
+            failed = True
+        print(line)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"startup-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        print(f"Compared with {args.compare}:")
+        compare(json.loads(Path(args.compare).read_text(encoding="utf-8")), report)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
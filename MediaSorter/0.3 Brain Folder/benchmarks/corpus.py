@@ -0,0 +1,124 @@
+# corpus.py v1.0
+# Synthetic media corpora for the benchmarks: realistic filenames at 1k/100k/1M
+# scale and sparse fake media files, so throughput can be measured without
+# real video on disk. Everything is seeded and reproducible.
+
+import os
+import random
+from pathlib import Path
+
+SERIES = ["The Office US", "Breaking Bad", "Space Pirate Captain Harlock", "Doctor Who", "Chernobyl",
+          "Mr Robot", "The Expanse", "Cowboy Bebop", "Better Call Saul", "Dark"]
+MOVIES = ["Blade Runner", "Harlock Space Pirate", "Spirited Away", "The Matrix", "Arrival",
+          "Heat", "Alien", "Paprika", "Dune Part Two", "Perfect Blue"]
+TAGS = ["1080p.WEB-DL.x264", "720p.HDTV", "2160p.BluRay.x265", "WEBRip", "DVDRip.XviD"]
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# Filename styles and how often each shows up
+TV_KINDS = {"scene": 5, "long": 2, "episode": 1, "junk": 1}
+MOVIE_KINDS = {"movie": 1}
+MIXED_KINDS = {"scene": 4, "long": 2, "episode": 1, "movie": 2, "junk": 1}
+
+# Episodes per generated series (20 seasons of 30)
+SERIES_SIZE = 600
+
+# NAME GENERATOR:
+def _letters(n):
+    """0 -> "A", 25 -> "Z", 26 -> "Ab"... (keeps generated titles free of digits)."""
+    text = chr(65 + n % 26)
+    n //= 26
+    while n:
+        text += chr(97 + n % 26)
+        n //= 26
+    return text
+
+def make_name(kind, rng, i):
+    """
+    One filename of the given style. i picks a distinct destination, so the
+    corpus exercises real placements rather than batch duplicates: every
+    SERIES_SIZE names share one series (one folder per season), and every
+    movie gets its own title.
+    """
+    group, slot = divmod(i, SERIES_SIZE)
+    series = f"{SERIES[group % len(SERIES)]} {_letters(group)}"
+    season, episode = slot // 30 + 1, slot % 30 + 1
+    if kind == "scene":
+        # Show.Name.S01E02.1080p.WEB-DL.x264.mkv
+        return (f"{series.replace(' ', '.')}.S{season:02d}E{episode:02d}."
+                f"{rng.choice(TAGS)}{rng.choice(['.mkv', '.mkv', '.mp4'])}")
+    if kind == "long":
+        # Show Name Season 1 Episode 2.mp4
+        return f"{series} Season {season} Episode {episode}{rng.choice(['.mp4', '.avi'])}"
+    if kind == "episode":
+        # Show Name Extras - Episode 3.avi (no season)
+        return f"{series} Extras - Episode {slot + 1}.avi"
+    if kind == "movie":
+        # Movie.Name.2013.1080p.mkv / Movie Name 2013.mp4
+        movie = f"{MOVIES[i % len(MOVIES)]} {_letters(i)}"
+        year = rng.randint(1950, 2024)
+        if rng.random() < 0.5:
+            return f"{movie.replace(' ', '.')}.{year}.{rng.choice(TAGS)}.mkv"
+        return f"{movie} {year}.mp4"
+    return f"holiday_video_{i}.mov"
+
+def build_corpus(count, seed=1, kinds=None):
+    """
+    Return count unique filenames.
+
+    Args:
+        count: Number of names
+        seed: Random seed; the same seed always gives the same corpus
+        kinds: {style: weight} from TV_KINDS, MOVIE_KINDS or MIXED_KINDS
+            (default: MIXED_KINDS)
+    """
+    rng = random.Random(seed)
+    kinds = kinds or MIXED_KINDS
+    styles, weights = list(kinds), list(kinds.values())
+    return [make_name(rng.choices(styles, weights)[0], rng, i) for i in range(count)]
+
+def parse_scale(value):
+    """Turn "1k", "100k", "1m" or a plain number into a count."""
+    value = str(value).strip().lower()
+    if value in SCALES:
+        return SCALES[value]
+    multipliers = {"k": 1_000, "m": 1_000_000}
+    if value and value[-1] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+# FAKE MEDIA FILES:
+def parse_size(value):
+    """Turn "512", "64K", "10M" or "2G" into bytes."""
+    value = str(value).strip().upper()
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+def make_media_files(folder, names, size):
+    """
+    Create one sparse file of size bytes per name in folder. Sparse files take
+    almost no space, so even 1M of them fits on tmpfs; a cross-device move still
+    has to read and write every byte.
+
+    Returns:
+        list of the created paths (as strings)
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in names:
+        path = os.path.join(folder, name)
+        with open(path, "wb") as f:
+            if size:
+                f.truncate(size)
+        paths.append(path)
+    return paths
+
+def default_scratch(tmpfs=False):
+    """Scratch folder for generated files: /dev/shm with tmpfs (if present), else the temp folder."""
+    import tempfile
+    if tmpfs and os.path.isdir("/dev/shm"):
+        return Path("/dev/shm")
+    return Path(tempfile.gettempdir())
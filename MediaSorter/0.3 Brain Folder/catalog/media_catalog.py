@@ -0,0 +1,286 @@
+# media_catalog.py v1.3
+# Embedded SQLite catalog of everything placed in the TV and movie libraries.
+# Lets the movie sorter check for duplicates with an indexed lookup instead of
+# a stat on a (possibly remote) share. The TV pipeline lists each destination
+# folder once per batch instead, so it only records the episodes it places and
+# never crawls the TV library. Also stores the series folder names the series
+# resolver indexes.
+
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+
+from file_sorter_code.media_classifier import parse_tv_name, parse_movie_name
+from file_sorter_code.transfer_engine import is_partial_name, app_folders_in
+
+CATALOG_FILE = Path(__file__).resolve().parent / "media_catalog.db"
+
+# Names written by sort_movie: "Title (2013).mkv"
+STANDARD_MOVIE_NAME = re.compile(r"^(?P<title>.+?) (?P<year>\(\d{4}\))$")
+
+# Rows buffered by CatalogBatch before they are written in one transaction
+BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    path TEXT PRIMARY KEY,
+    series TEXT NOT NULL,
+    series_key TEXT NOT NULL,
+    season INTEGER NOT NULL,
+    episode INTEGER NOT NULL,
+    size INTEGER,
+    added REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_episodes_series ON episodes (series_key, season, episode);
+
+CREATE TABLE IF NOT EXISTS movies (
+    path TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    year TEXT NOT NULL,
+    size INTEGER,
+    added REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_movies_title ON movies (title_key, year);
+
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    bootstrapped REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS series_folders (
+    root TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (root, name)
+);
+
+CREATE TABLE IF NOT EXISTS series_roots (
+    root TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+# PATH AND ROW HELPERS:
+def path_key(path):
+    """Normalize a path so lookups match however the path was spelled."""
+    return os.path.normcase(os.path.abspath(str(path)))
+
+def episode_row(destination, size=None):
+    """Build an episodes row from a standardized destination path, or None."""
+    tv = parse_tv_name(Path(destination).name)
+    if not tv:
+        return None
+    series, season, episode = tv
+    return (path_key(destination), series, series.lower(), int(season), int(episode), size, time.time())
+
+def movie_row(destination, size=None):
+    """Build a movies row from a standardized destination path."""
+    destination = Path(destination)
+    match = STANDARD_MOVIE_NAME.match(destination.stem)
+    if match:
+        title, year = match.group("title"), match.group("year")
+    else:
+        title, year = parse_movie_name(destination.name)
+    return (path_key(destination), title, title.lower(), year, size, time.time())
+
+# MEDIA CATALOG CLASS:
+# One shared connection guarded by a lock, so sort worker threads can use it
+class MediaCatalog:
+    def __init__(self, db_path=CATALOG_FILE):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # LOOKUPS:
+    def contains(self, path):
+        key = path_key(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM episodes WHERE path = ? UNION ALL SELECT 1 FROM movies WHERE path = ? LIMIT 1",
+                (key, key)).fetchone()
+        return row is not None
+
+    def is_duplicate(self, path):
+        """Indexed duplicate check. A hit is confirmed on disk so stale rows don't block a sort."""
+        if not self.contains(path):
+            return False
+        if Path(path).exists():
+            return True
+        logging.info(f"Catalog entry no longer on disk, removing: {path}")
+        self.remove([path])
+        return False
+
+    def movies(self, title, year=None):
+        """Return [(title, year, path), ...] matching a title (and "(2013)"-style year if given)."""
+        query = "SELECT title, year, path FROM movies WHERE title_key = ?"
+        params = [title.lower()]
+        if year:
+            query += " AND year = ?"
+            params.append(year)
+        with self._lock:
+            return self._conn.execute(query, params).fetchall()
+
+    # WRITES:
+    def add_episodes(self, rows):
+        rows = [row for row in rows if row]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def add_movies(self, rows):
+        rows = [row for row in rows if row]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO movies VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def remove(self, paths):
+        keys = [(path_key(path),) for path in paths]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM episodes WHERE path = ?", keys)
+            self._conn.executemany("DELETE FROM movies WHERE path = ?", keys)
+
+    # SERIES FOLDERS:
+    # Folder names under a TV root, with the root's mtime when they were last listed
+    def series_folders(self, root):
+        """Return ([folder name, ...], mtime_ns or None if the root was never listed)."""
+        key = path_key(root)
+        with self._lock:
+            names = [row[0] for row in self._conn.execute(
+                "SELECT name FROM series_folders WHERE root = ? ORDER BY name", (key,))]
+            row = self._conn.execute("SELECT mtime_ns FROM series_roots WHERE root = ?", (key,)).fetchone()
+        return names, row[0] if row else None
+
+    def update_series_folders(self, root, added=(), removed=(), mtime_ns=None):
+        key = path_key(root)
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO series_folders VALUES (?, ?)",
+                                   [(key, name) for name in added])
+            self._conn.executemany("DELETE FROM series_folders WHERE root = ? AND name = ?",
+                                   [(key, name) for name in removed])
+            if mtime_ns is not None:
+                self._conn.execute("INSERT OR REPLACE INTO series_roots VALUES (?, ?)", (key, mtime_ns))
+
+    # BOOTSTRAP:
+    # One-time crawl of an existing library so the catalog starts out complete
+    def is_bootstrapped(self, root):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM roots WHERE path = ?", (path_key(root),)).fetchone()
+        return row is not None
+
+    def ensure_bootstrapped(self, root, kind):
+        if not self.is_bootstrapped(root):
+            self.bootstrap(root, kind)
+
+    def bootstrap(self, root, kind):
+        """
+        Crawl root ("tv": Series/Season/file, "movies": Movie/file). Returns rows added.
+        The root is only marked as bootstrapped after a complete crawl; if part
+        of it could not be read (NAS offline), the next batch tries again.
+        """
+        start = time.perf_counter()
+        depth = 2 if kind == "tv" else 1
+        make_row = episode_row if kind == "tv" else movie_row
+        add_rows = self.add_episodes if kind == "tv" else self.add_movies
+
+        added = 0
+        batch = []
+        errors = []
+        for entry in _scan_files(root, depth, errors, exclude=app_folders_in(root)):
+            if is_partial_name(entry.name):
+                continue
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            row = make_row(entry.path, size)
+            if row:
+                batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                add_rows(batch)
+                added += len(batch)
+                batch = []
+        add_rows(batch)
+        added += len(batch)
+
+        if errors:
+            logging.warning(f"Catalog crawl of {root} was incomplete ({len(errors)} folder(s) unreadable); "
+                            f"it will be retried next batch")
+            return added
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO roots VALUES (?, ?, ?)", (path_key(root), kind, time.time()))
+        logging.info(f"Catalog bootstrapped {added} {kind} files from {root} in {time.perf_counter() - start:.2f}s")
+        return added
+
+def _scan_files(folder, depth, errors, exclude=frozenset()):
+    """
+    Yield DirEntry objects for files exactly `depth` folders below folder,
+    skipping top-level entries named in exclude. Folders that can't be listed
+    are appended to errors.
+    """
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name in exclude:
+                    continue
+                try:
+                    if depth == 0 and entry.is_file():
+                        yield entry
+                    elif depth > 0 and entry.is_dir(follow_symlinks=False):
+                        yield from _scan_files(entry.path, depth - 1, errors)
+                except OSError:
+                    continue
+    except OSError as e:
+        logging.warning(f"Catalog could not scan {folder}: {e}")
+        errors.append(folder)
+
+# CATALOG BATCH:
+# Buffers rows from a sort batch and writes them with executemany
+class CatalogBatch:
+    def __init__(self, catalog, kind, batch_size=BATCH_SIZE):
+        self.catalog = catalog
+        self.kind = kind
+        self.batch_size = batch_size
+        self._rows = []
+
+    def add(self, destination, size=None):
+        row = episode_row(destination, size) if self.kind == "tv" else movie_row(destination, size)
+        if row:
+            self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        rows, self._rows = self._rows, []
+        try:
+            if self.kind == "tv":
+                self.catalog.add_episodes(rows)
+            else:
+                self.catalog.add_movies(rows)
+        except sqlite3.Error as e:
+            logging.error(f"Failed to update media catalog: {e}")
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_media_catalog():
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = MediaCatalog()
+        return _catalog
@@ -0,0 +1,203 @@
+# batch_journal.py v1.1
+# Append-only write-ahead journal for sort batches. Every planned move is
+# written up front, then "started" and "committed" records as transfers run.
+# A finished batch deletes its journal; one left on disk means the batch was
+# interrupted (or had files that could not be moved at all) and can be picked
+# up again with resume_batch() in sort_pipeline.
+# Paths are stored absolute, so resume works from any working directory.
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from pathlib import Path
+
+JOURNAL_DIR = Path(__file__).resolve().parent.parent / "catalog" / "journals"
+
+# fsync the journal after this many records (every record is flushed to the OS
+# right away, so only a power cut can lose the unsynced tail)
+SYNC_EVERY = 200
+
+# Journals of batches running in this process
+_active = set()
+_active_lock = threading.Lock()
+
+# PROCESS CHECK:
+# A journal whose owner is still running belongs to a live batch, not a crashed one
+def _process_alive(pid):
+    if os.name == "nt":
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+# BATCH JOURNAL CLASS:
+class BatchJournal:
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._file = None
+        self.failures = 0
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            with _active_lock:
+                _active.add(self.path)
+        except OSError as e:
+            # Sorting still works without a journal; it just can't be resumed
+            logging.error(f"Cannot open batch journal {self.path}: {e}")
+
+    @classmethod
+    def create(cls, plan, unsorted_folder, journal_dir=JOURNAL_DIR):
+        """Start a journal for plan and write every planned operation to it."""
+        batch_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        journal = cls(Path(journal_dir) / f"batch-{batch_id}.jsonl")
+        journal._write({"event": "batch", "id": batch_id, "pid": os.getpid(), "created": time.time(),
+                        "series_base": os.path.abspath(plan.series_base),
+                        "unsorted_folder": os.path.abspath(unsorted_folder)})
+        for index, op in enumerate(plan.operations()):
+            journal._write({"event": "planned", "op": index, "source": os.path.abspath(op.source),
+                            "action": op.action,
+                            "destination": os.path.abspath(op.destination) if op.destination else None,
+                            "reason": op.reason})
+        journal.sync()
+        return journal
+
+    def _write(self, record):
+        if self._file is None:
+            return
+        with self._lock:
+            try:
+                self._file.write(json.dumps(record) + "\n")
+                self._file.flush()
+                self._unsynced += 1
+                if self._unsynced >= SYNC_EVERY:
+                    os.fsync(self._file.fileno())
+                    self._unsynced = 0
+            except (OSError, ValueError) as e:
+                logging.error(f"Batch journal write failed, disabling it: {e}")
+                self._file = None
+
+    def sync(self):
+        if self._file is None:
+            return
+        with self._lock:
+            try:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+            except OSError as e:
+                logging.error(f"Batch journal sync failed: {e}")
+
+    # RECORDS:
+    def started(self, index):
+        self._write({"event": "started", "op": index})
+
+    def committed(self, index, outcome, placed=None):
+        self._write({"event": "committed", "op": index, "outcome": outcome,
+                     "placed": os.path.abspath(placed) if placed else None})
+
+    def failed(self, index):
+        """The file could not be moved anywhere; it stays unfinished so resume retries it."""
+        self.failures += 1
+        self._write({"event": "failed", "op": index})
+
+    def finish(self):
+        """Mark the batch complete and delete the journal."""
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Could not remove finished journal {self.path}: {e}")
+
+    def close(self):
+        """Close without finishing (the batch stays resumable)."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        with _active_lock:
+            _active.discard(self.path)
+
+# JOURNAL READING:
+class JournalState:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.batch_id = None
+        self.pid = None
+        self.created = None
+        self.series_base = None
+        self.unsorted_folder = None
+        self.planned = {}      # op index -> planned record
+        self.started = set()
+        self.committed = {}    # op index -> committed record
+        self.failed = set()    # op indexes that could not be moved at all
+
+    @property
+    def unfinished(self):
+        """Planned records that never committed, in plan order."""
+        return [record for index, record in sorted(self.planned.items()) if index not in self.committed]
+
+    @property
+    def in_progress(self):
+        return [self.planned[index] for index in sorted(self.started) if index not in self.committed]
+
+def load_journal(path):
+    """Read a journal. A torn last line (crash mid-write) is ignored."""
+    state = JournalState(path)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            event = record.get("event")
+            if event == "batch":
+                state.batch_id = record["id"]
+                state.pid = record.get("pid")
+                state.created = record.get("created")
+                state.series_base = Path(record["series_base"])
+                state.unsorted_folder = Path(record["unsorted_folder"])
+            elif event == "planned":
+                state.planned[record["op"]] = record
+            elif event == "started":
+                state.started.add(record["op"])
+            elif event == "committed":
+                state.committed[record["op"]] = record
+            elif event == "failed":
+                state.failed.add(record["op"])
+    return state
+
+def interrupted_journals(journal_dir=JOURNAL_DIR):
+    """Return JournalStates for batches that did not finish and whose process is gone."""
+    states = []
+    for path in sorted(Path(journal_dir).glob("batch-*.jsonl")):
+        try:
+            state = load_journal(path)
+        except OSError as e:
+            logging.warning(f"Cannot read journal {path}: {e}")
+            continue
+        if state.batch_id is None:
+            # Crashed before the header reached the disk: nothing was moved
+            path.unlink()
+            continue
+        with _active_lock:
+            if path in _active:
+                continue
+        if state.pid and state.pid != os.getpid() and _process_alive(state.pid):
+            continue
+        states.append(state)
+    return states
@@ -0,0 +1,240 @@
+# duplicate_detector.py v1.2
+# Decides whether two files really are the same: sizes first, then a fast
+# partial hash (head/middle/tail blocks), then a full streaming hash only when
+# needed. Bulk scans hash in a process pool (started with forkserver/spawn,
+# never fork, since the app has threads and open databases); the few files a
+# sort compares are hashed inline. Hashes are cached on disk keyed by
+# (device, inode, size, mtime), so unchanged files are never hashed twice.
+# Copies made by the transfer engine hash their data on the way through and
+# record both hashes here, so library files start out with a cache entry.
+
+import os
+import atexit
+import sqlite3
+import hashlib
+import logging
+import threading
+import multiprocessing
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+HASH_CACHE_FILE = Path(__file__).resolve().parent.parent / "catalog" / "hash_cache.db"
+
+# Size of each block read for the partial hash (1 MiB)
+BLOCK_SIZE = 1024 * 1024
+# Read size for full hashes (8 MiB)
+FULL_CHUNK_SIZE = 8 * 1024 * 1024
+# Fewer cache misses than this are hashed inline, even in a bulk scan
+POOL_MIN_FILES = 16
+
+# HASH FUNCTIONS:
+# Top-level so the process pool can pickle them
+def partial_hash(path):
+    """Hash the size plus the first, middle and last block of a file."""
+    size = os.path.getsize(path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=20)
+    with open(path, "rb") as f:
+        if size <= BLOCK_SIZE * 3:
+            digest.update(f.read())
+        else:
+            for offset in (0, size // 2 - BLOCK_SIZE // 2, size - BLOCK_SIZE):
+                f.seek(offset)
+                digest.update(f.read(BLOCK_SIZE))
+    return digest.hexdigest()
+
+def full_hash(path):
+    """Hash the whole file in streaming chunks."""
+    digest = new_full_hasher()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(FULL_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+_HASHERS = {"partial": partial_hash, "full": full_hash}
+
+# STREAMING HASHES:
+# Same results as partial_hash()/full_hash(), fed from data that is already
+# being read for another reason (a copy), given in order from offset 0
+class PartialHasher:
+    def __init__(self, size):
+        self.size = size
+        self._digest = hashlib.blake2b(str(size).encode(), digest_size=20)
+        if size <= BLOCK_SIZE * 3:
+            self._ranges = [(0, size)]
+        else:
+            middle = size // 2 - BLOCK_SIZE // 2
+            self._ranges = [(0, BLOCK_SIZE), (middle, middle + BLOCK_SIZE), (size - BLOCK_SIZE, size)]
+
+    def update(self, offset, data):
+        end = offset + len(data)
+        for start, stop in self._ranges:
+            if start < end and stop > offset:
+                self._digest.update(data[max(start, offset) - offset:min(stop, end) - offset])
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+def new_full_hasher():
+    """Empty hash object matching full_hash()."""
+    return hashlib.blake2b(digest_size=32)
+
+def _file_key(path):
+    stat = os.stat(path)
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+# HASH CACHE CLASS:
+# Stores partial/full hashes by (device, inode, size, mtime). A file that is
+# renamed keeps its entry; a file that changes gets a new one.
+class HashCache:
+    def __init__(self, db_path=HASH_CACHE_FILE):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS hashes (
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                partial TEXT,
+                full TEXT,
+                PRIMARY KEY (dev, ino, size, mtime_ns)
+            )""")
+        self._conn.commit()
+
+    def get(self, key, kind):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {kind} FROM hashes WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?", key).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, entries, kind):
+        """entries: iterable of (key, hash)."""
+        rows = [(*key, value) for key, value in entries]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO hashes (dev, ino, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                [row[:4] for row in rows])
+            self._conn.executemany(
+                f"UPDATE hashes SET {kind} = ? WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?",
+                [(row[4], *row[:4]) for row in rows])
+
+    def record(self, path, partial=None, full=None):
+        """Store hashes computed elsewhere for the file currently at path."""
+        key = _file_key(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO hashes (dev, ino, size, mtime_ns) VALUES (?, ?, ?, ?)", key)
+            self._conn.execute(
+                "UPDATE hashes SET partial = COALESCE(?, partial), full = COALESCE(?, full) "
+                "WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?", (partial, full, *key))
+
+# DUPLICATE DETECTOR CLASS:
+class DuplicateDetector:
+    def __init__(self, cache=None, max_workers=None):
+        self.cache = cache or HashCache()
+        self.max_workers = max_workers
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                # Forking a process that runs Qt, logging and SQLite threads can
+                # deadlock the child, so workers start from a clean interpreter
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+                atexit.register(self.shutdown)
+            return self._pool
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+                atexit.unregister(self.shutdown)
+
+    def hashes(self, paths, kind, bulk=False):
+        """
+        Return {path: hash} for paths, using the cache. Misses are hashed inline,
+        or in the process pool when bulk is set and there are enough of them.
+        """
+        results = {}
+        misses = {}
+        for path in paths:
+            try:
+                key = _file_key(path)
+            except OSError as e:
+                logging.warning(f"Cannot hash {path}: {e}")
+                continue
+            cached = self.cache.get(key, kind)
+            if cached:
+                results[path] = cached
+            else:
+                misses[path] = key
+
+        if misses:
+            hasher = _HASHERS[kind]
+            paths_to_hash = list(misses)
+            if bulk and len(paths_to_hash) >= POOL_MIN_FILES:
+                computed = list(self._get_pool().map(hasher, paths_to_hash, chunksize=8))
+            else:
+                # Not worth starting workers (or pickling) for a handful of files
+                computed = [hasher(path) for path in paths_to_hash]
+            self.cache.put_many(((misses[path], value) for path, value in zip(paths_to_hash, computed)), kind)
+            results.update(zip(paths_to_hash, computed))
+        return results
+
+    def is_identical(self, first, second):
+        """True only if both files have the same size, partial hash and full hash."""
+        first, second = str(first), str(second)
+        try:
+            if os.path.getsize(first) != os.path.getsize(second):
+                return False
+        except OSError:
+            return False
+        for kind in ("partial", "full"):
+            hashes = self.hashes([first, second], kind)
+            if len(hashes) != 2 or hashes[first] != hashes[second]:
+                return False
+        return True
+
+    def find_duplicates(self, paths):
+        """Group paths into lists of identical files (only groups of 2+ are returned)."""
+        by_size = defaultdict(list)
+        for path in paths:
+            try:
+                by_size[os.path.getsize(path)].append(str(path))
+            except OSError:
+                continue
+
+        groups = [group for group in by_size.values() if len(group) > 1]
+        for kind in ("partial", "full"):
+            candidates = [path for group in groups for path in group]
+            hashes = self.hashes(candidates, kind, bulk=True)
+            regrouped = []
+            for group in groups:
+                by_hash = defaultdict(list)
+                for path in group:
+                    if path in hashes:
+                        by_hash[hashes[path]].append(path)
+                regrouped.extend(same for same in by_hash.values() if len(same) > 1)
+            groups = regrouped
+        return groups
+
+_detector = None
+_detector_lock = threading.Lock()
+
+def get_duplicate_detector():
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = DuplicateDetector()
+        return _detector
@@ -0,0 +1,125 @@
+# file_scanner.py v1.1
+# Streaming folder walker built on os.scandir. Yields files one at a time so
+# callers can start working before a large folder tree has been listed, and
+# memory does not grow with the size of the tree.
+
+import os
+import logging
+from fnmatch import fnmatch
+from itertools import islice
+
+from file_sorter_code.transfer_engine import is_partial_name
+
+# File types worth sorting (videos and their subtitles)
+MEDIA_EXTENSIONS = {
+    ".mkv", ".mp4", ".m4v", ".avi", ".mov", ".wmv", ".mpg", ".mpeg", ".ts", ".m2ts",
+    ".webm", ".flv", ".vob", ".ogv", ".3gp",
+    ".srt", ".sub", ".idx", ".ass", ".ssa", ".vtt",
+}
+
+# ROOT FILE ENTRY:
+# Gives files passed in directly the same interface as os.DirEntry
+class _RootFile:
+    __slots__ = ("path", "name", "_stat")
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._stat = None
+
+    def is_file(self, follow_symlinks=True):
+        return True
+
+    def stat(self, follow_symlinks=True):
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+# PATTERN MATCHING:
+# Patterns match the file or folder name, or the path relative to the root if
+# they contain a slash ("Extras/*"). Matching is case-insensitive.
+def _matches(patterns, name, relative):
+    name, relative = name.lower(), relative.lower()
+    for pattern in patterns:
+        if fnmatch(relative if "/" in pattern else name, pattern.lower()):
+            return True
+    return False
+
+# FOLDER WALKER:
+def scan_entries(roots, extensions=None, include=None, exclude=None, max_depth=None):
+    """
+    Yield os.DirEntry objects for files under roots, recursively.
+
+    Callers that need sizes or times should use entry.stat(), which reuses
+    what the directory listing already returned where the OS provides it.
+
+    Args:
+        roots: Files and folders to scan. Files are yielded as-is whatever
+            their extension or the patterns.
+        extensions: Optional set of lowercase extensions to keep (".mkv")
+        include: Optional glob patterns; files must match one of them
+        exclude: Optional glob patterns; matching files and folders are skipped
+        max_depth: How many folder levels below a root to descend
+            (0 = only the root's own files, None = no limit)
+
+    Symlinked folders are not followed, so a link loop can't trap the walk,
+    and partial copies left by the transfer engine are never yielded.
+    """
+    include = list(include or [])
+    exclude = list(exclude or [])
+    for root in roots:
+        root = os.fspath(root)
+        if os.path.isfile(root):
+            yield _RootFile(root)
+        elif os.path.isdir(root):
+            yield from _walk(root, extensions, include, exclude, max_depth)
+        else:
+            logging.warning(f"Skipped unsupported item: {root}")
+
+def scan_files(roots, extensions=None, include=None, exclude=None, max_depth=None):
+    """Like scan_entries, but yields path strings."""
+    for entry in scan_entries(roots, extensions, include, exclude, max_depth):
+        yield entry.path
+
+def _walk(top, extensions, include, exclude, max_depth):
+    # Explicit stack of (folder, relative path, depth): no recursion limit, and
+    # only one directory handle is open at a time
+    stack = [(top, "", 0)]
+    while stack:
+        folder, relative, depth = stack.pop()
+        subfolders = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    entry_relative = f"{relative}{entry.name}"
+                    try:
+                        if exclude and _matches(exclude, entry.name, entry_relative):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            if max_depth is None or depth < max_depth:
+                                subfolders.append((entry.path, f"{entry_relative}/", depth + 1))
+                            continue
+                        if not entry.is_file() or is_partial_name(entry.name):
+                            continue
+                        if extensions is not None and os.path.splitext(entry.name)[1].lower() not in extensions:
+                            continue
+                        if include and not _matches(include, entry.name, entry_relative):
+                            continue
+                    except OSError as e:
+                        logging.warning(f"Skipped {entry.path}: {e}")
+                        continue
+                    yield entry
+        except OSError as e:
+            logging.warning(f"Cannot scan folder {folder}: {e}")
+            continue
+        stack.extend(reversed(subfolders))
+
+# CHUNKING:
+def iter_chunks(iterable, size):
+    """Yield lists of up to size items, pulling from iterable lazily."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -1,13 +1,20 @@
-# file_sorter.py v3.1
+# file_sorter.py v3.10
 # Updated to properly use custom sorting folder settings
+# Transfers now run in parallel per destination device
+# Uses the same plan/execute pipeline as the GUI sorter
+# Direct runs stream the sorting folder in chunks (recursively, unless it is
+# the custom season folder, which is also the TV library)
+# Direct runs honor MEDIASORTER_METRICS / MEDIASORTER_PROFILE (see sort_metrics.py)
+# Importing this module has no side effects: settings are read and folders are
+# created when a batch runs, not at import time
 
 from settings.settings_toggle_switch import get_season_folder_path, use_season_folder
-import json
-import os
-import shutil
+from file_sorter_code.sort_pipeline import build_plan, execute_plan
+from file_sorter_code.file_scanner import scan_files, iter_chunks
+from file_sorter_code.sort_metrics import profile_batch
+from log_code.log_setup import setup_logging
 import logging
 from pathlib import Path
-import re
 
 # UTILITY FUNCTION:
 # Finds the root directory of the MediaSorter application
@@ -16,138 +23,81 @@ def find_mediasorter_root():
     while current.name != 'MediaSorter':
         current = current.parent
     return current
-from time import sleep
 
 # LOGGING SETUP:
-# Configures logging to write to file_sorter_log.txt
-log_file = "file_sorter_log.txt"
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+# Direct runs set up the shared logging; when imported, the host app already has
+if __name__ == "__main__":
+    setup_logging()
 
 # FOLDER SETUP:
-# Defines and creates the necessary folders for sorting
-main_folder = find_mediasorter_root()
-
-# Get the correct sorting folder path
-if use_season_folder():
-    sorting_folder = Path(get_season_folder_path())
-    logging.info(f"Using custom sorting folder: {sorting_folder}")
-else:
-    sorting_folder = main_folder / "0.1 Sorting Folder"
-    logging.info("Using default sorting folder")
-
-unsorted_folder = main_folder / "0.2 Unsorted Folder"
-
-# Ensure necessary folders exist
-for folder in [sorting_folder, unsorted_folder]:
-    folder.mkdir(parents=True, exist_ok=True)
-
-logging.info("Folders verified.")
-
-# FILE PROCESSING FUNCTION:
-# The main function that processes and sorts files based on filename patterns
-def process_files(file_paths):
-    """Process a list of file paths and sort them."""
-    # Refresh the sorting folder path to ensure we have the latest settings
+# Works out the folders for sorting from the current settings
+def get_sort_folders():
+    """Return (main_folder, sorting_folder, unsorted_folder). Creates nothing on disk."""
+    main_folder = find_mediasorter_root()
     if use_season_folder():
         sorting_folder = Path(get_season_folder_path())
     else:
         sorting_folder = main_folder / "0.1 Sorting Folder"
-    
-    total_files = len(file_paths)
-    sorted_files = 0
-    unsorted_files = 0
-
-    print("Starting file processing...")  # Real-time progress feedback
-
-    for idx, file_path in enumerate(file_paths, start=1):
-        file = Path(file_path)
-        try:
-            if not file.is_file():
-                logging.warning(f"Skipped: {file} is not a file.")
-                print(f"[{idx}/{total_files}] Skipped: {file.name} is not a file.")
-                continue
-
-            logging.info(f"Processing file: {file.name}")
-            print(f"[{idx}/{total_files}] Processing: {file.name}")
-            sleep(0.1)  # Simulate processing time
+    return main_folder, sorting_folder, main_folder / "0.2 Unsorted Folder"
 
-            # Match for TV shows
-            match = re.match(r"(.+?)[\s._-]*(?:S(\d{2})[\s._-]*E(\d{2})|Season[\s]*(\d+)[\s]*Episode[\s]*(\d+))", file.name, re.IGNORECASE)
-            if match:
-                series_name = match.group(1)
-                season = match.group(2) or match.group(4)
-                episode = match.group(3) or match.group(5)
-
-            else:
-                # Try to catch 'Episode 3' with no season info
-                match_alt = re.match(r"(.+?)[\s._-]*Episode[\s]*(\d{1,3})", file.name, re.IGNORECASE)
-                if match_alt:
-                    series_name = match_alt.group(1)
-                    episode = match_alt.group(2)
-                    season = "01"  # Default season to 01
-
-            if match or match_alt:
-                # Normalize series name
-                series_name = re.sub(r"[._-]+", " ", series_name)
-                series_name = re.sub(r"\s+", " ", series_name).strip()
-
-                # Create target folders
-                series_folder = main_folder / series_name
-                season_folder = series_folder / f"{series_name} - Season {season.zfill(2)}"
-                season_folder.mkdir(parents=True, exist_ok=True)
-
-                # Standardize filename
-                standardized_name = f"{series_name} - S{season.zfill(2)}E{episode.zfill(2)}{file.suffix}"
-                destination = season_folder / standardized_name
-
-                if not destination.exists():
-                    shutil.move(str(file), str(destination))
-                    logging.info(f"Moved {file.name} to {destination}")
-                    print(f"Moved: {file.name} to {destination}")
-                    sorted_files += 1
-                else:
-                    move_to_unsorted(file, "Duplicate file.")
-                    unsorted_files += 1
-                continue
-
-            # If no match, move to unsorted
-            logging.warning(f"Filename format not recognized: {file.name}")
-            print(f"[{idx}/{total_files}] Unrecognized format: {file.name}")
-            move_to_unsorted(file, "Unrecognized format.")
-            unsorted_files += 1
-
-        except Exception as e:
-            logging.error(f"Unexpected error with file {file.name}: {e}")
-            print(f"[{idx}/{total_files}] Error: {e}")
-            move_to_unsorted(file, "Processing error.")
-            unsorted_files += 1
+def ensure_sort_folders():
+    """Create the sorting and unsorted folders if needed and return get_sort_folders()."""
+    main_folder, sorting_folder, unsorted_folder = get_sort_folders()
+    if use_season_folder():
+        logging.info(f"Using custom sorting folder: {sorting_folder}")
+    else:
+        logging.info("Using default sorting folder")
+    for folder in [sorting_folder, unsorted_folder]:
+        folder.mkdir(parents=True, exist_ok=True)
+    logging.info("Folders verified.")
+    return main_folder, sorting_folder, unsorted_folder
 
-    # Log summary
-    logging.info(f"Processing complete. Total files: {total_files}, Sorted: {sorted_files}, Unsorted: {unsorted_files}.")
+# FILE PROCESSING FUNCTION:
+# Plans the whole batch first, then executes it (see sort_pipeline.py)
+def _sort_batch(file_paths, done=0):
+    # done: files already handled earlier in the run, so progress keeps counting up
+    def show_progress(current, total, message):
+        print(f"[{done + current}/{done + total}] {message}")
+
+    # Series folders go in the main folder, as they always have for direct runs
+    main_folder, _, unsorted_folder = get_sort_folders()
+    plan = build_plan(file_paths, main_folder)
+    return execute_plan(plan, unsorted_folder, progress_callback=show_progress)
+
+def _report(totals):
+    total_files, sorted_files, unsorted_files = totals
     print(f"Processing complete. Total files: {total_files}, Sorted: {sorted_files}, Unsorted: {unsorted_files}.")
-    
-    return total_files, sorted_files, unsorted_files
 
-# UNSORTED FILE HANDLER:
-# Moves files that can't be sorted to the unsorted folder
-def move_to_unsorted(file, reason):
-    """Move a file to the unsorted folder with a reason."""
-    try:
-        destination = unsorted_folder / file.name
-        shutil.move(str(file), str(destination))
-        logging.info(f"Moved {file.name} to Unsorted Folder: {destination} (Reason: {reason})")
-        print(f"Moved {file.name} to Unsorted Folder: {destination} (Reason: {reason})")
-    except Exception as e:
-        logging.error(f"Failed to move {file.name} to Unsorted Folder: {e}")
-        print(f"Failed to move {file.name} to Unsorted Folder: {e}")
+def process_files(file_paths):
+    """Process a list of file paths and sort them."""
+    print("Starting file processing...")  # Real-time progress feedback
+    totals = _sort_batch(file_paths)
+    _report(totals)
+    return totals
+
+# STREAMING ENTRY POINT:
+# Files are planned and moved a chunk at a time, so the first files are sorted
+# while the rest of the tree is still being scanned
+STREAM_CHUNK = 500
+
+def process_stream(file_paths, chunk_size=STREAM_CHUNK):
+    """Sort an iterable of file paths (e.g. from scan_files) chunk by chunk, reporting once for the whole run."""
+    print("Starting file processing...")
+    totals = [0, 0, 0]
+    for chunk in iter_chunks(file_paths, chunk_size):
+        for i, count in enumerate(_sort_batch(chunk, done=totals[0])):
+            totals[i] += count
+    totals = tuple(totals)
+    _report(totals)
+    return totals
 
 # DIRECT EXECUTION CODE:
 # Code that runs when the script is executed directly
 if __name__ == "__main__":
-    # If running directly, process files in the sorting folder
-    file_list = list(sorting_folder.iterdir())
-    process_files([str(file) for file in file_list])
\ No newline at end of file
+    # If running directly, process everything under the sorting folder. The
+    # custom season folder is also the TV library (get_series_base), so only its
+    # top level is read; walking into it would re-sort every series folder.
+    sorting_folder = ensure_sort_folders()[1]
+    max_depth = 0 if use_season_folder() else None
+    with profile_batch("file_sorter"):
+        process_stream(scan_files([sorting_folder], exclude=["placement_file.txt"], max_depth=max_depth))
\ No newline at end of file
@@ -0,0 +1,124 @@
+# folder_watcher.py v1.0
+# Watches the sorting folder for new files. Uses inotify through ctypes on
+# Linux (no extra packages) and falls back to a cheap scandir poll elsewhere.
+
+import os
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import time
+
+# INOTIFY CONSTANTS:
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY | IN_DELETE | IN_MOVED_FROM | IN_DELETE_SELF | IN_MOVE_SELF
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# EVENT KINDS:
+# What the watch service needs to know about a file
+WRITTEN = "written"     # Closed after writing, or moved in: complete
+CHANGED = "changed"     # Created or modified: may still be growing
+REMOVED = "removed"     # Deleted or moved away
+RESCAN = "rescan"       # Events were lost; rescan the whole folder
+
+# INOTIFY WATCHER CLASS:
+class InotifyWatcher:
+    def __init__(self, folder):
+        self.folder = str(folder)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(self.folder), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {self.folder}")
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def wait(self, timeout):
+        """Block until events arrive or timeout (None = forever). Returns [(kind, name), ...]."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                events.append((RESCAN, None))
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                raise OSError(f"Watched folder went away: {self.folder}")
+            elif not name or mask & IN_ISDIR:
+                continue
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                events.append((WRITTEN, name))
+            elif mask & (IN_CREATE | IN_MODIFY):
+                events.append((CHANGED, name))
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                events.append((REMOVED, name))
+        return events
+
+# POLLING WATCHER CLASS:
+# Fallback for systems without inotify (e.g. Windows). Only compares names,
+# so each poll is a single directory listing.
+class PollingWatcher:
+    def __init__(self, folder, interval=2.0):
+        self.folder = str(folder)
+        self.interval = interval
+        self._known = self._list()
+
+    def _list(self):
+        try:
+            with os.scandir(self.folder) as entries:
+                return {entry.name for entry in entries if entry.is_file()}
+        except OSError as e:
+            raise OSError(f"Cannot list watched folder {self.folder}: {e}")
+
+    def close(self):
+        pass
+
+    def wait(self, timeout):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self._list()
+        events = [(CHANGED, name) for name in current - self._known]
+        events += [(REMOVED, name) for name in self._known - current]
+        self._known = current
+        return events
+
+def create_watcher(folder):
+    """Return an inotify watcher where available, otherwise a polling one."""
+    if hasattr(select, "select") and os.name == "posix":
+        try:
+            return InotifyWatcher(folder)
+        except (OSError, AttributeError) as e:
+            logging.info(f"inotify unavailable ({e}); polling {folder} instead")
+    return PollingWatcher(folder)
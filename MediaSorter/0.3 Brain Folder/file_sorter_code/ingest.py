@@ -0,0 +1,61 @@
+# ingest.py v1.1
+# Brings dropped files and folders into the sorting folder. Folders are walked
+# recursively and only media files are taken; each file is moved as soon as
+# it is found, so a big season pack starts arriving right away.
+# In "link" placement mode dropped files are linked in and the originals stay.
+
+import os
+import time
+import logging
+from pathlib import Path
+
+from file_sorter_code.file_scanner import scan_files, MEDIA_EXTENSIONS
+from file_sorter_code.transfer_engine import place_file_unique, keeps_source
+from log_code.log_setup import log_event
+
+def ingest_paths(paths, sorting_folder, progress_callback=None, control=None):
+    """
+    Move dropped files, and media files inside dropped folders, into sorting_folder.
+
+    Args:
+        paths: Dropped files and folders
+        sorting_folder: Where the files go
+        progress_callback: Optional (done, message) callback; the total is not
+            known up front because folders are walked while files are moved
+        control: Optional SortControl used to pause or cancel between files
+
+    Returns:
+        tuple: (moved_files, failed_files)
+    """
+    sorting_folder = Path(sorting_folder)
+    sorting_folder.mkdir(parents=True, exist_ok=True)
+    sorting_key = os.path.normcase(os.path.abspath(sorting_folder))
+    moved_files = 0
+    failed_files = 0
+
+    for file_path in scan_files(paths, extensions=MEDIA_EXTENSIONS):
+        if control and not control.checkpoint():
+            logging.info(f"Ingest cancelled after {moved_files} files.")
+            break
+
+        source = Path(file_path)
+        if os.path.normcase(os.path.abspath(source.parent)) == sorting_key:
+            # Already where it needs to be
+            continue
+        try:
+            size = os.stat(source).st_size
+            start = time.perf_counter()
+            destination, strategy = place_file_unique(source, sorting_folder / source.name)
+            moved_files += 1
+            verb = "Placed" if keeps_source(source) else "Moved"
+            message = f"{verb} file to sorting folder: {destination} ({strategy})"
+            log_event("ingest", source, "ingest", "sorted", size, time.perf_counter() - start, destination, message,
+                      strategy=strategy)
+        except Exception as e:
+            failed_files += 1
+            message = f"Error moving {source}: {e}"
+            log_event("ingest", source, "ingest", "failed", message=message, level=logging.ERROR)
+        if progress_callback:
+            progress_callback(moved_files + failed_files, message)
+
+    return moved_files, failed_files
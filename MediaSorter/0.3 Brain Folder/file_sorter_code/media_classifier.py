@@ -0,0 +1,89 @@
+# media_classifier.py v1.0
+# One place for the filename patterns used by the TV and movie sorters.
+# Patterns are compiled once and results are memoized per filename.
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# How many distinct filenames to remember
+CACHE_SIZE = 65536
+
+# COMPILED PATTERNS:
+# "Show.S01E02" / "Show Season 1 Episode 2"
+TV_PATTERN = re.compile(
+    r"(?P<series>.+?)[\s._-]*"
+    r"(?:S(?P<season>\d{2})[\s._-]*E(?P<episode>\d{2})"
+    r"|Season[\s]*(?P<season_long>\d+)[\s]*Episode[\s]*(?P<episode_long>\d+))",
+    re.IGNORECASE,
+)
+# "Show Episode 3" with no season info (season defaults to 01)
+EPISODE_ONLY_PATTERN = re.compile(r"(?P<series>.+?)[\s._-]*Episode[\s]*(?P<episode>\d{1,3})", re.IGNORECASE)
+# "Movie Name 2013.mkv"
+MOVIE_PATTERN = re.compile(r"^(?P<title>.*?)(?:\.|\s|-)?(?P<year>\d{4})(?:\.|\s|$|_)")
+
+_SEPARATORS = re.compile(r"[._-]+")
+_SPACES = re.compile(r"\s+")
+_TRAILING_DASHES = re.compile(r"[-\s]+$")
+
+# RESULT RECORD:
+# kind is "tv", "movie" or "unknown". TV results fill series/season/episode
+# (zero-padded), movie results fill title and year (e.g. "(2013)").
+MediaInfo = namedtuple("MediaInfo", ["kind", "series", "season", "episode", "title", "year"])
+
+UNKNOWN = MediaInfo("unknown", None, None, None, None, "")
+
+# NAME HELPERS:
+def normalize_series_name(name):
+    """Turn "The.Office-US" into "The Office US"."""
+    return _SPACES.sub(" ", _SEPARATORS.sub(" ", name)).strip()
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_tv_name(file_name):
+    """Return (series, season, episode) or None if the name isn't an episode."""
+    match = TV_PATTERN.match(file_name)
+    if match:
+        season = match.group("season") or match.group("season_long")
+        episode = match.group("episode") or match.group("episode_long")
+    else:
+        match = EPISODE_ONLY_PATTERN.match(file_name)
+        if not match:
+            return None
+        season = "01"
+        episode = match.group("episode")
+    return normalize_series_name(match.group("series")), season.zfill(2), episode.zfill(2)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_movie_name(file_name):
+    """Return (name, year). Year is "(2013)" or "" when the name has none."""
+    match = MOVIE_PATTERN.search(file_name)
+    if match:
+        name = match.group("title").strip().replace('.', ' ').replace('_', ' ')
+        year = f"({match.group('year')})"
+    else:
+        name = file_name.rsplit(".", 1)[0].replace('.', ' ').replace('_', ' ').strip()
+        year = ""
+
+    # Clean up name to remove trailing dashes or extra spaces
+    return _TRAILING_DASHES.sub("", name), year
+
+# CLASSIFIER FUNCTIONS:
+@lru_cache(maxsize=CACHE_SIZE)
+def classify(file_name):
+    """Classify a single filename as tv, movie or unknown."""
+    tv = parse_tv_name(file_name)
+    if tv:
+        series, season, episode = tv
+        return MediaInfo("tv", series, season, episode, None, "")
+    if MOVIE_PATTERN.search(file_name):
+        title, year = parse_movie_name(file_name)
+        return MediaInfo("movie", None, None, None, title, year)
+    return UNKNOWN
+
+def classify_many(file_names):
+    """Classify an iterable of filenames. Returns a list of MediaInfo in the same order."""
+    return [classify(name) for name in file_names]
+
+def clear_cache():
+    for cached in (classify, parse_tv_name, parse_movie_name):
+        cached.cache_clear()
@@ -0,0 +1,116 @@
+# progress_tracker.py v1.0
+# Turns per-file progress into coalesced updates: files and bytes done, a
+# moving-average transfer rate and an ETA, sent at most every
+# MIN_INTERVAL seconds no matter how fast small files finish.
+
+import time
+from collections import deque, namedtuple
+
+# Longest gap between updates the UI needs (4 per second)
+MIN_INTERVAL = 0.25
+# Seconds of history the moving-average rate is computed over
+RATE_WINDOW = 10.0
+
+ProgressSnapshot = namedtuple("ProgressSnapshot", [
+    "files_done", "files_total", "bytes_done", "bytes_total",
+    "bytes_per_second", "eta_seconds", "message", "finished",
+])
+
+# PROGRESS TRACKER CLASS:
+class ProgressTracker:
+    def __init__(self, callback, files_total=0, bytes_total=0, min_interval=MIN_INTERVAL, window=RATE_WINDOW,
+                 clock=time.monotonic):
+        """
+        Args:
+            callback: Called with a ProgressSnapshot, at most every min_interval seconds
+            files_total: Number of files expected so far (add_total() raises it later)
+            bytes_total: Their combined size (0 if unknown)
+            min_interval: Minimum seconds between updates (the final one is always sent)
+            window: Seconds of history used for the rate and ETA
+        """
+        self.callback = callback
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.min_interval = min_interval
+        self.window = window
+        self.clock = clock
+        self.files_done = 0
+        self.bytes_done = 0
+        self.message = ""
+        self._last_sent = None
+        # (time, files_done, bytes_done) samples inside the window
+        self._samples = deque([(clock(), 0, 0)])
+
+    def add_total(self, files, size=0):
+        """Add planned work, e.g. one more chunk of a streamed batch."""
+        self.files_total += files
+        self.bytes_total += size
+
+    def file_done(self, size=0, message=""):
+        """Record a finished file (size in bytes, if known) and maybe send an update."""
+        self.files_done += 1
+        self.bytes_done += size or 0
+        if message:
+            self.message = message
+        now = self.clock()
+        self._samples.append((now, self.files_done, self.bytes_done))
+        while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+            self._samples.popleft()
+        if self._last_sent is None or now - self._last_sent >= self.min_interval:
+            self._send(now, finished=False)
+
+    def finish(self):
+        """Send the final update."""
+        self._send(self.clock(), finished=True)
+
+    def _rates(self, now):
+        start_time, start_files, start_bytes = self._samples[0]
+        elapsed = now - start_time
+        if elapsed <= 0:
+            return 0.0, 0.0
+        return (self.files_done - start_files) / elapsed, (self.bytes_done - start_bytes) / elapsed
+
+    def snapshot(self, now=None, finished=False):
+        now = self.clock() if now is None else now
+        file_rate, byte_rate = self._rates(now)
+        eta = None
+        if not finished:
+            if self.bytes_total and byte_rate > 0:
+                eta = max(0.0, (self.bytes_total - self.bytes_done) / byte_rate)
+            elif file_rate > 0:
+                eta = (self.files_total - self.files_done) / file_rate
+        return ProgressSnapshot(self.files_done, self.files_total, self.bytes_done, self.bytes_total,
+                                byte_rate, eta, self.message, finished)
+
+    def _send(self, now, finished):
+        self._last_sent = now
+        if self.callback:
+            self.callback(self.snapshot(now, finished))
+
+# FORMATTING:
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.2f} TB"
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+def format_progress(snapshot):
+    """One-line summary, e.g. "120/400 files · 3.2 GB/10.5 GB · 85.3 MB/s · ETA 2m 10s"."""
+    parts = [f"{snapshot.files_done}/{snapshot.files_total} files"]
+    if snapshot.bytes_total:
+        parts.append(f"{format_bytes(snapshot.bytes_done)}/{format_bytes(snapshot.bytes_total)}")
+    parts.append(f"{snapshot.bytes_per_second / (1024 * 1024):.1f} MB/s")
+    if snapshot.finished:
+        parts.append("done")
+    elif snapshot.eta_seconds is not None:
+        parts.append(f"ETA {format_duration(snapshot.eta_seconds)}")
+    return " · ".join(parts)
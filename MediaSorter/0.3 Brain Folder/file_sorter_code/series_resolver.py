@@ -0,0 +1,236 @@
+# series_resolver.py v1.1
+# Maps a parsed series name onto the series folder that already exists in the
+# library, so "The.Office.US", "The Office (US)" and "the office us" all land
+# in one folder instead of three.
+#
+# Names are first reduced to a key (lowercase letters and digits only, so
+# "S.H.I.E.L.D" and "SHIELD" agree); an equal key is a match. Otherwise a
+# trigram index finds the closest folder, which is used if its similarity
+# clears MATCH_THRESHOLD, every number in the two names agrees ("Doctor Who
+# 2005" never merges into "Doctor Who") and neither name is the other plus
+# extra words ("The Office" never merges into "The Office US").
+# Folder names are kept in the media catalog and re-listed from disk only when
+# the library root's mtime changes. A name only joins the shared index once its
+# folder exists; new names within one plan are matched against each other
+# through a SeriesBatch, so dry runs and previews never leave anything behind.
+
+import os
+import re
+import logging
+import threading
+from pathlib import Path
+
+from catalog.media_catalog import get_media_catalog
+from file_sorter_code.transfer_engine import app_folders_in
+
+# Trigram Jaccard similarity a fuzzy match needs
+MATCH_THRESHOLD = 0.8
+
+_APOSTROPHES = re.compile(r"['’`]")
+_NON_WORD = re.compile(r"[\W_]+")
+
+# NAME KEYS:
+def series_words(name):
+    """"The.Office (US)" -> ["the", "office", "us"]."""
+    name = _APOSTROPHES.sub("", name.lower().replace("&", " and "))
+    return _NON_WORD.sub(" ", name).split()
+
+def series_key(name):
+    """"The.Office (US)" -> "theofficeus"."""
+    return "".join(series_words(name))
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+# SERIES INDEX CLASS:
+# Trigram index over a set of series names. Not thread-safe on its own.
+class SeriesIndex:
+    def __init__(self, threshold=MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._names = {}            # key -> folder name
+        self._grams = {}            # key -> trigram set
+        self._postings = {}         # trigram -> {key, ...}
+        self._numbers = {}          # key -> tuple of numbers in the name
+        self._words = {}            # key -> set of words in the name
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name):
+        words = series_words(name)
+        key = "".join(words)
+        if not key or key in self._names:
+            return
+        grams = _trigrams(key)
+        self._names[key] = name
+        self._grams[key] = grams
+        self._numbers[key] = tuple(word for word in words if word.isdigit())
+        self._words[key] = frozenset(words)
+        postings = self._postings
+        for gram in grams:
+            keys = postings.get(gram)
+            if keys is None:
+                postings[gram] = {key}
+            else:
+                keys.add(key)
+
+    def remove(self, name):
+        key = series_key(name)
+        if self._names.get(key) != name:
+            return
+        del self._names[key]
+        del self._numbers[key]
+        del self._words[key]
+        for gram in self._grams.pop(key):
+            keys = self._postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self._postings[gram]
+
+    def match(self, key, words):
+        """Name with exactly this key, else the best fuzzy match, else None."""
+        found = self._names.get(key)
+        if found is None:
+            found = self._best_match(key, words)
+        return found
+
+    def _best_match(self, key, words):
+        grams = _trigrams(key)
+        # Prefix filter: a folder with Jaccard >= threshold must share at least
+        # `needed` of these trigrams, so it contains one of the rarest
+        # len(grams) - needed + 1. Only those postings are scanned.
+        needed = max(1, int(self.threshold * len(grams) + 0.999))
+        postings = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        candidates = set()
+        for keys in postings[:len(grams) - needed + 1]:
+            candidates.update(keys)
+
+        numbers = tuple(word for word in words if word.isdigit())
+        words = frozenset(words)
+        best, best_score = None, self.threshold
+        for candidate in candidates:
+            if self._numbers[candidate] != numbers:
+                continue
+            other_words = self._words[candidate]
+            if words < other_words or other_words < words:
+                continue
+            other = self._grams[candidate]
+            common = len(grams & other)
+            score = common / (len(grams) + len(other) - common)
+            if score >= best_score and (best is None or score > best_score or candidate < best):
+                best, best_score = candidate, score
+        return self._names[best] if best is not None else None
+
+# SERIES RESOLVER CLASS:
+class SeriesResolver:
+    def __init__(self, root, catalog=None, threshold=MATCH_THRESHOLD):
+        self.root = Path(root)
+        self.catalog = catalog or get_media_catalog()
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._mtime_ns = None
+        self._stored = set()        # folder names as last listed on disk
+        self._excluded = app_folders_in(self.root)
+        self._library = SeriesIndex(threshold)
+
+    def refresh(self):
+        """Bring the index up to date: load it once, then re-list the root only if its mtime changed."""
+        with self._lock:
+            if not self._loaded:
+                names, self._mtime_ns = self.catalog.series_folders(self.root)
+                self._stored = set(names) - self._excluded
+                for name in self._stored:
+                    self._library.add(name)
+                stale = self._excluded.intersection(names)
+                if stale:
+                    self.catalog.update_series_folders(self.root, removed=stale)
+                self._loaded = True
+
+            try:
+                mtime_ns = os.stat(self.root).st_mtime_ns
+            except OSError:
+                return
+            if mtime_ns == self._mtime_ns:
+                return
+
+            try:
+                with os.scandir(self.root) as entries:
+                    on_disk = {entry.name for entry in entries
+                               if entry.name not in self._excluded and entry.is_dir(follow_symlinks=False)}
+            except OSError as e:
+                logging.warning(f"Series resolver could not list {self.root}: {e}")
+                return
+            added, removed = on_disk - self._stored, self._stored - on_disk
+            for name in removed:
+                self._library.remove(name)
+            # Sorted so the same folder wins every time two names share a key
+            for name in sorted(added):
+                self._library.add(name)
+            self._stored = on_disk
+            self._mtime_ns = mtime_ns
+            self.catalog.update_series_folders(self.root, added, removed, mtime_ns)
+            if added or removed:
+                logging.info(f"Series index for {self.root}: {len(added)} added, {len(removed)} removed, "
+                             f"{len(self._library)} total")
+
+    def add(self, name):
+        """Record a series folder that now exists on disk (call after creating it)."""
+        with self._lock:
+            if name in self._stored or name in self._excluded:
+                return
+            self._stored.add(name)
+            self._library.add(name)
+            self.catalog.update_series_folders(self.root, added=[name])
+
+    def batch(self):
+        """A SeriesBatch for planning one set of files against this library."""
+        return SeriesBatch(self)
+
+    # LOOKUP:
+    def resolve(self, series_name, pending=None):
+        """
+        Return the existing folder name for series_name, or series_name itself
+        if nothing is close enough. With pending (a SeriesIndex of names new in
+        this plan), unmatched names are matched against and added to it, so
+        one plan never creates two spellings of a new series.
+        """
+        words = series_words(series_name)
+        key = "".join(words)
+        if not key:
+            return series_name
+        with self._lock:
+            match = self._library.match(key, words)
+        if match is None and pending is not None:
+            match = pending.match(key, words)
+            if match is None:
+                pending.add(series_name)
+        if match is None:
+            return series_name
+        if match != series_name:
+            logging.debug(f"Series resolver: {series_name!r} -> {match!r}")
+        return match
+
+# SERIES BATCH CLASS:
+# Resolves the names of one plan: existing library folders first, then names
+# that are new in this plan. Dropped with the plan; nothing is shared.
+class SeriesBatch:
+    def __init__(self, resolver):
+        self.resolver = resolver
+        self.pending = SeriesIndex(resolver.threshold)
+
+    def resolve(self, series_name):
+        return self.resolver.resolve(series_name, self.pending)
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+def get_series_resolver(root):
+    """Shared resolver for one TV library root."""
+    key = os.path.normcase(os.path.abspath(str(root)))
+    with _resolvers_lock:
+        resolver = _resolvers.get(key)
+        if resolver is None:
+            resolver = _resolvers[key] = SeriesResolver(root)
+        return resolver
@@ -0,0 +1,34 @@
+# sort_control.py v1.0
+# Pause/cancel switch shared between the GUI and a running sort batch
+
+import threading
+
+# SORT CONTROL CLASS:
+# Lets another thread pause, resume or cancel a batch between files
+class SortControl:
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def cancel(self):
+        self._cancelled.set()
+        # Wake a paused batch so it can see the cancel request
+        self._running.set()
+
+    def is_paused(self):
+        return not self._running.is_set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def checkpoint(self):
+        """Block while paused. Returns False if the batch should stop."""
+        self._running.wait()
+        return not self._cancelled.is_set()
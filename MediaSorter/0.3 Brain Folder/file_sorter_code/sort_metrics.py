@@ -0,0 +1,309 @@
+# sort_metrics.py v1.0
+# Opt-in instrumentation for the sort pipelines: per-stage latency histograms
+# (parse, stat, mkdir, exists, transfer, log, catalog), byte counts, file
+# outcomes and error counts. Off by default; while off, every timer is a shared
+# no-op context manager.
+#
+# Turned on by the CLI flags (--metrics, --metrics-file, --metrics-port) or by
+# environment variables, which also reach the GUI:
+#   MEDIASORTER_METRICS=1                  collect and log a report after each batch
+#   MEDIASORTER_METRICS_FILE=path.prom     also write a Prometheus text file after each batch
+#   MEDIASORTER_METRICS_PORT=9464          also serve /metrics on 127.0.0.1
+#   MEDIASORTER_PROFILE=folder             cProfile + tracemalloc each GUI batch into folder
+
+import os
+import time
+import bisect
+import logging
+import threading
+import contextlib
+from pathlib import Path
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0)
+
+STAGES = ("parse", "stat", "mkdir", "exists", "transfer", "log", "catalog")
+
+_NULL_TIMER = contextlib.nullcontext()
+
+# HISTOGRAM CLASS:
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, counts=None, total=0.0, count=0):
+        # One count per bucket plus the +Inf bucket (not cumulative)
+        self.counts = list(counts) if counts else [0] * (len(BUCKETS) + 1)
+        self.total = total
+        self.count = count
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def copy(self):
+        return Histogram(self.counts, self.total, self.count)
+
+    def minus(self, other):
+        return Histogram([a - b for a, b in zip(self.counts, other.counts)],
+                         self.total - other.total, self.count - other.count)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation (None if empty or past the last bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+# METRICS REGISTRY CLASS:
+class SortMetrics:
+    def __init__(self):
+        self.enabled = False
+        self.textfile = None
+        self._lock = threading.Lock()
+        self._server = None
+        self._histograms = {}   # (pipeline, stage) -> Histogram
+        self._bytes = {}        # pipeline -> bytes moved
+        self._files = {}        # (pipeline, outcome) -> files
+        self._errors = {}       # (pipeline, stage) -> errors
+
+    # CONFIGURATION:
+    def configure(self, textfile=None, port=None):
+        """Turn collection on, optionally with a Prometheus text file and/or a localhost endpoint."""
+        self.enabled = True
+        if textfile:
+            self.textfile = Path(textfile)
+        if port and self._server is None:
+            self._server = serve_metrics(self, port)
+
+    def configure_from_environment(self):
+        textfile = os.environ.get("MEDIASORTER_METRICS_FILE")
+        port = os.environ.get("MEDIASORTER_METRICS_PORT")
+        if os.environ.get("MEDIASORTER_METRICS") or textfile or port:
+            try:
+                self.configure(textfile, int(port) if port else None)
+            except (ValueError, OSError) as e:
+                logging.error(f"Could not set up metrics export: {e}")
+
+    # RECORDING:
+    def time(self, pipeline, stage):
+        """Context manager timing one stage (does nothing while metrics are off)."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, pipeline, stage)
+
+    def observe(self, pipeline, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get((pipeline, stage))
+            if histogram is None:
+                histogram = self._histograms[(pipeline, stage)] = Histogram()
+            histogram.observe(seconds)
+
+    def count_file(self, pipeline, outcome, size=None):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._files[(pipeline, outcome)] = self._files.get((pipeline, outcome), 0) + 1
+            if size and outcome == "sorted":
+                self._bytes[pipeline] = self._bytes.get(pipeline, 0) + size
+
+    def count_error(self, pipeline, stage):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._errors[(pipeline, stage)] = self._errors.get((pipeline, stage), 0) + 1
+
+    # SNAPSHOTS AND REPORTS:
+    def mark(self):
+        """Copy of the current counters; pass it to report() or batch_done() to cover one batch."""
+        with self._lock:
+            return ({key: h.copy() for key, h in self._histograms.items()},
+                    dict(self._bytes), dict(self._files), dict(self._errors))
+
+    def _since(self, mark):
+        histograms, byte_counts, files, errors = self.mark()
+        if mark is None:
+            return histograms, byte_counts, files, errors
+        old_histograms, old_bytes, old_files, old_errors = mark
+        histograms = {key: h.minus(old_histograms[key]) if key in old_histograms else h
+                      for key, h in histograms.items()}
+        byte_counts = {key: value - old_bytes.get(key, 0) for key, value in byte_counts.items()}
+        files = {key: value - old_files.get(key, 0) for key, value in files.items()}
+        errors = {key: value - old_errors.get(key, 0) for key, value in errors.items()}
+        return histograms, byte_counts, files, errors
+
+    def report(self, since=None):
+        """Human-readable summary of everything recorded (or since a mark())."""
+        histograms, byte_counts, files, errors = self._since(since)
+        lines = []
+        for pipeline in sorted({key[0] for key in histograms} | set(byte_counts) | {key[0] for key in files}):
+            outcomes = ", ".join(f"{outcome}: {count}" for (p, outcome), count in sorted(files.items())
+                                 if p == pipeline and count)
+            lines.append(f"[{pipeline}] {outcomes or 'no files'}; "
+                         f"{byte_counts.get(pipeline, 0) / (1024 * 1024):.1f} MB moved")
+            for stage in STAGES:
+                histogram = histograms.get((pipeline, stage))
+                if histogram is None or not histogram.count:
+                    continue
+                p50, p95 = histogram.quantile(0.5), histogram.quantile(0.95)
+                lines.append(f"  {stage:<9} {histogram.count:>8} calls  total {histogram.total:9.3f}s  "
+                             f"mean {histogram.total / histogram.count * 1000:9.3f}ms  "
+                             f"p50 <= {_format_bound(p50)}  p95 <= {_format_bound(p95)}")
+            for (p, stage), count in sorted(errors.items()):
+                if p == pipeline and count:
+                    lines.append(f"  errors in {stage}: {count}")
+        return "\n".join(lines) or "No metrics recorded."
+
+    def batch_done(self, since=None):
+        """Log the batch report and refresh the Prometheus text file, if configured."""
+        if not self.enabled:
+            return
+        logging.info(f"Sort metrics for this batch:\n{self.report(since)}")
+        if self.textfile:
+            try:
+                self.write_textfile(self.textfile)
+            except OSError as e:
+                logging.error(f"Could not write metrics file {self.textfile}: {e}")
+
+    # PROMETHEUS EXPORT:
+    def render_prometheus(self):
+        histograms, byte_counts, files, errors = self._since(None)
+        lines = ["# HELP mediasorter_stage_seconds Time spent per pipeline stage.",
+                 "# TYPE mediasorter_stage_seconds histogram"]
+        for (pipeline, stage), histogram in sorted(histograms.items()):
+            labels = f'pipeline="{pipeline}",stage="{stage}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram.counts):
+                cumulative += count
+                lines.append(f'mediasorter_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'mediasorter_stage_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"mediasorter_stage_seconds_sum{{{labels}}} {histogram.total:.6f}")
+            lines.append(f"mediasorter_stage_seconds_count{{{labels}}} {histogram.count}")
+        lines += ["# HELP mediasorter_bytes_total Bytes placed in the library.",
+                  "# TYPE mediasorter_bytes_total counter"]
+        lines += [f'mediasorter_bytes_total{{pipeline="{p}"}} {n}' for p, n in sorted(byte_counts.items())]
+        lines += ["# HELP mediasorter_files_total Files handled, by outcome.",
+                  "# TYPE mediasorter_files_total counter"]
+        lines += [f'mediasorter_files_total{{pipeline="{p}",outcome="{o}"}} {n}' for (p, o), n in sorted(files.items())]
+        lines += ["# HELP mediasorter_errors_total Errors, by the stage they happened in.",
+                  "# TYPE mediasorter_errors_total counter"]
+        lines += [f'mediasorter_errors_total{{pipeline="{p}",stage="{s}"}} {n}' for (p, s), n in sorted(errors.items())]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Write the metrics for node_exporter's textfile collector (replaced atomically)."""
+        path = Path(path)
+        temp = path.with_name(path.name + ".tmp")
+        temp.write_text(self.render_prometheus(), encoding="utf-8")
+        os.replace(temp, path)
+
+    def reset(self):
+        with self._lock:
+            self._histograms, self._bytes, self._files, self._errors = {}, {}, {}, {}
+
+class _StageTimer:
+    __slots__ = ("metrics", "pipeline", "stage", "start")
+
+    def __init__(self, metrics, pipeline, stage):
+        self.metrics = metrics
+        self.pipeline = pipeline
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Errors are counted by the caller, which knows whether an exception was expected
+        self.metrics.observe(self.pipeline, self.stage, time.perf_counter() - self.start)
+        return False
+
+def _format_bound(bound):
+    if bound is None:
+        return "  >120s"
+    return f"{bound * 1000:g}ms" if bound < 1 else f"{bound:g}s"
+
+# HTTP ENDPOINT:
+def serve_metrics(metrics, port, host="127.0.0.1"):
+    """Serve metrics.render_prometheus() at http://127.0.0.1:port/metrics on a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logging.info(f"Serving sort metrics at http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+# PROFILING:
+@contextlib.contextmanager
+def profiled(dump_path, top=15):
+    """
+    Run the body under cProfile and tracemalloc, then write a pstats dump to
+    dump_path and log the top allocation sites. cProfile only sees the calling
+    thread; transfers on scheduler workers show up as waiting time.
+    """
+    import cProfile
+    import tracemalloc
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        dump_path = Path(dump_path)
+        dump_path.parent.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(dump_path))
+        # Leave out the profiler's own bookkeeping
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        current, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+        allocations = "\n".join(f"  {stat}" for stat in snapshot.statistics("lineno")[:top])
+        logging.info(f"Profile written to {dump_path} (memory now {current / 1024:.0f} KB, peak {peak / 1024:.0f} KB). "
+                     f"Top allocations:\n{allocations}")
+
+def profile_batch(name):
+    """profiled() into MEDIASORTER_PROFILE/<name>-<time>.pstats if that variable is set, otherwise a no-op."""
+    folder = os.environ.get("MEDIASORTER_PROFILE")
+    if not folder:
+        return contextlib.nullcontext()
+    return profiled(Path(folder) / f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.pstats")
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+def get_sort_metrics():
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = SortMetrics()
+            _metrics.configure_from_environment()
+        return _metrics
@@ -0,0 +1,468 @@
+# sort_pipeline.py v1.12
+# Two-phase TV sort pipeline shared by process_gui_files and process_files.
+#   1. build_plan() classifies every file and groups the moves by destination
+#      folder. It never changes anything on disk, so a plan can be inspected
+#      or printed as a dry run.
+#   2. execute_plan() creates each destination folder once, lists it once to
+#      find names that already exist, and then runs the moves.
+# Every executed plan is journaled (batch_journal.py) so an interrupted batch
+# can be finished with resume_batch(). Progress can be fed to a
+# ProgressTracker (progress_tracker.py) for coalesced updates with MB/s and ETA.
+# Stages are timed through sort_metrics.py when metrics are turned on.
+# Series names are matched to existing series folders by series_resolver.py.
+# Files are placed per the placement mode (transfer_engine.place_file), and each
+# file's event records the strategy that was used.
+# Callers that want structured per-file results get a SortResult for every
+# finished file through file_callback (see mediasorter/api.py).
+
+import os
+import stat
+import time
+import logging
+from pathlib import Path
+from collections import namedtuple
+
+from file_sorter_code.media_classifier import parse_tv_name
+from file_sorter_code.transfer_engine import place_file, place_file_unique, keeps_source, remove_partial
+from file_sorter_code.transfer_scheduler import TransferScheduler, TransferCancelled, DEFAULT_WORKERS
+from file_sorter_code.duplicate_detector import get_duplicate_detector
+from file_sorter_code.batch_journal import BatchJournal
+from file_sorter_code.sort_metrics import get_sort_metrics
+from file_sorter_code.series_resolver import get_series_resolver
+from settings.settings_toggle_switch import get_device_concurrency
+from catalog.media_catalog import get_media_catalog, CatalogBatch
+from log_code.log_setup import log_event
+
+# PLAN RECORDS:
+# action is "place" (move into the library), "unsorted" or "skip"; size is in
+# bytes (None for skipped entries)
+PlannedFile = namedtuple("PlannedFile", ["source", "action", "destination", "reason", "size"], defaults=(None,))
+
+# RESULT RECORDS:
+# One per finished file. __slots__ keeps a long stream of them small.
+class SortResult:
+    """
+    What happened to one file.
+
+    source: Path the file came from
+    destination: Path it ended up at (for an identical duplicate, the library
+        copy it matched; None if it was skipped or could not be moved)
+    action: "place", "duplicate", "unsorted", "skip" or "error"
+    outcome: "sorted", "unsorted" or "skipped"
+    bytes: File size, if known
+    duration: Seconds the transfer took, if there was one
+    reason: Why the file was not sorted (None when it was)
+    strategy: How it was transferred ("rename", "hardlink", "copy", ...)
+    """
+    __slots__ = ("source", "destination", "action", "outcome", "bytes", "duration", "reason", "strategy")
+
+    def __init__(self, source, destination, action, outcome, bytes=None, duration=None, reason=None, strategy=None):
+        self.source = source
+        self.destination = destination
+        self.action = action
+        self.outcome = outcome
+        self.bytes = bytes
+        self.duration = duration
+        self.reason = reason
+        self.strategy = strategy
+
+    def to_dict(self):
+        """JSON-friendly copy (paths as strings)."""
+        return {name: str(value) if isinstance(value, Path) else value
+                for name, value in ((name, getattr(self, name)) for name in self.__slots__)}
+
+    def __repr__(self):
+        return (f"SortResult({self.source.name!r}, action={self.action!r}, outcome={self.outcome!r}, "
+                f"destination={str(self.destination) if self.destination else None!r})")
+
+# DESTINATION HELPER:
+# Works out where an episode belongs without touching the disk
+def tv_destination(file, series_base, resolver=None):
+    """
+    Return the standardized destination Path for an episode, or None if unrecognized.
+    With a SeriesResolver (or SeriesBatch), the series name is replaced by the matching existing folder.
+    """
+    file = Path(file)
+    tv = parse_tv_name(file.name)
+    if not tv:
+        return None
+    series_name, season, episode = tv
+    if resolver is not None:
+        series_name = resolver.resolve(series_name)
+    season_folder = Path(series_base) / series_name / f"{series_name} - Season {season}"
+    return season_folder / f"{series_name} - S{season}E{episode}{file.suffix}"
+
+# SORT PLAN CLASS:
+class SortPlan:
+    def __init__(self, series_base):
+        self.series_base = Path(series_base)
+        self.folders = {}      # destination folder -> [PlannedFile, ...]
+        self.unsorted = []
+        self.skipped = []
+
+    @property
+    def total(self):
+        return len(self.skipped) + len(self.unsorted) + sum(len(ops) for ops in self.folders.values())
+
+    @property
+    def total_bytes(self):
+        return sum(op.size or 0 for op in self.operations())
+
+    def operations(self):
+        """Yield every planned file: unsorted moves first, then one folder at a time."""
+        yield from self.unsorted
+        for ops in self.folders.values():
+            yield from ops
+
+    def describe(self, check_existing=True):
+        """
+        Return the plan as a list of dicts, e.g. for a dry run. With check_existing,
+        each destination folder is listed once (read-only) to flag duplicates.
+        """
+        entries = [{"file": str(op.source), "action": "skip", "reason": op.reason} for op in self.skipped]
+        entries += [{"file": str(op.source), "action": "unsorted", "reason": op.reason} for op in self.unsorted]
+        for folder, ops in self.folders.items():
+            existing = list_names(folder) if check_existing else set()
+            for op in ops:
+                if os.path.normcase(op.destination.name) in existing:
+                    entries.append({"file": str(op.source), "action": "duplicate", "destination": str(op.destination)})
+                else:
+                    entries.append({"file": str(op.source), "action": "sort", "destination": str(op.destination)})
+        return entries
+
+# PLANNING PHASE:
+def build_plan(file_paths, series_base):
+    """Classify file_paths and group the moves by destination folder. Read-only."""
+    plan = SortPlan(series_base)
+    claimed = set()
+    metrics = get_sort_metrics()
+    # One stat of the library root; the folder list is re-read only if it changed
+    resolver = get_series_resolver(series_base)
+    with metrics.time("tv", "exists"):
+        resolver.refresh()
+    # New series names are only shared within this plan until their folders exist
+    series_names = resolver.batch()
+    for file_path in file_paths:
+        file = Path(file_path)
+        # One stat answers "is it a file?" and gives the size for progress
+        try:
+            with metrics.time("tv", "stat"):
+                info = os.stat(file)
+        except OSError:
+            info = None
+        if info is None or not stat.S_ISREG(info.st_mode):
+            plan.skipped.append(PlannedFile(file, "skip", None, f"{file.name} is not a file."))
+            continue
+        size = info.st_size
+
+        with metrics.time("tv", "parse"):
+            destination = tv_destination(file, series_base, series_names)
+        if destination is None:
+            plan.unsorted.append(PlannedFile(file, "unsorted", None, "Unrecognized format.", size))
+        elif destination in claimed:
+            # Two files in this batch want the same name
+            plan.unsorted.append(PlannedFile(file, "unsorted", destination, "Duplicate file.", size))
+        else:
+            claimed.add(destination)
+            plan.folders.setdefault(destination.parent, []).append(PlannedFile(file, "place", destination, None, size))
+    return plan
+
+# FOLDER HELPERS:
+def list_names(folder):
+    """One directory listing, as a set of normalized names (empty if the folder is missing)."""
+    try:
+        with os.scandir(folder) as entries:
+            return {os.path.normcase(entry.name) for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+def prepare_folder(folder):
+    """Create folder if needed (one round-trip) and return the names already in it."""
+    metrics = get_sort_metrics()
+    try:
+        with metrics.time("tv", "mkdir"):
+            Path(folder).mkdir(parents=True)
+        return set()
+    except FileExistsError:
+        with metrics.time("tv", "exists"):
+            return list_names(folder)
+
+# UNSORTED FILE HANDLER:
+def move_to_unsorted(file, unsorted_folder, reason):
+    """
+    Move a file to the unsorted folder with a reason.
+
+    Returns:
+        tuple: (destination, strategy), or (None, None) if the move failed
+    """
+    try:
+        destination, strategy = place_file_unique(file, Path(unsorted_folder) / file.name)
+        logging.info(f"Moved {file.name} to Unsorted Folder as {destination.name} ({strategy}): {reason}")
+        return destination, strategy
+    except Exception as e:
+        logging.error(f"Failed to move {file.name} to Unsorted Folder: {e}")
+        return None, None
+
+# DUPLICATE RESOLUTION:
+# Called when the standardized name already exists in the library
+def resolve_duplicate(file, destination):
+    """
+    Remove file if it is byte-identical to destination (unless the placement
+    mode keeps sources), otherwise place it next to destination as an alternate
+    release ("Name (1).mkv").
+
+    Returns:
+        tuple: (path the file was placed at, strategy), or (None, None) if it
+            was an identical copy
+    """
+    if get_duplicate_detector().is_identical(file, destination):
+        if not keeps_source(file):
+            os.remove(file)
+        return None, None
+    return place_file_unique(file, destination)
+
+# TIMED TRANSFER:
+# Runs on a transfer worker; size and duration go into the file's event
+def _timed(fn, file, *args):
+    size = os.stat(file).st_size
+    start = time.perf_counter()
+    result = fn(file, *args)
+    return result, size, time.perf_counter() - start
+
+# EXECUTION PHASE:
+def execute_plan(plan, unsorted_folder, progress_callback=None, result_callback=None, control=None, jobs=None,
+                 resumed_from=None, tracker=None, file_callback=None, max_in_flight=None):
+    """
+    Run a SortPlan.
+
+    Args:
+        plan: SortPlan from build_plan()
+        unsorted_folder: Where unrecognized and failed files go
+        progress_callback: Optional (current, total, message) callback, called
+            once per finished file
+        result_callback: Optional (file_path, outcome, message) callback, outcome
+            being "sorted", "unsorted" or "skipped"
+        control: Optional SortControl used to pause or cancel between files
+        jobs: Optional transfer workers per device
+        resumed_from: Optional journal path this plan replaces; it is deleted
+            once the new journal is safely on disk
+        tracker: Optional ProgressTracker; the plan's files and bytes are added
+            to its totals and each finished file is reported to it. The caller
+            calls tracker.finish(), so one tracker can span several plans.
+        file_callback: Optional callback given a SortResult for each finished
+            file. It runs on this thread, so a callback that blocks holds up
+            the batch (that is how mediasorter.api applies backpressure).
+        max_in_flight: Optional cap on transfers queued or running at once.
+            Without it the whole plan is queued up front; with it, new
+            transfers wait until earlier ones have been reported.
+
+    Returns:
+        tuple: (total_files, sorted_files, unsorted_files)
+    """
+    unsorted_folder = Path(unsorted_folder)
+    unsorted_folder.mkdir(parents=True, exist_ok=True)
+
+    total_files = plan.total
+    sorted_files = 0
+    unsorted_files = 0
+    done_files = 0
+    if tracker:
+        tracker.add_total(total_files, plan.total_bytes)
+
+    metrics = get_sort_metrics()
+    batch_mark = metrics.mark() if metrics.enabled else None
+
+    # Existence checks come from one listing per destination folder; the
+    # catalog just records what was placed (the TV library is never crawled)
+    catalog = get_media_catalog()
+    resolver = get_series_resolver(plan.series_base)
+    placed = CatalogBatch(catalog, "tv")
+
+    # Transfers run in parallel per destination device; results come back here
+    # so progress and result callbacks are always called from this thread
+    scheduler = TransferScheduler(get_device_concurrency(), default_workers=jobs or DEFAULT_WORKERS, control=control)
+    existing_names = {}
+
+    journal = BatchJournal.create(plan, unsorted_folder)
+    if resumed_from:
+        Path(resumed_from).unlink(missing_ok=True)
+    finished = False
+
+    def report(file, outcome, message, action, size=None, duration=None, destination=None, log_message=None,
+               strategy=None, reason=None):
+        nonlocal done_files
+        done_files += 1
+        metrics.count_file("tv", outcome, size)
+        with metrics.time("tv", "log"):
+            log_event("tv", file, action, outcome, size, duration, destination, log_message or message,
+                      logging.WARNING if outcome == "skipped" else logging.INFO, strategy)
+        if progress_callback:
+            progress_callback(done_files, total_files, message)
+        if tracker:
+            tracker.file_done(size, message)
+        if result_callback:
+            result_callback(str(file), outcome, message)
+        if file_callback:
+            file_callback(SortResult(file, destination, action, outcome, size, duration, reason, strategy))
+
+    def fail(index, file, error, stage):
+        nonlocal unsorted_files
+        metrics.count_error("tv", stage)
+        logging.error(f"Unexpected error with file {file.name}: {error}")
+        reason = f"Processing error: {error}"
+        destination, strategy = move_to_unsorted(file, unsorted_folder, reason)
+        commit_unsorted(index, destination)
+        unsorted_files += 1
+        report(file, "unsorted", f"Error processing: {file.name}", "error", destination=destination,
+               strategy=strategy, reason=reason)
+
+    def commit_unsorted(index, placed_at):
+        if placed_at is None:
+            # Not even the unsorted move worked; keep it unfinished for resume
+            journal.failed(index)
+        else:
+            journal.committed(index, "unsorted", placed_at)
+
+    def handle_result(tag, result, error):
+        nonlocal sorted_files, unsorted_files
+        kind, index, file, destination, message, reason = tag
+        if isinstance(error, TransferCancelled):
+            return
+        if error is not None:
+            fail(index, file, error, "transfer")
+            return
+        result, size, duration = result
+        metrics.observe("tv", "transfer", duration)
+        if kind == "unsorted":
+            # Move to the unsorted folder (errors are logged by move_to_unsorted)
+            placed_at, strategy = result
+            commit_unsorted(index, placed_at)
+            unsorted_files += 1
+            report(file, "unsorted", message, kind, size, duration, placed_at, strategy=strategy, reason=reason)
+            return
+        placed_at, strategy = result if kind == "duplicate" else (destination, result)
+        if placed_at is None:
+            journal.committed(index, "sorted")
+            sorted_files += 1
+            kept = "Kept" if keeps_source(file) else "Removed"
+            report(file, "sorted", f"Successfully moved (identical copy already in library): {file.name}", kind,
+                   size, duration, destination, f"{kept} {file.name}: identical copy already at {destination}")
+        else:
+            journal.committed(index, "sorted", placed_at)
+            placed.add(placed_at, size)
+            sorted_files += 1
+            verb = "Placed" if keeps_source(file) else "Moved"
+            report(file, "sorted", f"{message} ({strategy})", kind, size, duration, placed_at,
+                   f"{verb} {file.name} to {placed_at} ({strategy})", strategy)
+
+    try:
+        for op in plan.skipped:
+            report(op.source, "skipped", f"Skipped: {op.reason}", "skip",
+                   log_message=f"Skipped: {op.source} is not a file.", reason=op.reason)
+
+        for index, op in enumerate(plan.operations()):
+            # Pause/cancel point between files
+            if control and not control.checkpoint():
+                logging.info(f"Processing cancelled after {done_files} of {total_files} files.")
+                break
+
+            for tag, result, error in scheduler.completed():
+                handle_result(tag, result, error)
+            while max_in_flight and scheduler.pending >= max_in_flight:
+                handle_result(*scheduler.wait_one())
+
+            file = op.source
+            logging.info(f"Processing file: {file.name}")
+
+            if op.action == "unsorted":
+                if op.reason == "Unrecognized format.":
+                    logging.warning(f"Filename format not recognized: {file.name}")
+                    message = f"Failed to move (unrecognized): {file.name}"
+                else:
+                    message = f"Failed to move (duplicate): {file.name}"
+                journal.started(index)
+                scheduler.submit(unsorted_folder / file.name, _timed, move_to_unsorted, file, unsorted_folder, op.reason,
+                                 tag=("unsorted", index, file, None, message, op.reason))
+                continue
+
+            folder = op.destination.parent
+            try:
+                if folder not in existing_names:
+                    # One mkdir and at most one listing per destination folder
+                    existing_names[folder] = prepare_folder(folder)
+                    resolver.add(folder.parent.name)
+            except Exception as e:
+                fail(index, file, e, "mkdir")
+                continue
+
+            journal.started(index)
+            if os.path.normcase(op.destination.name) in existing_names[folder]:
+                # Compare contents with the library copy before deciding what to do
+                scheduler.submit(op.destination, _timed, resolve_duplicate, file, op.destination,
+                                 tag=("duplicate", index, file, op.destination,
+                                      f"Successfully moved (alternate release): {file.name}", None))
+            else:
+                scheduler.submit(op.destination, _timed, place_file, file, op.destination,
+                                 tag=("place", index, file, op.destination, f"Successfully moved: {file.name}", None))
+
+        if control and control.is_cancelled():
+            scheduler.cancel_pending()
+        for tag, result, error in scheduler.wait_all():
+            handle_result(tag, result, error)
+        finished = True
+    finally:
+        scheduler.shutdown(cancel=True)
+        with metrics.time("tv", "catalog"):
+            placed.flush()
+        if finished and journal.failures:
+            logging.warning(f"{journal.failures} file(s) could not be moved at all; "
+                            f"the batch journal is kept so they can be retried with resume")
+            journal.close()
+        elif finished:
+            # Cancelled batches end here too: their files are still in the queue
+            journal.finish()
+        else:
+            # Something blew up mid-batch; leave the journal for resume_batch()
+            journal.close()
+
+    logging.info(f"Processing complete. Total files: {total_files}, Sorted: {sorted_files}, Unsorted: {unsorted_files}.")
+    metrics.batch_done(batch_mark)
+    return total_files, sorted_files, unsorted_files
+
+# RESUME:
+def resume_batch(state, progress_callback=None, result_callback=None, control=None, jobs=None, tracker=None):
+    """
+    Finish a batch that was interrupted (see batch_journal.interrupted_journals).
+
+    Committed files are skipped without touching the disk. The partial copies
+    of transfers this journal recorded as started are removed (never any other
+    partials: another batch may be writing them), and whatever is still in its
+    source location is planned and run again. A file whose copy
+    finished but whose source was not yet deleted is caught by the duplicate
+    check and simply removed.
+
+    Returns:
+        tuple: (total_files, sorted_files, unsorted_files) for the resumed part
+    """
+    remaining = []
+    for record in state.unfinished:
+        source = Path(record["source"])
+        if source.exists():
+            remaining.append(source)
+        else:
+            logging.info(f"Resume: {source.name} was already moved before the interruption")
+
+    # A started transfer was writing to its destination, or (unrecognized files
+    # and duplicates) to the same name in the unsorted folder
+    for record in state.in_progress:
+        source = Path(record["source"])
+        if record["destination"]:
+            remove_partial(record["destination"])
+        remove_partial(Path(state.unsorted_folder) / source.name)
+
+    logging.info(f"Resuming batch {state.batch_id}: {len(state.committed)} files already done, "
+                 f"{len(remaining)} to go")
+    plan = build_plan(remaining, state.series_base)
+    return execute_plan(plan, state.unsorted_folder, progress_callback=progress_callback,
+                        result_callback=result_callback, control=control, jobs=jobs,
+                        resumed_from=state.path, tracker=tracker)
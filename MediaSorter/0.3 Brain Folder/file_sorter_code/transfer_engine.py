@@ -0,0 +1,455 @@
+# transfer_engine.py v1.6
+# Moves files into place as cheaply as the filesystems involved allow:
+# an atomic rename on the same device, a kernel-side copy across devices
+# Copies are written to a hidden ".name.partial" file and renamed into place,
+# so a crash never leaves a truncated file under the real name
+# Cross-device copies are checked according to the copy_verification setting:
+# the data is hashed as it streams through (one read of the source), the copy
+# can be re-read from disk past the page cache and compared, and the hashes are
+# recorded in the duplicate detector's cache. The source is only deleted once
+# the copy has passed.
+# With placement_mode "link", files from outside the MediaSorter folder (a
+# download folder that is still seeding) are hardlinked or reflinked into place
+# and left where they were; they are only copied when neither link works.
+
+import os
+import mmap
+import errno
+import stat
+import shutil
+import logging
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no ioctl, so no reflinks
+    fcntl = None
+
+from file_sorter_code.duplicate_detector import PartialHasher, new_full_hasher, get_duplicate_detector
+from settings.settings_service import get_settings_service
+
+# Size of each kernel copy request (64 MiB)
+CHUNK_SIZE = 64 * 1024 * 1024
+
+# Buffer size for checksummed copies and re-reads (8 MiB, a multiple of the page size)
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Linux ioctl that shares a file's extents with another (btrfs, XFS, bcachefs...)
+FICLONE = 0x40049409
+
+# The app's own folders (sorting, unsorted, default library); files in here are
+# always moved, whatever the placement mode
+APP_ROOT = Path(__file__).resolve().parent.parent.parent
+_APP_ROOT_PREFIX = os.path.normcase(os.path.join(str(APP_ROOT), ""))
+
+# Folders the app keeps in APP_ROOT. With default settings APP_ROOT is also the
+# TV library root, and these must never be taken for series.
+APP_FOLDERS = frozenset({"0.1 Sorting Folder", "0.2 Unsorted Folder", "0.3 Brain Folder", "Movies"})
+
+def app_folders_in(root):
+    """Names directly in root that belong to the app rather than the library."""
+    if os.path.normcase(os.path.abspath(root)) == os.path.normcase(str(APP_ROOT)):
+        return APP_FOLDERS
+    return frozenset()
+
+# Suffix of in-flight copies (".Show - S01E02.mkv.partial")
+PARTIAL_SUFFIX = ".partial"
+
+# PARTIAL FILE HELPERS:
+def partial_path(destination):
+    """Return the temporary name a copy to destination is written under."""
+    destination = Path(destination)
+    return destination.with_name(f".{destination.name}{PARTIAL_SUFFIX}")
+
+def is_partial_name(name):
+    return name.startswith(".") and name.endswith(PARTIAL_SUFFIX)
+
+def remove_partial(destination):
+    """Delete a leftover partial copy for destination, if there is one. Returns True if one was removed."""
+    temporary = partial_path(destination)
+    try:
+        if not stat.S_ISREG(os.lstat(temporary).st_mode):
+            return False
+        os.remove(temporary)
+    except FileNotFoundError:
+        return False
+    logging.info(f"Removed partial copy: {temporary}")
+    return True
+
+# DEVICE CHECK:
+# Returns True when the file and the destination folder live on the same filesystem
+def same_device(source, destination_folder):
+    try:
+        return os.stat(source).st_dev == os.stat(destination_folder).st_dev
+    except OSError:
+        return False
+
+# SAFE RENAME:
+# Renames without ever replacing an existing destination (os.rename would on POSIX)
+def rename_no_replace(source, destination):
+    if os.name == "nt":
+        # Windows already refuses to rename over an existing file
+        os.rename(source, destination)
+        return
+    try:
+        os.link(source, destination)
+    except FileExistsError:
+        raise
+    except OSError:
+        # Filesystem without hard links (FAT, some network shares)
+        if os.path.lexists(destination):
+            raise FileExistsError(f"Destination already exists: {destination}")
+        os.rename(source, destination)
+        return
+    try:
+        os.unlink(source)
+    except OSError:
+        # Take the new link back so the caller's fallback finds the name free
+        os.unlink(destination)
+        raise
+
+# KERNEL COPY:
+# Copies file data without pulling it through Python buffers when possible
+def kernel_copy(source, destination, chunk_size=CHUNK_SIZE):
+    """Copy source to destination, fsync it, and copy over the timestamps."""
+    with open(source, "rb") as src, open(destination, "xb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        copied = _copy_file_range(src, dst, size, chunk_size)
+        if copied is None:
+            copied = _sendfile(src, dst, size, chunk_size)
+        if copied is None:
+            src.seek(0)
+            dst.seek(0)
+            dst.truncate()
+            shutil.copyfileobj(src, dst, chunk_size)
+            dst.flush()
+            copied = os.fstat(dst.fileno()).st_size
+        if copied < size:
+            # The kernel stopped early (source truncated, filesystem quirk)
+            raise OSError(errno.EIO, f"Short copy of {source}: {copied} of {size} bytes")
+        dst.flush()
+        os.fsync(dst.fileno())
+    shutil.copystat(source, destination)
+
+def _copy_file_range(src, dst, size, chunk_size):
+    if not hasattr(os, "copy_file_range"):
+        return None
+    copied = 0
+    try:
+        while copied < size:
+            sent = os.copy_file_range(src.fileno(), dst.fileno(), min(chunk_size, size - copied))
+            if sent == 0:
+                break
+            copied += sent
+    except OSError as e:
+        # Cross-filesystem copies are refused on older kernels (EXDEV/EINVAL/ENOSYS)
+        if copied == 0:
+            logging.debug(f"copy_file_range unavailable, falling back: {e}")
+            return None
+        raise
+    return copied
+
+def _sendfile(src, dst, size, chunk_size):
+    if not hasattr(os, "sendfile"):
+        return None
+    copied = 0
+    try:
+        while copied < size:
+            sent = os.sendfile(dst.fileno(), src.fileno(), copied, min(chunk_size, size - copied))
+            if sent == 0:
+                break
+            copied += sent
+    except OSError as e:
+        if copied == 0:
+            logging.debug(f"sendfile unavailable, falling back: {e}")
+            return None
+        raise
+    return copied
+
+# LINKS:
+# errnos that mean "this filesystem pair can't do that", as opposed to a real failure
+_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EACCES, errno.EINVAL, errno.ENOTTY, errno.EMLINK,
+                errno.EOPNOTSUPP, getattr(errno, "ENOTSUP", errno.EOPNOTSUPP), errno.ENOSYS}
+
+def _unsupported(error):
+    return not isinstance(error, FileExistsError) and error.errno in _UNSUPPORTED
+
+def reflink(source, destination):
+    """
+    Create destination as a copy-on-write clone of source: no data is copied
+    and the two files are independent afterwards. Raises OSError where the
+    filesystem (or OS) can't clone.
+    """
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this system")
+    with open(source, "rb") as src, open(destination, "xb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source, destination)
+
+# CHECKSUMMED COPY:
+class ChecksumMismatchError(OSError):
+    """A copy did not match its source. The source is left where it was."""
+
+def _advise(fd, advice):
+    # posix_fadvise is only a hint (and missing on Windows), so failures don't matter
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
+def hashed_copy(source, destination, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Copy source to destination in one pass, hashing each buffer on its way
+    through, then fsync the copy and copy over the timestamps.
+
+    Raises:
+        ChecksumMismatchError: if the source changed during the copy or the copy
+            came out a different size
+
+    Returns:
+        tuple: (full_hash, partial_hash), the same values duplicate_detector's
+            full_hash() and partial_hash() give for the file
+    """
+    buffer = memoryview(bytearray(chunk_size))
+    with open(source, "rb", buffering=0) as src, open(destination, "xb", buffering=0) as dst:
+        before = os.fstat(src.fileno())
+        _advise(src.fileno(), "POSIX_FADV_SEQUENTIAL")
+        full = new_full_hasher()
+        partial = PartialHasher(before.st_size)
+        copied = 0
+        while True:
+            count = src.readinto(buffer)
+            if not count:
+                break
+            data = buffer[:count]
+            full.update(data)
+            partial.update(copied, data)
+            written = 0
+            while written < count:
+                written += dst.write(data[written:])
+            copied += count
+        os.fsync(dst.fileno())
+        after = os.fstat(src.fileno())
+        written_size = os.fstat(dst.fileno()).st_size
+
+    if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns) or copied != before.st_size:
+        raise ChecksumMismatchError(f"{source} changed while it was being copied")
+    if written_size != copied:
+        raise ChecksumMismatchError(f"Copy of {source} is {written_size} bytes, expected {copied}")
+    shutil.copystat(source, destination)
+    return full.hexdigest(), partial.hexdigest()
+
+def _direct_hash(path, chunk_size):
+    # O_DIRECT reads skip the page cache but need page-aligned buffers (mmap's
+    # are). Returns None if the filesystem refuses O_DIRECT (tmpfs, some FUSE).
+    if not hasattr(os, "O_DIRECT"):
+        return None
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECT)
+    except OSError:
+        return None
+    digest = new_full_hasher()
+    try:
+        with mmap.mmap(-1, chunk_size) as buffer:
+            with memoryview(buffer) as view:
+                first = True
+                while True:
+                    try:
+                        count = os.readv(fd, [buffer])
+                    except OSError:
+                        if first:
+                            return None
+                        raise
+                    first = False
+                    if not count:
+                        break
+                    digest.update(view[:count])
+    finally:
+        os.close(fd)
+    return digest.hexdigest()
+
+def reread_hash(path, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Full hash of path as stored on disk rather than as cached in memory: read
+    with O_DIRECT where supported, otherwise after asking the OS to drop the
+    file's cached pages. (Windows has neither, so there it may read the cache.)
+    """
+    digest = _direct_hash(path, chunk_size)
+    if digest is not None:
+        return digest
+    digest = new_full_hasher()
+    with open(path, "rb", buffering=0) as f:
+        _advise(f.fileno(), "POSIX_FADV_DONTNEED")
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def record_hashes(path, full, partial):
+    """Save a copy's hashes so duplicate checks against it never re-read it."""
+    try:
+        get_duplicate_detector().cache.record(path, partial=partial, full=full)
+    except Exception as e:
+        logging.warning(f"Could not record checksum for {path}: {e}")
+
+# TRANSFER ENGINE CLASSES:
+# The default engine renames on the same device and copies then deletes otherwise.
+# Swap it out with set_transfer_engine() to change how every sorter moves files.
+class TransferEngine:
+    def move(self, source, destination):
+        """Move source to destination. Returns the strategy name that was used."""
+        raise NotImplementedError
+
+    def keeps_source(self, source):
+        """True if place() leaves source where it is."""
+        return False
+
+    def place(self, source, destination):
+        """Put source at destination the way the placement mode says. Returns the strategy name."""
+        return self.move(source, destination)
+
+class KernelTransferEngine(TransferEngine):
+    def __init__(self, chunk_size=CHUNK_SIZE, verification=None, placement=None):
+        self.chunk_size = chunk_size
+        # "off", "checksum" or "reread"; None follows the copy_verification setting
+        self.verification = verification
+        # "move" or "link"; None follows the placement_mode setting
+        self.placement = placement
+
+    def copy_verification(self):
+        return self.verification or get_settings_service().copy_verification()
+
+    def placement_mode(self):
+        return self.placement or get_settings_service().placement_mode()
+
+    def keeps_source(self, source):
+        if self.placement_mode() != "link":
+            return False
+        return not os.path.normcase(os.path.abspath(source)).startswith(_APP_ROOT_PREFIX)
+
+    def place(self, source, destination):
+        if self.keeps_source(source):
+            return self.link(source, destination)
+        return self.move(source, destination)
+
+    def link(self, source, destination):
+        """
+        Put a copy of source at destination without touching source: a hardlink
+        if both are on one filesystem, else a reflink, else a real copy.
+        Returns "hardlink", "reflink" or the copy strategy.
+        """
+        source = Path(source)
+        destination = Path(destination)
+        try:
+            os.link(source, destination)
+            return "hardlink"
+        except OSError as e:
+            if not _unsupported(e):
+                raise
+            logging.debug(f"Hardlink not possible for {source.name}: {e}")
+
+        if os.path.lexists(destination):
+            raise FileExistsError(f"Destination already exists: {destination}")
+        temporary = partial_path(destination)
+        try:
+            if os.path.lexists(temporary):
+                os.remove(temporary)
+            reflink(source, temporary)
+            rename_no_replace(temporary, destination)
+            return "reflink"
+        except OSError as e:
+            if os.path.lexists(temporary):
+                os.remove(temporary)
+            if not _unsupported(e):
+                raise
+            logging.debug(f"Reflink not possible for {source.name}, copying: {e}")
+        return self._copy(source, destination)
+
+    def move(self, source, destination):
+        source = Path(source)
+        destination = Path(destination)
+
+        if same_device(source, destination.parent):
+            try:
+                rename_no_replace(source, destination)
+                return "rename"
+            except FileExistsError:
+                raise
+            except OSError as e:
+                # Bind mounts and some network shares report one device but refuse rename
+                logging.debug(f"Rename failed for {source.name}, copying instead: {e}")
+
+        strategy = self._copy(source, destination)
+        os.remove(source)
+        return strategy
+
+    def _copy(self, source, destination):
+        # Fail before copying gigabytes if the name is already taken
+        if os.path.lexists(destination):
+            raise FileExistsError(f"Destination already exists: {destination}")
+
+        verification = self.copy_verification()
+        temporary = partial_path(destination)
+        hashes = None
+        try:
+            if os.path.lexists(temporary):
+                # Left behind by an interrupted run
+                os.remove(temporary)
+            if verification == "off":
+                kernel_copy(source, temporary, self.chunk_size)
+            else:
+                hashes = hashed_copy(source, temporary)
+                if verification == "reread" and reread_hash(temporary) != hashes[0]:
+                    raise ChecksumMismatchError(f"Copy of {source.name} does not match the source on disk")
+            rename_no_replace(temporary, destination)
+        except BaseException:
+            # Never leave a truncated or corrupt copy behind
+            if os.path.lexists(temporary):
+                os.remove(temporary)
+            raise
+        if hashes:
+            record_hashes(destination, *hashes)
+        return {"off": "copy", "checksum": "copy+checksum"}.get(verification, "copy+verified")
+
+_engine = KernelTransferEngine()
+
+def get_transfer_engine():
+    return _engine
+
+def set_transfer_engine(engine):
+    """Replace the engine used by all sorters. Returns the previous engine."""
+    global _engine
+    previous = _engine
+    _engine = engine
+    return previous
+
+# CONVENIENCE FUNCTIONS:
+# Move a file with whichever engine is currently installed
+def move_file(source, destination):
+    return _engine.move(source, destination)
+
+def move_file_unique(source, destination, attempts=100):
+    """Like move_file, but adds " (1)", " (2)"... to the name instead of failing on a clash."""
+    return _unique(_engine.move, source, destination, attempts)[0]
+
+# Place a file per the placement mode (moved, or linked/copied with the source kept)
+def place_file(source, destination):
+    return _engine.place(source, destination)
+
+def place_file_unique(source, destination, attempts=100):
+    """Like place_file, but never fails on a name clash. Returns (path, strategy)."""
+    return _unique(_engine.place, source, destination, attempts)
+
+def keeps_source(source):
+    return _engine.keeps_source(source)
+
+def _unique(transfer, source, destination, attempts):
+    destination = Path(destination)
+    candidate = destination
+    for n in range(1, attempts + 1):
+        try:
+            return candidate, transfer(source, candidate)
+        except FileExistsError:
+            candidate = destination.with_name(f"{destination.stem} ({n}){destination.suffix}")
+    raise FileExistsError(f"No free name for {destination.name} after {attempts} attempts")
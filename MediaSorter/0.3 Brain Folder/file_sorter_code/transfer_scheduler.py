@@ -0,0 +1,128 @@
+# transfer_scheduler.py v1.1
+# Runs file transfers in parallel, with one bounded thread pool per destination
+# device, so a slow disk or share does not hold up transfers to faster ones
+
+import os
+import queue
+import logging
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+from pathlib import Path
+
+# Workers per device when the settings don't say otherwise
+DEFAULT_WORKERS = 2
+
+class TransferCancelled(Exception):
+    """Raised inside a queued transfer when the batch was cancelled before it started."""
+
+# DEVICE LOOKUP:
+# Finds the filesystem id of a folder, walking up to the first parent that exists
+def device_of(path):
+    current = Path(path)
+    while True:
+        try:
+            return os.stat(current).st_dev
+        except OSError:
+            if current.parent == current:
+                return None
+            current = current.parent
+
+# TRANSFER SCHEDULER CLASS:
+# Groups submitted transfers by destination device. Results are handed back to
+# the submitting thread through completed()/wait_all() so callers can keep
+# driving progress callbacks from a single thread.
+class TransferScheduler:
+    def __init__(self, device_concurrency=None, default_workers=DEFAULT_WORKERS, control=None):
+        """
+        Args:
+            device_concurrency: Optional dict of {folder path: worker count}. Every
+                destination on the same device as that folder uses that many workers.
+            default_workers: Worker count for devices not listed in device_concurrency
+            control: Optional SortControl, checked before each transfer starts
+        """
+        self.default_workers = max(1, int(default_workers))
+        self.control = control
+        self._workers_by_device = {}
+        for folder, workers in (device_concurrency or {}).items():
+            device = device_of(folder)
+            if device is not None:
+                self._workers_by_device[device] = max(1, int(workers))
+        self._device_cache = {}
+        self._pools = {}
+        self._pending = set()
+        self._done = queue.Queue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(cancel=exc_type is not None)
+        return False
+
+    def _device_for(self, destination):
+        folder = str(Path(destination).parent)
+        if folder not in self._device_cache:
+            self._device_cache[folder] = device_of(folder)
+        return self._device_cache[folder]
+
+    def _pool_for(self, device):
+        if device not in self._pools:
+            workers = self._workers_by_device.get(device, self.default_workers)
+            self._pools[device] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"transfer-{device}")
+            logging.info(f"Started transfer pool for device {device} with {workers} worker(s)")
+        return self._pools[device]
+
+    def _run(self, fn, args):
+        # Pause/cancel point before each transfer
+        if self.control and not self.control.checkpoint():
+            raise TransferCancelled()
+        return fn(*args)
+
+    def submit(self, destination, fn, *args, tag=None):
+        """Queue fn(*args) on the pool for destination's device."""
+        future = self._pool_for(self._device_for(destination)).submit(self._run, fn, args)
+        self._pending.add(future)
+        future.add_done_callback(lambda f: self._done.put((tag, f)))
+        return future
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def _collect(self, item):
+        tag, future = item
+        self._pending.discard(future)
+        try:
+            return tag, future.result(), None
+        except CancelledError:
+            return tag, None, TransferCancelled()
+        except Exception as e:
+            return tag, None, e
+
+    def completed(self):
+        """Yield (tag, result, error) for every transfer finished so far, without blocking."""
+        while True:
+            try:
+                item = self._done.get_nowait()
+            except queue.Empty:
+                return
+            yield self._collect(item)
+
+    def wait_one(self):
+        """Block until an outstanding transfer finishes and return its (tag, result, error)."""
+        return self._collect(self._done.get())
+
+    def wait_all(self):
+        """Yield (tag, result, error) for every outstanding transfer as it finishes."""
+        while self._pending:
+            yield self._collect(self._done.get())
+
+    def cancel_pending(self):
+        for future in list(self._pending):
+            future.cancel()
+
+    def shutdown(self, cancel=False):
+        if cancel:
+            self.cancel_pending()
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
+        self._pools = {}
@@ -0,0 +1,150 @@
+# watch_service.py v1.1
+# Watch mode: picks up files as they land in the sorting folder, waits until
+# they are finished being written, and hands them to the sort pipeline in
+# small batches. Sleeps in the kernel while the folder is idle.
+
+import os
+import time
+import logging
+import threading
+from pathlib import Path
+
+from file_sorter_code.folder_watcher import create_watcher, WRITTEN, CHANGED, REMOVED, RESCAN
+from file_sorter_code.transfer_engine import is_partial_name
+
+# Files that live in the sorting folder on purpose
+IGNORED_NAMES = {"placement_file.txt"}
+
+# Longest single wait, so a stop request is noticed promptly
+MAX_WAIT = 1.0
+
+# WATCH SERVICE CLASS:
+class WatchService:
+    def __init__(self, folder, sort_batch, settle_seconds=1.0, stable_seconds=5.0,
+                 batch_window=2.0, max_batch=200, stop_event=None):
+        """
+        Args:
+            folder: Folder to watch
+            sort_batch: Called with a list of file paths that are ready to sort
+            settle_seconds: Quiet time after a close-write/move-in before a file is ready
+            stable_seconds: How long a file's size must stay the same when no
+                close-write was seen (polling, or files still being copied)
+            batch_window: How long to collect ready files before sorting them
+            max_batch: Sort right away once this many files are ready
+            stop_event: Optional threading.Event used to stop run()
+        """
+        self.folder = Path(folder)
+        self.sort_batch = sort_batch
+        self.settle_seconds = settle_seconds
+        self.stable_seconds = stable_seconds
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.stop_event = stop_event or threading.Event()
+        # name -> [complete, size, last_checked]
+        self._pending = {}
+        # name -> path, in arrival order
+        self._ready = {}
+        self._ready_since = None
+
+    def stop(self):
+        self.stop_event.set()
+
+    # PENDING FILE TRACKING:
+    def _size(self, name):
+        try:
+            return os.stat(self.folder / name).st_size
+        except OSError:
+            return None
+
+    def _track(self, kind, name, now):
+        if name in IGNORED_NAMES or is_partial_name(name):
+            # Partial copies are renamed into place once complete
+            return
+        # A ready file that changes again goes back to waiting
+        self._ready.pop(name, None)
+        if not self._ready:
+            self._ready_since = None
+        if kind == REMOVED:
+            self._pending.pop(name, None)
+        elif kind == WRITTEN:
+            self._pending[name] = [True, None, now]
+        elif kind == CHANGED:
+            entry = self._pending.get(name)
+            if entry is None or not entry[0]:
+                self._pending[name] = [False, self._size(name), now]
+
+    def _rescan(self, now):
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        self._track(CHANGED, entry.name, now)
+        except OSError as e:
+            logging.error(f"Watch mode could not scan {self.folder}: {e}")
+
+    def _promote(self, now):
+        """Move finished files from pending to the ready list."""
+        for name, (complete, size, checked) in list(self._pending.items()):
+            if complete:
+                if now - checked < self.settle_seconds:
+                    continue
+            else:
+                if now - checked < self.stable_seconds:
+                    continue
+                current = self._size(name)
+                if current is None:
+                    del self._pending[name]
+                    continue
+                if current != size:
+                    # Still growing; check again later
+                    self._pending[name] = [False, current, now]
+                    continue
+            del self._pending[name]
+            if not self._ready:
+                self._ready_since = now
+            self._ready[name] = str(self.folder / name)
+
+    def _next_timeout(self, now):
+        deadlines = []
+        for complete, _, checked in self._pending.values():
+            deadlines.append(checked + (self.settle_seconds if complete else self.stable_seconds))
+        if self._ready:
+            deadlines.append(self._ready_since + self.batch_window)
+        if not deadlines:
+            return MAX_WAIT
+        return min(MAX_WAIT, max(0.0, min(deadlines) - now))
+
+    def _flush(self):
+        batch = list(self._ready.values())
+        self._ready, self._ready_since = {}, None
+        logging.info(f"Watch mode sorting {len(batch)} new file(s)")
+        try:
+            self.sort_batch(batch)
+        except Exception as e:
+            logging.error(f"Watch mode batch failed: {e}")
+
+    # MAIN LOOP:
+    def run(self):
+        self.folder.mkdir(parents=True, exist_ok=True)
+        watcher = create_watcher(self.folder)
+        logging.info(f"Watch mode started on {self.folder} ({type(watcher).__name__})")
+        try:
+            # Anything already waiting in the folder is treated like a new arrival
+            self._rescan(time.monotonic())
+            while not self.stop_event.is_set():
+                for kind, name in watcher.wait(self._next_timeout(time.monotonic())):
+                    if kind == RESCAN:
+                        self._rescan(time.monotonic())
+                    else:
+                        self._track(kind, name, time.monotonic())
+
+                now = time.monotonic()
+                self._promote(now)
+                if self._ready and (len(self._ready) >= self.max_batch
+                                    or now - self._ready_since >= self.batch_window):
+                    self._flush()
+            if self._ready:
+                self._flush()
+        finally:
+            watcher.close()
+            logging.info(f"Watch mode stopped on {self.folder}")
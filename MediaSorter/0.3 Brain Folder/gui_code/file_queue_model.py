@@ -0,0 +1,212 @@
+# file_queue_model.py v1.1
+# List model behind the Sort Files and Movies queues. Paths are kept in one
+# plain list (no item objects), duplicates are rejected with a set, large
+# additions are inserted in chunks between event-loop iterations, and files
+# are stat'ed on a background thread instead of while they are being added.
+# Removals take out row ranges, and paths the stat worker rejects are
+# collected and removed together.
+
+import os
+import stat
+import queue
+import logging
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QThread, QTimer, pyqtSignal
+
+# Paths inserted per event-loop iteration (one beginInsertRows each)
+INSERT_CHUNK = 20000
+# Paths stat'ed before results are sent back to the model
+STAT_BATCH = 2000
+# Removals spread over more separate row ranges than this reset the view once instead
+REMOVE_RANGES_MAX = 64
+# How long rejected paths are collected before they are removed (ms)
+REMOVE_DELAY_MS = 200
+
+def _format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+# STAT WORKER:
+# Checks queued paths off the GUI thread; reports sizes and anything that is not a file
+class StatWorker(QThread):
+    checked = pyqtSignal(list, dict)    # paths that are not files, {path: size}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = queue.Queue()
+
+    def enqueue(self, paths):
+        self._queue.put(paths)
+
+    def stop(self):
+        self._queue.put(None)
+
+    def run(self):
+        missing, sizes = [], {}
+        while True:
+            try:
+                # Send partial results whenever the queue runs dry
+                paths = self._queue.get(timeout=0.1 if (missing or sizes) else None)
+            except queue.Empty:
+                self.checked.emit(missing, sizes)
+                missing, sizes = [], {}
+                continue
+            if paths is None:
+                break
+            for path in paths:
+                try:
+                    info = os.stat(path)
+                    if stat.S_ISREG(info.st_mode):
+                        sizes[path] = info.st_size
+                    else:
+                        missing.append(path)
+                except OSError:
+                    missing.append(path)
+                if len(missing) + len(sizes) >= STAT_BATCH:
+                    self.checked.emit(missing, sizes)
+                    missing, sizes = [], {}
+        if missing or sizes:
+            self.checked.emit(missing, sizes)
+
+# FILE QUEUE MODEL:
+class FileQueueModel(QAbstractListModel):
+    paths_added = pyqtSignal(int)       # how many new paths a chunk added
+    paths_dropped = pyqtSignal(int)     # how many queued paths turned out not to be files
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths = []
+        self._keys = set()
+        self._sizes = {}
+        self._incoming = []
+        self._stat_worker = None
+        self._rejected = []
+
+    # QT MODEL INTERFACE:
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._paths):
+            return None
+        path = self._paths[index.row()]
+        if role == Qt.DisplayRole:
+            return os.path.basename(path)
+        if role == Qt.ToolTipRole:
+            size = self._sizes.get(path)
+            return path if size is None else f"{path} ({_format_size(size)})"
+        if role == Qt.UserRole:
+            return path
+        return None
+
+    # ADDING FILES:
+    def add_paths(self, paths):
+        """Queue paths for insertion. Returns immediately; rows appear in chunks."""
+        start_pump = not self._incoming
+        self._incoming.append(iter(paths))
+        if start_pump:
+            QTimer.singleShot(0, self._pump)
+
+    def _pump(self):
+        new_paths = []
+        while self._incoming and len(new_paths) < INSERT_CHUNK:
+            source = self._incoming[0]
+            for path in source:
+                path = os.path.abspath(str(path))
+                key = os.path.normcase(path)
+                if key in self._keys:
+                    continue
+                self._keys.add(key)
+                new_paths.append(path)
+                if len(new_paths) >= INSERT_CHUNK:
+                    break
+            else:
+                self._incoming.pop(0)
+
+        if new_paths:
+            first = len(self._paths)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_paths) - 1)
+            self._paths.extend(new_paths)
+            self.endInsertRows()
+            self._get_stat_worker().enqueue(new_paths)
+            self.paths_added.emit(len(new_paths))
+
+        if self._incoming:
+            # Let the event loop paint and handle input before the next chunk
+            QTimer.singleShot(0, self._pump)
+
+    # BACKGROUND STAT:
+    def _get_stat_worker(self):
+        if self._stat_worker is None:
+            self._stat_worker = StatWorker(self)
+            self._stat_worker.checked.connect(self._on_checked)
+            self._stat_worker.start()
+        return self._stat_worker
+
+    def _on_checked(self, missing, sizes):
+        # Skip paths removed while they were being stat'ed
+        self._sizes.update((path, size) for path, size in sizes.items() if os.path.normcase(path) in self._keys)
+        if missing:
+            if not self._rejected:
+                QTimer.singleShot(REMOVE_DELAY_MS, self._remove_rejected)
+            self._rejected.extend(missing)
+
+    def _remove_rejected(self):
+        missing, self._rejected = self._rejected, []
+        if missing:
+            logging.info(f"Removed {len(missing)} queued paths that are not files")
+            self.remove_paths(missing)
+            self.paths_dropped.emit(len(missing))
+
+    def shutdown(self):
+        if self._stat_worker is not None:
+            self._stat_worker.stop()
+            self._stat_worker.wait()
+            self._stat_worker = None
+
+    # QUEUE ACCESS:
+    def paths(self):
+        """Snapshot of the queued paths, in order."""
+        return list(self._paths)
+
+    def size_of(self, path):
+        """File size if the background stat has reached it yet, otherwise None."""
+        return self._sizes.get(path)
+
+    def remove_paths(self, paths):
+        """Drop the given paths from the queue (e.g. after they were sorted)."""
+        keys = {os.path.normcase(os.path.abspath(str(path))) for path in paths}
+        keys &= self._keys
+        if not keys:
+            return
+        rows = [row for row, path in enumerate(self._paths) if os.path.normcase(path) in keys]
+        for row in rows:
+            self._sizes.pop(self._paths[row], None)
+        self._keys -= keys
+
+        # Contiguous (first, last) row ranges
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        if len(ranges) > REMOVE_RANGES_MAX:
+            self.beginResetModel()
+            self._paths = [path for path in self._paths if os.path.normcase(path) not in keys]
+            self.endResetModel()
+            return
+        # Last range first, so earlier row numbers stay valid
+        for first, last in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._paths[first:last + 1]
+            self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._paths, self._keys, self._sizes = [], set(), {}
+        self._incoming = []
+        self._rejected = []
+        self.endResetModel()
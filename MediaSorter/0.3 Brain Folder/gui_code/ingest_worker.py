@@ -0,0 +1,30 @@
+# ingest_worker.py v1.0
+# Moves files dropped on the main window into the sorting folder on a
+# background thread, so cross-device copies never freeze the window
+
+import logging
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from file_sorter_code.sort_control import SortControl
+from file_sorter_code.ingest import ingest_paths
+
+# INGEST WORKER:
+class IngestWorker(QThread):
+    progress = pyqtSignal(int, str)               # files handled so far, message
+    ingest_finished = pyqtSignal(int, int, bool)  # moved, failed, cancelled
+    failed = pyqtSignal(str)
+
+    def __init__(self, paths, sorting_folder, parent=None):
+        super().__init__(parent)
+        self.paths = list(paths)
+        self.sorting_folder = sorting_folder
+        self.control = SortControl()
+
+    def run(self):
+        try:
+            moved, failed = ingest_paths(self.paths, self.sorting_folder,
+                                         progress_callback=self.progress.emit, control=self.control)
+            self.ingest_finished.emit(moved, failed, self.control.is_cancelled())
+        except Exception as e:
+            logging.error(f"Ingest worker failed: {e}")
+            self.failed.emit(str(e))
@@ -0,0 +1,98 @@
+# log_view.py v1.0
+# Logs tab widget. Messages go into a fixed-size ring buffer and are written
+# to a plain-text view in one insert every FLUSH_INTERVAL_MS, so a busy batch
+# costs one layout per tick instead of one per message.
+
+import time
+import logging
+from collections import deque
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPlainTextEdit, QPushButton
+from PyQt5.QtCore import QTimer
+
+# Lines kept in memory and shown in the view
+MAX_LINES = 5000
+# How often pending lines are written to the view
+FLUSH_INTERVAL_MS = 100
+
+LEVEL_FILTERS = [
+    ("All", logging.DEBUG),
+    ("Info and above", logging.INFO),
+    ("Warnings and errors", logging.WARNING),
+    ("Errors only", logging.ERROR),
+]
+
+def level_for_message(message):
+    """Guess a level for pipeline progress messages ("Failed to move ...", "Error ...")."""
+    if message.startswith("Error"):
+        return logging.ERROR
+    if message.startswith(("Failed", "Skipped")):
+        return logging.WARNING
+    return logging.INFO
+
+# LOG VIEW WIDGET:
+class LogView(QWidget):
+    def __init__(self, parent=None, max_lines=MAX_LINES, interval_ms=FLUSH_INTERVAL_MS):
+        super().__init__(parent)
+        self._lines = deque(maxlen=max_lines)      # (level, text), everything recent
+        self._pending = deque(maxlen=max_lines)    # (level, text) not yet in the view
+        self._min_level = logging.DEBUG
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Show:"))
+        self.level_filter = QComboBox()
+        for label, _ in LEVEL_FILTERS:
+            self.level_filter.addItem(label)
+        self.level_filter.currentIndexChanged.connect(self._on_filter_changed)
+        controls.addWidget(self.level_filter)
+        controls.addStretch()
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self.clear)
+        controls.addWidget(clear_button)
+        layout.addLayout(controls)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setUndoRedoEnabled(False)
+        self.text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        # The view drops its oldest lines on its own once the cap is reached
+        self.text.setMaximumBlockCount(max_lines)
+        layout.addWidget(self.text)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def append(self, message, level=logging.INFO):
+        """Queue a message; it shows up on the next flush. Cheap enough to call per file."""
+        prefix = "" if level < logging.WARNING else f"{logging.getLevelName(level)}: "
+        entry = (level, f"{time.strftime('%H:%M:%S')}  {prefix}{message}")
+        self._lines.append(entry)
+        self._pending.append(entry)
+
+    def flush(self):
+        if not self._pending:
+            return
+        lines = [text for level, text in self._pending if level >= self._min_level]
+        self._pending.clear()
+        if lines:
+            # One insert for the whole tick
+            self.text.appendPlainText("\n".join(lines))
+            scrollbar = self.text.verticalScrollBar()
+            scrollbar.setValue(scrollbar.maximum())
+
+    def clear(self):
+        self._lines.clear()
+        self._pending.clear()
+        self.text.clear()
+
+    def _on_filter_changed(self, index):
+        self._min_level = LEVEL_FILTERS[index][1]
+        # Rebuild from the ring buffer with the new filter
+        self._pending.clear()
+        self.text.setPlainText("\n".join(text for level, text in self._lines if level >= self._min_level))
+        scrollbar = self.text.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
@@ -0,0 +1,113 @@
+# sort_workers.py v1.2
+# Runs the Sort Files and Sort Movies pipelines on background threads
+# so the main window stays responsive during large batches. Progress goes out
+# as coalesced ProgressSnapshots (a few per second), not one signal per file.
+# With MEDIASORTER_PROFILE set, each batch is profiled (see sort_metrics.py).
+
+import os
+import logging
+from pathlib import Path
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from file_sorter_code.sort_control import SortControl
+from file_sorter_code.progress_tracker import ProgressTracker
+from file_sorter_code.sort_metrics import get_sort_metrics, profile_batch
+
+# FILE SORT WORKER:
+# Runs process_gui_files off the GUI thread and reports back through signals
+class SortFilesWorker(QThread):
+    progress = pyqtSignal(object)                 # ProgressSnapshot
+    file_result = pyqtSignal(str, str, str)       # file path, outcome, message
+    batch_finished = pyqtSignal(int, int, int, bool)  # total, sorted, unsorted, cancelled
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_paths, parent=None):
+        super().__init__(parent)
+        self.file_paths = list(file_paths)
+        self.control = SortControl()
+
+    def run(self):
+        try:
+            from file_sorter_code.file_sorter_button import process_gui_files
+
+            tracker = ProgressTracker(self.progress.emit)
+            with profile_batch("tv"):
+                total, sorted_count, unsorted_count = process_gui_files(
+                    self.file_paths,
+                    result_callback=self.file_result.emit,
+                    control=self.control,
+                    tracker=tracker,
+                )
+            tracker.finish()
+            self.batch_finished.emit(total, sorted_count, unsorted_count, self.control.is_cancelled())
+        except Exception as e:
+            logging.error(f"File sort worker failed: {e}")
+            self.failed.emit(str(e))
+
+# MOVIE SORT WORKER:
+# Runs sort_movie over a list of files off the GUI thread
+class SortMoviesWorker(QThread):
+    progress = pyqtSignal(object)
+    file_result = pyqtSignal(str, str, str)
+    batch_finished = pyqtSignal(int, int, int, bool)
+    failed = pyqtSignal(str)
+
+    def __init__(self, movie_files, movie_folder, parent=None):
+        super().__init__(parent)
+        self.movie_files = list(movie_files)
+        self.movie_folder = Path(movie_folder)
+        self.control = SortControl()
+
+    def run(self):
+        try:
+            from movie_code.movie_handler import sort_movie
+
+            with profile_batch("movies"):
+                self._sort_movies(sort_movie)
+        except Exception as e:
+            logging.error(f"Movie sort worker failed: {e}")
+            self.failed.emit(str(e))
+
+    def _sort_movies(self, sort_movie):
+        metrics = get_sort_metrics()
+        batch_mark = metrics.mark() if metrics.enabled else None
+        total_movies = len(self.movie_files)
+        sorted_count = 0
+        unsorted_count = 0
+
+        # Sizes up front so the byte total and ETA are known from the start
+        sizes = {}
+        for file_path in self.movie_files:
+            try:
+                sizes[file_path] = os.stat(file_path).st_size
+            except OSError:
+                pass
+        tracker = ProgressTracker(self.progress.emit, total_movies, sum(sizes.values()))
+
+        for idx, file_path in enumerate(self.movie_files, start=1):
+            # Pause/cancel point between files
+            if not self.control.checkpoint():
+                logging.info(f"Movie sorting cancelled after {idx - 1} of {total_movies} movies.")
+                break
+
+            path = Path(file_path)
+            try:
+                if path.is_file():
+                    if sort_movie(path, self.movie_folder):
+                        sorted_count += 1
+                        outcome, message = "sorted", f"Sorted movie: {path.name}"
+                    else:
+                        unsorted_count += 1
+                        outcome, message = "unsorted", f"Failed to sort movie: {path.name}"
+                else:
+                    outcome, message = "skipped", f"Movie file not found: {file_path}"
+            except Exception as e:
+                unsorted_count += 1
+                outcome, message = "unsorted", f"Error sorting movie {path.name}: {e}"
+
+            tracker.file_done(sizes.get(file_path, 0), message)
+            self.file_result.emit(str(file_path), outcome, message)
+
+        tracker.finish()
+        metrics.batch_done(batch_mark)
+        self.batch_finished.emit(total_movies, sorted_count, unsorted_count, self.control.is_cancelled())
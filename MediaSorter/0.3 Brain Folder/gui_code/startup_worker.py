@@ -0,0 +1,39 @@
+# startup_worker.py v1.0
+# Slow startup work that used to run before the window appeared: loading and
+# validating settings (custom folders may be on a sleeping NAS), creating the
+# sorting folder and parsing the events log for the Status tab. Started once
+# the window has been painted.
+
+import logging
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from settings.settings_service import get_settings_service
+from status.status_checker import get_status_summary
+
+# STARTUP WORKER:
+class StartupWorker(QThread):
+    status_ready = pyqtSignal(str)      # Status tab summary
+    settings_ready = pyqtSignal()       # settings loaded and validated
+
+    def __init__(self, sorting_folder, parent=None):
+        super().__init__(parent)
+        self.sorting_folder = sorting_folder
+
+    def run(self):
+        try:
+            self.sorting_folder.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logging.error(f"Could not create sorting folder {self.sorting_folder}: {e}")
+
+        try:
+            # First load checks that custom folders exist; later reads are cached
+            get_settings_service().all()
+        except Exception as e:
+            logging.error(f"Error loading settings: {e}")
+        self.settings_ready.emit()
+
+        try:
+            self.status_ready.emit(get_status_summary())
+        except Exception as e:
+            logging.error(f"Error reading status: {e}")
+            self.status_ready.emit("Status unavailable.")
@@ -0,0 +1,36 @@
+# watch_worker.py v1.0
+# Runs watch mode for the sorting folder on a background thread (GUI toggle)
+
+import logging
+import threading
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from file_sorter_code.watch_service import WatchService
+
+# WATCH WORKER:
+# Sorts new arrivals in micro-batches and reports back through signals
+class WatchWorker(QThread):
+    progress = pyqtSignal(int, int, str)              # current, total, message
+    batch_finished = pyqtSignal(int, int, int)        # total, sorted, unsorted
+    failed = pyqtSignal(str)
+
+    def __init__(self, folder, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _sort_batch(self, file_paths):
+        from file_sorter_code.file_sorter_button import process_gui_files
+
+        total, sorted_count, unsorted_count = process_gui_files(file_paths, progress_callback=self.progress.emit)
+        self.batch_finished.emit(total, sorted_count, unsorted_count)
+
+    def run(self):
+        try:
+            WatchService(self.folder, self._sort_batch, stop_event=self._stop_event).run()
+        except Exception as e:
+            logging.error(f"Watch mode failed: {e}")
+            self.failed.emit(str(e))
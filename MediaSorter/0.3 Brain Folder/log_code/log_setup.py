@@ -0,0 +1,103 @@
+# log_setup.py v1.1
+# One logging setup for the whole app (GUI, CLI and direct script runs).
+# Callers only put records on a queue; a single listener thread writes them to
+# disk, so sort workers never wait on the log file. Two rotating files:
+#   file_sorter_log.txt  - human-readable log
+#   sort_events.jsonl    - one JSON object per file handled (input for status and metrics)
+
+import json
+import queue
+import atexit
+import logging
+import threading
+from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_DIR = Path(__file__).resolve().parent.parent
+LOG_FILE = LOG_DIR / "file_sorter_log.txt"
+EVENTS_FILE = LOG_DIR / "sort_events.jsonl"
+
+# Size-based rotation (file_sorter_log.txt.1, .2, ...)
+MAX_LOG_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Logger that file events are sent through
+EVENT_LOGGER = "mediasorter.events"
+
+_listener = None
+_setup_lock = threading.Lock()
+
+# EVENT FORMATTING:
+class _EventFilter(logging.Filter):
+    def filter(self, record):
+        return hasattr(record, "event")
+
+class JsonEventFormatter(logging.Formatter):
+    def format(self, record):
+        event = {"time": round(record.created, 3), "level": record.levelname}
+        event.update(record.event)
+        return json.dumps(event)
+
+# SETUP:
+def setup_logging(level=logging.INFO, log_file=LOG_FILE, events_file=EVENTS_FILE):
+    """Route all logging through a queue to the rotating log files. Safe to call more than once."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        text_handler = RotatingFileHandler(log_file, maxBytes=MAX_LOG_BYTES, backupCount=BACKUP_COUNT,
+                                           encoding="utf-8", delay=True)
+        text_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        events_handler = RotatingFileHandler(events_file, maxBytes=MAX_LOG_BYTES, backupCount=BACKUP_COUNT,
+                                             encoding="utf-8", delay=True)
+        events_handler.addFilter(_EventFilter())
+        events_handler.setFormatter(JsonEventFormatter())
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(QueueHandler(log_queue))
+        root.setLevel(level)
+
+        _listener = QueueListener(log_queue, text_handler, events_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+def shutdown_logging():
+    """Write out anything still queued and stop the listener thread."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+# FILE EVENTS:
+def log_event(pipeline, file, action, outcome, bytes=None, duration=None, destination=None, message=None,
+              level=logging.INFO, strategy=None):
+    """
+    Record what happened to one file.
+
+    Args:
+        pipeline: "tv", "movies" or "ingest"
+        file: Source path
+        action: What was attempted ("place", "duplicate", "unsorted", "skip", "movie", ...)
+        outcome: "sorted", "unsorted", "skipped" or "failed"
+        bytes: File size, if known
+        duration: Seconds the transfer took, if known
+        destination: Where the file ended up
+        message: The human-readable line for the text log
+        level: Log level for the text log line
+        strategy: How the file got there ("rename", "hardlink", "reflink",
+            "copy", ...), if it was transferred
+    """
+    event = {"pipeline": pipeline, "file": str(file), "action": action, "outcome": outcome,
+             "bytes": bytes, "duration": round(duration, 6) if duration is not None else None,
+             "destination": str(destination) if destination else None, "strategy": strategy}
+    logging.getLogger(EVENT_LOGGER).log(level, message or f"{action} {outcome}: {file}", extra={"event": event})
@@ -0,0 +1,7 @@
+# __main__.py
+# Lets the headless runner be started with: python -m mediasorter <command> ...
+
+import sys
+from mediasorter.cli import main
+
+sys.exit(main())
@@ -0,0 +1,221 @@
+# api.py v1.1
+# Library API for embedding the TV sorter in other tools. Takes any iterable of
+# paths (a list, a generator, an endless stream) and yields a SortResult for
+# each file as it finishes, instead of progress strings to scrape:
+#
+#   from mediasorter.api import sort_paths, sort_paths_async
+#
+#   for result in sort_paths(paths):
+#       print(result.source, result.outcome, result.destination)
+#
+#   async for result in sort_paths_async(paths):    # paths may be an async iterable
+#       ...
+#
+# Paths are pulled lazily and sorted chunk_size at a time on a worker thread.
+# At most max_pending results wait for the consumer, and at most max_pending
+# transfers are queued or running; when the consumer falls behind, no new
+# transfer starts until there is room, so memory and work stay bounded however
+# long the stream is. Stopping early (break, close(), cancelling the task)
+# cancels the batch between files; transfers already running are finished.
+# Nothing is logged to disk unless the caller runs log_setup.setup_logging().
+
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+
+from file_sorter_code.file_scanner import iter_chunks
+from file_sorter_code.file_sorter_button import find_mediasorter_root, get_series_base
+from file_sorter_code.sort_control import SortControl
+from file_sorter_code.sort_pipeline import build_plan, execute_plan, SortResult  # noqa: F401 (re-exported)
+
+# Paths planned and sorted together
+CHUNK_SIZE = 100
+
+# Results held for a slow consumer before the sort waits
+MAX_PENDING = 64
+
+# How long the worker waits before checking whether the consumer has gone
+# away, and how long a part-filled chunk from an async source waits for more
+# paths before it is sorted anyway
+POLL_SECONDS = 0.5
+
+# End of stream marker, and a wrapper for an error raised on the worker
+_DONE = object()
+
+class _Failed:
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+# WORKER THREAD:
+# Sorts chunk after chunk and hands every result to put(), which blocks while
+# the consumer is behind and returns at once once stop is set
+def _run(chunks, put, control, stop, series_base, unsorted_folder, jobs, max_in_flight):
+    try:
+        for chunk in chunks:
+            if stop.is_set() or control.is_cancelled():
+                break
+            # Settings are read per chunk, as process_gui_files does per call
+            base = Path(series_base) if series_base else get_series_base()
+            unsorted = Path(unsorted_folder) if unsorted_folder else find_mediasorter_root() / "0.2 Unsorted Folder"
+            execute_plan(build_plan(chunk, base), unsorted, control=control, jobs=jobs, file_callback=put,
+                         max_in_flight=max_in_flight)
+    except BaseException as e:
+        logging.error(f"Sort stream failed: {e}")
+        put(_Failed(e))
+    finally:
+        put(_DONE)
+
+def _start_worker(chunks, put, control, stop, series_base, unsorted_folder, jobs, max_in_flight):
+    # Not a daemon: a process exiting mid-stream still waits for the running transfers
+    worker = threading.Thread(target=_run, name="mediasorter-api",
+                              args=(chunks, put, control, stop, series_base, unsorted_folder, jobs, max_in_flight))
+    worker.start()
+    return worker
+
+# SYNCHRONOUS STREAM:
+def sort_paths(paths, series_base=None, unsorted_folder=None, jobs=None, chunk_size=CHUNK_SIZE,
+               max_pending=MAX_PENDING, control=None):
+    """
+    Sort TV episodes, yielding a SortResult per file as each one finishes
+    (in completion order, not input order).
+
+    Args:
+        paths: Iterable of file paths; consumed lazily, may be endless. A chunk
+            is sorted once chunk_size paths have been read, so for a slow
+            trickle of paths use a small chunk_size (or sort_paths_async)
+        series_base: Folder series folders go in (default: from settings)
+        unsorted_folder: Where unrecognized files go (default: 0.2 Unsorted Folder)
+        jobs: Optional transfer workers per device
+        chunk_size: Paths planned and sorted together
+        max_pending: Finished results that may wait for the consumer, and
+            transfers that may be queued or running, before the sort pauses
+        control: Optional SortControl to pause or cancel from another thread
+
+    Raises:
+        Whatever stopped the sort itself (per-file errors are results, not exceptions)
+    """
+    control = control or SortControl()
+    results = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=POLL_SECONDS)
+                return
+            except queue.Full:
+                pass
+
+    worker = _start_worker(iter_chunks(paths, chunk_size), put, control, stop, series_base, unsorted_folder, jobs,
+                           max_pending)
+    finished = False
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                finished = True
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+    finally:
+        if not finished:
+            control.cancel()
+        stop.set()
+        worker.join()
+
+# ASYNCHRONOUS STREAM:
+async def _next_path(iterator):
+    # Wrapped so the worker thread can schedule it (and so the end of the
+    # iterator comes back as a value rather than StopAsyncIteration)
+    try:
+        return True, await iterator.__anext__()
+    except StopAsyncIteration:
+        return False, None
+
+def _async_chunks(paths, loop, stop, chunk_size):
+    """
+    Chunks of paths pulled from an async iterable on loop. A chunk is sorted
+    when it is full or when no new path has arrived for POLL_SECONDS.
+    """
+    iterator = paths.__aiter__()
+    chunk = []
+    pending = None
+    while not stop.is_set():
+        if pending is None:
+            pending = asyncio.run_coroutine_threadsafe(_next_path(iterator), loop)
+        try:
+            more, path = pending.result(POLL_SECONDS)
+        except FutureTimeout:
+            if chunk:
+                yield chunk
+                chunk = []
+            continue
+        pending = None
+        if not more:
+            break
+        chunk.append(path)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if pending is not None:
+        pending.cancel()
+    if chunk and not stop.is_set():
+        yield chunk
+
+async def sort_paths_async(paths, series_base=None, unsorted_folder=None, jobs=None, chunk_size=CHUNK_SIZE,
+                           max_pending=MAX_PENDING, control=None):
+    """
+    Async generator version of sort_paths(). paths may be a normal or an async
+    iterable; with an async one, a part-filled chunk is sorted as soon as the
+    source goes quiet for POLL_SECONDS. The sorting itself runs on a worker
+    thread, so the event loop is never blocked by file I/O.
+    """
+    loop = asyncio.get_running_loop()
+    control = control or SortControl()
+    results = asyncio.Queue(maxsize=max_pending)
+    stop = threading.Event()
+
+    def put(item):
+        if stop.is_set():
+            return
+        try:
+            future = asyncio.run_coroutine_threadsafe(results.put(item), loop)
+        except RuntimeError:
+            # The event loop is gone; nobody is listening any more
+            stop.set()
+            return
+        while True:
+            try:
+                future.result(POLL_SECONDS)
+                return
+            except FutureTimeout:
+                if stop.is_set():
+                    future.cancel()
+                    return
+
+    if hasattr(paths, "__aiter__"):
+        chunks = _async_chunks(paths, loop, stop, chunk_size)
+    else:
+        chunks = iter_chunks(paths, chunk_size)
+    worker = _start_worker(chunks, put, control, stop, series_base, unsorted_folder, jobs, max_pending)
+    finished = False
+    try:
+        while True:
+            item = await results.get()
+            if item is _DONE:
+                finished = True
+                return
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+    finally:
+        if not finished:
+            control.cancel()
+        stop.set()
+        await loop.run_in_executor(None, worker.join)
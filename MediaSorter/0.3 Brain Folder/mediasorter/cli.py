@@ -0,0 +1,407 @@
+# cli.py v1.4
+# Headless batch runner for the TV and movie pipelines (does not import PyQt5)
+# Run from the "0.3 Brain Folder":
+#   python -m mediasorter sort [PATH ...] [--movies] [--jobs N] [--dry-run] [--since 7d] [--json]
+#                              [--recursive | --max-depth N] [--include GLOB] [--exclude GLOB] [--no-progress]
+#   python -m mediasorter watch [FOLDER] [--jobs N] [--json]
+#   python -m mediasorter dupes FOLDER [FOLDER ...] [--json]
+#   python -m mediasorter resume [--list] [--jobs N] [--json]
+# While sorting, a live progress line (files, data, MB/s, ETA) is written to
+# stderr when it is a terminal.
+# sort, watch and resume also take --metrics, --metrics-file PATH, --metrics-port N
+# and --profile PATH (see file_sorter_code/sort_metrics.py).
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from file_sorter_code.file_sorter_button import find_mediasorter_root
+from file_sorter_code.file_scanner import scan_entries, iter_chunks
+from file_sorter_code.progress_tracker import ProgressTracker, format_progress
+from file_sorter_code.sort_metrics import get_sort_metrics, profiled
+from log_code.log_setup import setup_logging
+
+# EXIT CODES:
+EXIT_OK = 0             # Everything sorted, or nothing to do
+EXIT_PARTIAL = 1        # Some files ended up unsorted or failed
+EXIT_USAGE = 2          # Bad arguments (argparse uses 2 as well)
+EXIT_ERROR = 3          # The run itself failed
+EXIT_INTERRUPTED = 130  # Stopped with Ctrl+C
+
+# Files are planned and sorted this many at a time while the scan continues
+STREAM_CHUNK = 500
+
+# Files that live in the sorting folder on purpose
+DEFAULT_EXCLUDE = ["placement_file.txt"]
+
+# ARGUMENT HELPERS:
+_RELATIVE_SINCE = re.compile(r"^(\d+)([smhd])$")
+_SINCE_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+def parse_since(value):
+    """Turn "30m", "12h", "7d" or an ISO date/time into a Unix timestamp."""
+    match = _RELATIVE_SINCE.match(value.strip())
+    if match:
+        delta = timedelta(**{_SINCE_UNITS[match.group(2)]: int(match.group(1))})
+        return (datetime.now() - delta).timestamp()
+    try:
+        return datetime.fromisoformat(value.strip()).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid --since value: {value!r} (use e.g. 12h, 7d or 2024-05-01)")
+
+def collect_files(paths, since=None, include=None, exclude=None, max_depth=0):
+    """Lazily expand the given files and folders into file Paths (top level only by default)."""
+    for entry in scan_entries(paths, include=include, exclude=exclude, max_depth=max_depth):
+        if since is not None:
+            try:
+                # DirEntry.stat() reuses what the directory listing returned where it can
+                if entry.stat().st_mtime < since:
+                    continue
+            except OSError as e:
+                logging.warning(f"Skipped {entry.path}: {e}")
+                continue
+        yield Path(entry.path)
+
+# PROGRESS LINE:
+# One line on stderr, rewritten in place a few times a second
+def make_tracker(args):
+    if args.json or not args.progress or not sys.stderr.isatty():
+        return None
+
+    def show(snapshot):
+        line = format_progress(snapshot)
+        sys.stderr.write(f"\r{line:<79}" + ("\n" if snapshot.finished else ""))
+        sys.stderr.flush()
+
+    return ProgressTracker(show)
+
+# TV PIPELINE:
+def run_tv(files, args):
+    from file_sorter_code.file_sorter_button import process_gui_files, plan_gui_files
+
+    summary = {"pipeline": "tv", "dry_run": args.dry_run, "total": 0,
+               "sorted": 0, "unsorted": 0, "skipped": 0}
+
+    if args.dry_run:
+        # The same plan the real run executes, just not executed
+        plan = []
+        for chunk in iter_chunks(files, STREAM_CHUNK):
+            summary["total"] += len(chunk)
+            plan.extend(plan_gui_files(chunk).describe())
+        for entry in plan:
+            if entry["action"] == "skip":
+                summary["skipped"] += 1
+            elif entry["action"] == "unsorted":
+                summary["unsorted"] += 1
+            else:
+                summary["sorted"] += 1
+        summary["plan"] = plan
+        return summary
+
+    failures = []
+
+    def on_result(file_path, outcome, message):
+        if outcome == "skipped":
+            summary["skipped"] += 1
+        elif outcome == "unsorted":
+            failures.append({"file": file_path, "message": message})
+
+    # Sorting starts with the first chunk instead of after a full scan; the
+    # tracker's totals grow as chunks are planned
+    tracker = make_tracker(args)
+    for chunk in iter_chunks(files, STREAM_CHUNK):
+        total, sorted_count, unsorted_count = process_gui_files(chunk, result_callback=on_result, jobs=args.jobs,
+                                                                tracker=tracker)
+        summary["total"] += total
+        summary["sorted"] += sorted_count
+        summary["unsorted"] += unsorted_count
+    if tracker:
+        tracker.finish()
+    summary["failures"] = failures
+    return summary
+
+# MOVIE PIPELINE:
+def run_movies(files, args):
+    from movie_code.movie_handler import sort_movie, movie_destination
+    from file_sorter_code.transfer_scheduler import TransferScheduler, DEFAULT_WORKERS
+
+    movie_folder = Path(args.movie_folder) if args.movie_folder else find_mediasorter_root() / "Movies"
+    summary = {"pipeline": "movies", "dry_run": args.dry_run, "total": 0,
+               "sorted": 0, "unsorted": 0, "skipped": 0}
+
+    if args.dry_run:
+        summary["plan"] = [{"file": str(file), "action": "sort", "destination": str(movie_destination(file, movie_folder))}
+                           for file in files]
+        summary["total"] = summary["sorted"] = len(summary["plan"])
+        return summary
+
+    failures = []
+    tracker = make_tracker(args)
+    metrics = get_sort_metrics()
+    batch_mark = metrics.mark() if metrics.enabled else None
+    with TransferScheduler(default_workers=args.jobs or DEFAULT_WORKERS) as scheduler:
+        for chunk in iter_chunks(files, STREAM_CHUNK):
+            summary["total"] += len(chunk)
+            sizes = {}
+            for file in chunk:
+                if tracker:
+                    try:
+                        sizes[file] = os.stat(file).st_size
+                    except OSError:
+                        pass
+                scheduler.submit(movie_destination(file, movie_folder), sort_movie, file, movie_folder, tag=file)
+            if tracker:
+                tracker.add_total(len(chunk), sum(sizes.values()))
+            for file, moved, error in scheduler.wait_all():
+                if moved:
+                    summary["sorted"] += 1
+                    message = f"Sorted movie: {file.name}"
+                else:
+                    summary["unsorted"] += 1
+                    message = f"Failed to sort movie: {file.name}"
+                    failures.append({"file": str(file), "message": str(error) if error else "Failed to sort movie."})
+                if tracker:
+                    tracker.file_done(sizes.get(file, 0), message)
+    if tracker:
+        tracker.finish()
+    # sort_movie has no per-batch hook of its own (execute_plan does for TV)
+    metrics.batch_done(batch_mark)
+    summary["failures"] = failures
+    return summary
+
+# OUTPUT:
+def print_summary(summary, as_json):
+    if as_json:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+
+    for entry in summary.get("plan", []):
+        if entry["action"] == "skip":
+            target = f"Skipped ({entry['reason']})"
+        elif entry["action"] == "unsorted":
+            target = f"Unsorted ({entry['reason']})"
+        elif entry["action"] == "duplicate":
+            target = f"{entry['destination']} (already exists, contents will be compared)"
+        else:
+            target = entry["destination"]
+        print(f"{entry['file']} -> {target}")
+    for entry in summary.get("failures", []):
+        print(f"Unsorted: {entry['file']} ({entry['message']})")
+
+    prefix = "Dry run" if summary["dry_run"] else "Processing complete"
+    print(f"{prefix}. Total files: {summary['total']}, Sorted: {summary['sorted']}, "
+          f"Unsorted: {summary['unsorted']}, Skipped: {summary['skipped']} "
+          f"({summary['duration_seconds']:.2f}s)")
+
+# COMMAND HANDLERS:
+def command_sort(args):
+    paths = args.paths or [find_mediasorter_root() / "0.1 Sorting Folder"]
+    files = collect_files(paths, args.since, include=args.include, exclude=DEFAULT_EXCLUDE + args.exclude,
+                          max_depth=None if args.recursive else args.max_depth)
+
+    start = time.perf_counter()
+    summary = run_movies(files, args) if args.movies else run_tv(files, args)
+    summary["command"] = "sort"
+    summary["duration_seconds"] = round(time.perf_counter() - start, 3)
+
+    print_summary(summary, args.json)
+    print_metrics_report(args)
+    if summary["unsorted"] and not args.dry_run:
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+def command_dupes(args):
+    from file_sorter_code.duplicate_detector import get_duplicate_detector
+
+    paths = []
+    for root in args.roots:
+        for folder, _, names in os.walk(root):
+            paths.extend(os.path.join(folder, name) for name in names)
+
+    start = time.perf_counter()
+    groups = get_duplicate_detector().find_duplicates(paths)
+    summary = {"command": "dupes", "files": len(paths), "groups": groups,
+               "duration_seconds": round(time.perf_counter() - start, 3)}
+
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for group in groups:
+            print("Identical:")
+            for path in group:
+                print(f"  {path}")
+        print(f"Checked {len(paths)} files, found {len(groups)} groups of identical files "
+              f"({summary['duration_seconds']:.2f}s)")
+    return EXIT_OK
+
+def command_watch(args):
+    import signal
+    import threading
+    from file_sorter_code.watch_service import WatchService
+    from file_sorter_code.file_sorter_button import process_gui_files
+
+    folder = Path(args.folder) if args.folder else find_mediasorter_root() / "0.1 Sorting Folder"
+    stop_event = threading.Event()
+    # Stop cleanly (finishing the current batch) on Ctrl+C or a service manager's SIGTERM
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+    def sort_batch(file_paths):
+        start = time.perf_counter()
+        total, sorted_count, unsorted_count = process_gui_files(file_paths, jobs=args.jobs)
+        summary = {"command": "watch", "total": total, "sorted": sorted_count, "unsorted": unsorted_count,
+                   "duration_seconds": round(time.perf_counter() - start, 3)}
+        if args.json:
+            print(json.dumps(summary), flush=True)
+        else:
+            print(f"Sorted batch. Total files: {total}, Sorted: {sorted_count}, Unsorted: {unsorted_count} "
+                  f"({summary['duration_seconds']:.2f}s)", flush=True)
+
+    if not args.json:
+        print(f"Watching {folder} (Ctrl+C to stop)", flush=True)
+    WatchService(folder, sort_batch, settle_seconds=args.settle, stable_seconds=args.stable,
+                 stop_event=stop_event).run()
+    return EXIT_OK
+
+def command_resume(args):
+    from file_sorter_code.batch_journal import interrupted_journals
+    from file_sorter_code.sort_pipeline import resume_batch
+
+    start = time.perf_counter()
+    batches = []
+    tracker = None if args.list else make_tracker(args)
+    for state in interrupted_journals():
+        entry = {"batch": state.batch_id, "planned": len(state.planned), "committed": len(state.committed),
+                 "in_progress": len(state.in_progress)}
+        if not args.list:
+            entry["total"], entry["sorted"], entry["unsorted"] = resume_batch(state, jobs=args.jobs, tracker=tracker)
+        batches.append(entry)
+    if tracker:
+        tracker.finish()
+    summary = {"command": "resume", "batches": batches, "duration_seconds": round(time.perf_counter() - start, 3)}
+
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif not batches:
+        print("No interrupted batches.")
+    else:
+        for entry in batches:
+            line = (f"Batch {entry['batch']}: {entry['committed']} of {entry['planned']} files were done, "
+                    f"{entry['in_progress']} in progress")
+            if "total" in entry:
+                line += f"; resumed {entry['total']}, Sorted: {entry['sorted']}, Unsorted: {entry['unsorted']}"
+            print(line)
+        print(f"({summary['duration_seconds']:.2f}s)")
+
+    print_metrics_report(args)
+    if any(entry.get("unsorted") for entry in batches):
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+# METRICS:
+def add_metrics_arguments(parser):
+    parser.add_argument("--metrics", action="store_true",
+                        help="time each pipeline stage and print a report on stderr at the end")
+    parser.add_argument("--metrics-file", metavar="PATH",
+                        help="write Prometheus metrics to PATH after each batch (implies --metrics)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics (implies --metrics)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="run under cProfile and tracemalloc and write a pstats dump to PATH")
+
+def setup_metrics(args):
+    if getattr(args, "metrics", False) or getattr(args, "metrics_file", None) or getattr(args, "metrics_port", None):
+        get_sort_metrics().configure(args.metrics_file, args.metrics_port)
+
+def print_metrics_report(args):
+    metrics = get_sort_metrics()
+    if not metrics.enabled:
+        return
+    # Each batch already logged its report and wrote the textfile; this only
+    # shows the whole run on stderr
+    if args.metrics:
+        print(f"Stage timings:\n{metrics.report()}", file=sys.stderr)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="mediasorter", description="Headless MediaSorter batch runner")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sort_parser = subparsers.add_parser("sort", help="sort files into the TV or movie library")
+    sort_parser.add_argument("paths", nargs="*", help="files or folders to sort (default: 0.1 Sorting Folder)")
+    sort_parser.add_argument("--movies", action="store_true", help="use the movie pipeline instead of the TV one")
+    sort_parser.add_argument("--movie-folder", help="movie library folder (default: MediaSorter/Movies)")
+    sort_parser.add_argument("--jobs", type=int, default=None, help="transfer workers per destination device")
+    sort_parser.add_argument("--dry-run", action="store_true", help="show what would happen without moving anything")
+    sort_parser.add_argument("--since", type=parse_since, default=None,
+                             help="only files modified since a time (e.g. 12h, 7d, 2024-05-01)")
+    sort_parser.add_argument("--recursive", "-r", action="store_true", help="sort files in all subfolders too")
+    sort_parser.add_argument("--max-depth", type=int, default=0,
+                             help="subfolder levels to descend into (default: 0, top level only)")
+    sort_parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                             help="only sort files matching this pattern (repeatable, e.g. '*.mkv')")
+    sort_parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                             help="skip files and folders matching this pattern (repeatable, e.g. 'Sample*')")
+    sort_parser.add_argument("--json", action="store_true", help="print a machine-readable JSON summary")
+    sort_parser.add_argument("--no-progress", dest="progress", action="store_false",
+                             help="do not show the live progress line on stderr")
+    add_metrics_arguments(sort_parser)
+    sort_parser.set_defaults(handler=command_sort)
+
+    watch_parser = subparsers.add_parser("watch", help="sort new files as they arrive in the sorting folder")
+    watch_parser.add_argument("folder", nargs="?", help="folder to watch (default: 0.1 Sorting Folder)")
+    watch_parser.add_argument("--jobs", type=int, default=None, help="transfer workers per destination device")
+    watch_parser.add_argument("--settle", type=float, default=1.0,
+                              help="seconds to wait after a file is closed before sorting it")
+    watch_parser.add_argument("--stable", type=float, default=5.0,
+                              help="seconds a file's size must stay unchanged when no close event is seen")
+    watch_parser.add_argument("--json", action="store_true", help="print one JSON summary line per batch")
+    add_metrics_arguments(watch_parser)
+    watch_parser.set_defaults(handler=command_watch)
+
+    dupes_parser = subparsers.add_parser("dupes", help="find byte-identical files under one or more folders")
+    dupes_parser.add_argument("roots", nargs="+", help="folders to scan recursively")
+    dupes_parser.add_argument("--json", action="store_true", help="print a machine-readable JSON summary")
+    dupes_parser.set_defaults(handler=command_dupes)
+
+    resume_parser = subparsers.add_parser("resume", help="finish sort batches that were interrupted by a crash")
+    resume_parser.add_argument("--list", action="store_true", help="only list interrupted batches")
+    resume_parser.add_argument("--jobs", type=int, default=None, help="transfer workers per destination device")
+    resume_parser.add_argument("--json", action="store_true", help="print a machine-readable JSON summary")
+    resume_parser.add_argument("--no-progress", dest="progress", action="store_false",
+                               help="do not show the live progress line on stderr")
+    add_metrics_arguments(resume_parser)
+    resume_parser.set_defaults(handler=command_resume)
+
+    return parser
+
+# MAIN ENTRY POINT:
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    setup_logging()
+    if getattr(args, "jobs", None) is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    try:
+        setup_metrics(args)
+        if getattr(args, "profile", None):
+            with profiled(args.profile):
+                return args.handler(args)
+        return args.handler(args)
+    except KeyboardInterrupt:
+        print("Interrupted.", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        logging.error(f"mediasorter {args.command} failed: {e}")
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
@@ -1,73 +1,93 @@
-# movie_handler.py v3.0
+# movie_handler.py v3.4
 
 import os
+import time
 import logging
 from pathlib import Path
-
-# LOGGING SETUP:
-# Configures logging to write to movie_sorter_log.txt
-log_file = "movie_sorter_log.txt"
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+from file_sorter_code import media_classifier
+from catalog.media_catalog import get_media_catalog, movie_row
+from file_sorter_code.transfer_engine import place_file, keeps_source
+from file_sorter_code.sort_metrics import get_sort_metrics
+from log_code.log_setup import setup_logging, log_event
 
 # MOVIE NAME PARSER:
-# Extracts movie name and year from filenames using regex
+# Extracts movie name and year from filenames using the shared classifier
 def parse_movie_name(file_name):
     """Extract movie name and year from the file name."""
-    import re
-
-    # Default values
-    name, year = "Unknown", ""
+    return media_classifier.parse_movie_name(file_name)
 
-    # Regex pattern to match movie name and year
-    match = re.search(r"^(.*?)(?:\.|\s|-)?(\d{4})(?:\.|\s|$|_)", file_name)
-    if match:
-        name = match.group(1).strip().replace('.', ' ').replace('_', ' ')
-        year = f"({match.group(2)})"  # Format year in brackets
+# MOVIE DESTINATION:
+# Works out the standardized folder and filename for a movie without touching the disk
+def movie_destination(file_path, movies_folder):
+    file_path = Path(file_path)
+    name, year = parse_movie_name(file_path.name)
+    if year:  # Include year only if it exists
+        movie_folder = Path(movies_folder) / f"{name} {year}"
+        formatted_name = f"{name} {year}{file_path.suffix}"
     else:
-        # Handle files without a clear year
-        name = file_name.rsplit(".", 1)[0].replace('.', ' ').replace('_', ' ').strip()
-
-    # Clean up name to remove trailing dashes or extra spaces
-    name = re.sub(r"[-\s]+$", "", name)
-
-    return name, year
+        movie_folder = Path(movies_folder) / f"{name}"
+        formatted_name = f"{name}{file_path.suffix}"
+    return movie_folder / formatted_name
 
 # MOVIE SORTING FUNCTION:
 # Moves a movie file to the appropriate folder with standardized naming
 def sort_movie(file_path, movies_folder):
     """Sort a movie file into the appropriate folder and format the filename."""
     file_path = Path(file_path)
-    if not file_path.is_file():
-        logging.warning(f"Invalid file path: {file_path}")
+    metrics = get_sort_metrics()
+    with metrics.time("movies", "stat"):
+        is_file = file_path.is_file()
+    if not is_file:
+        metrics.count_file("movies", "skipped")
+        with metrics.time("movies", "log"):
+            log_event("movies", file_path, "movie", "skipped", message=f"Invalid file path: {file_path}",
+                      level=logging.WARNING)
         return False
 
-    name, year = parse_movie_name(file_path.name)
-    if year:  # Include year only if it exists
-        movie_folder = Path(movies_folder) / f"{name} {year}"
-        formatted_name = f"{name} {year}{file_path.suffix}"
-    else:
-        movie_folder = Path(movies_folder) / f"{name}"
-        formatted_name = f"{name}{file_path.suffix}"
+    with metrics.time("movies", "parse"):
+        destination = movie_destination(file_path, movies_folder)
 
-    movie_folder.mkdir(parents=True, exist_ok=True)
+    # Indexed duplicate check against the movie library
+    catalog = get_media_catalog()
+    with metrics.time("movies", "catalog"):
+        catalog.ensure_bootstrapped(movies_folder, "movies")
+    with metrics.time("movies", "exists"):
+        duplicate = catalog.is_duplicate(destination)
+    if duplicate:
+        metrics.count_file("movies", "unsorted")
+        with metrics.time("movies", "log"):
+            log_event("movies", file_path, "duplicate", "unsorted", destination=destination, level=logging.WARNING,
+                      message=f"Duplicate movie, not moving {file_path}: {destination} already exists")
+        return False
 
-    destination = movie_folder / formatted_name
+    with metrics.time("movies", "mkdir"):
+        destination.parent.mkdir(parents=True, exist_ok=True)
     try:
-        file_path.rename(destination)
-        logging.info(f"Moved {file_path} to {destination}")
+        size = os.stat(file_path).st_size
+        start = time.perf_counter()
+        strategy = place_file(file_path, destination)
+        duration = time.perf_counter() - start
+        metrics.observe("movies", "transfer", duration)
+        metrics.count_file("movies", "sorted", size)
+        verb = "Placed" if keeps_source(file_path) else "Moved"
+        with metrics.time("movies", "log"):
+            log_event("movies", file_path, "movie", "sorted", size, duration, destination,
+                      f"{verb} {file_path} to {destination} ({strategy})", strategy=strategy)
+        with metrics.time("movies", "catalog"):
+            catalog.add_movies([movie_row(destination, size)])
         return True
     except Exception as e:
-        logging.error(f"Failed to move {file_path} to {destination}: {e}")
+        metrics.count_error("movies", "transfer")
+        metrics.count_file("movies", "failed")
+        log_event("movies", file_path, "movie", "failed", destination=destination, level=logging.ERROR,
+                  message=f"Failed to move {file_path} to {destination}: {e}")
         return False
 
 # TEST CODE:
 # Example usage for testing the movie sorting functionality
 if __name__ == "__main__":
     # Example usage for testing
+    setup_logging()
     test_file = "Harlock Space Pirate 2013.mkv"
     test_movies_folder = "Sorted Movies"
     sort_movie(test_file, test_movies_folder)
\ No newline at end of file
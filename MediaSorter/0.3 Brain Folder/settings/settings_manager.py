@@ -1,28 +1,33 @@
-from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton, QFileDialog, QLineEdit, QHBoxLayout, QCheckBox, QMessageBox
-import json
-from pathlib import Path
+from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QPushButton, QFileDialog, QLineEdit, QHBoxLayout, QCheckBox, QMessageBox, QComboBox
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
 import os
+from settings.settings_service import get_settings_service, SETTINGS_FILE, DEFAULT_SETTINGS
 
-settings_file = Path("settings/user_settings.json")
+# Copy verification choices shown in the settings tab (see transfer_engine.py)
+VERIFICATION_CHOICES = [
+    ("off", "Off (fastest)"),
+    ("checksum", "Checksum while copying"),
+    ("reread", "Checksum and re-read the copy from disk"),
+]
+
+# Placement choices shown in the settings tab (see transfer_engine.py)
+PLACEMENT_CHOICES = [
+    ("move", "Move files into the library"),
+    ("link", "Keep originals (hardlink/reflink, copy if neither works)"),
+]
+
+settings_file = SETTINGS_FILE
+
+# Carries settings changes to the GUI thread: the service may notice a change
+# on a sort or ingest worker, and widgets can only be touched from the GUI thread
+class SettingsChangeBridge(QObject):
+    changed = pyqtSignal(dict)
 
 def load_settings():
-    if settings_file.exists():
-        try:
-            with open(settings_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-    return {"season_sort_path": "", "movie_sort_path": "", "use_season_folder": False}
+    return get_settings_service().all()
 
 def save_settings(data):
-    try:
-        settings_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(settings_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
-        return True
-    except Exception as e:
-        print(f"Error saving settings: {e}")
-        return False
+    return get_settings_service().save(data)
 
 def get_settings_widget():
     widget = QWidget()
@@ -127,10 +132,58 @@ def get_settings_widget():
     movie_button.clicked.connect(set_movie_path)
     movie_input.editingFinished.connect(update_movie_path_manually)
 
+    # Copy verification (only used when a file is copied to another drive)
+    verification_layout = QHBoxLayout()
+    verification_label = QLabel("Verify copies to other drives:")
+    verification_box = QComboBox()
+    for mode, label in VERIFICATION_CHOICES:
+        verification_box.addItem(label, mode)
+
+    def show_verification(mode):
+        index = verification_box.findData(mode)
+        verification_box.setCurrentIndex(index if index >= 0 else verification_box.findData(DEFAULT_SETTINGS["copy_verification"]))
+
+    show_verification(settings.get("copy_verification"))
+    verification_layout.addWidget(verification_label)
+    verification_layout.addWidget(verification_box)
+
+    def update_verification():
+        settings["copy_verification"] = verification_box.currentData()
+        if not save_settings(settings):
+            QMessageBox.warning(widget, "Settings Error",
+                               "Failed to save copy verification setting")
+
+    verification_box.currentIndexChanged.connect(update_verification)
+
+    # Placement mode (keep originals outside MediaSorter, e.g. for seeding)
+    placement_layout = QHBoxLayout()
+    placement_label = QLabel("Placing sorted files:")
+    placement_box = QComboBox()
+    for mode, label in PLACEMENT_CHOICES:
+        placement_box.addItem(label, mode)
+
+    def show_placement(mode):
+        index = placement_box.findData(mode)
+        placement_box.setCurrentIndex(index if index >= 0 else placement_box.findData(DEFAULT_SETTINGS["placement_mode"]))
+
+    show_placement(settings.get("placement_mode"))
+    placement_layout.addWidget(placement_label)
+    placement_layout.addWidget(placement_box)
+
+    def update_placement():
+        settings["placement_mode"] = placement_box.currentData()
+        if not save_settings(settings):
+            QMessageBox.warning(widget, "Settings Error",
+                               "Failed to save placement setting")
+
+    placement_box.currentIndexChanged.connect(update_placement)
+
     # Add all components to the main layout
     layout.addWidget(use_season_toggle)
     layout.addLayout(season_layout)
     layout.addLayout(movie_layout)
+    layout.addLayout(placement_layout)
+    layout.addLayout(verification_layout)
     
     # Save button
     save_button = QPushButton("Save All Settings")
@@ -155,6 +208,8 @@ def get_settings_widget():
             settings["season_sort_path"] = season_path
             settings["movie_sort_path"] = movie_path
             settings["use_season_folder"] = use_season_toggle.isChecked()
+            settings["copy_verification"] = verification_box.currentData()
+            settings["placement_mode"] = placement_box.currentData()
             
             if save_settings(settings):
                 QMessageBox.information(widget, "Settings Saved", "All settings saved successfully")
@@ -163,6 +218,31 @@ def get_settings_widget():
     
     save_button.clicked.connect(save_all_settings)
     layout.addWidget(save_button)
+
+    # Keep the fields in sync when the settings file changes elsewhere
+    def on_settings_changed(data):
+        settings.clear()
+        settings.update(data)
+        use_season_toggle.blockSignals(True)
+        use_season_toggle.setChecked(bool(data.get("use_season_folder", False)))
+        use_season_toggle.blockSignals(False)
+        for field, key in ((season_input, "season_sort_path"), (movie_input, "movie_sort_path")):
+            field.blockSignals(True)
+            field.setText(data.get(key, ""))
+            field.blockSignals(False)
+        verification_box.blockSignals(True)
+        show_verification(data.get("copy_verification"))
+        verification_box.blockSignals(False)
+        placement_box.blockSignals(True)
+        show_placement(data.get("placement_mode"))
+        placement_box.blockSignals(False)
+
+    bridge = SettingsChangeBridge(widget)
+    bridge.changed.connect(on_settings_changed, Qt.QueuedConnection)
+    notify = bridge.changed.emit
+    service = get_settings_service()
+    service.subscribe(notify)
+    widget.destroyed.connect(lambda: service.unsubscribe(notify))
     
     widget.setLayout(layout)
     return widget
\ No newline at end of file
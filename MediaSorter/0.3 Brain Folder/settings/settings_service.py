@@ -0,0 +1,255 @@
+# settings_service.py v1.3
+# Loads user_settings.json once, caches the parsed and validated values,
+# and reloads only when the file changes on disk
+
+import json
+import os
+import time
+import logging
+import threading
+from pathlib import Path
+
+# The settings file always lives next to this module, whatever the working directory
+SETTINGS_FILE = Path(__file__).resolve().parent / "user_settings.json"
+
+DEFAULT_SETTINGS = {
+    "season_sort_path": "",
+    "movie_sort_path": "",
+    "use_season_folder": False,
+    "device_concurrency": {},
+    "copy_verification": "checksum",
+    "placement_mode": "move",
+}
+
+# How cross-device copies are checked (see transfer_engine.py):
+#   off       plain kernel copy, nothing recorded
+#   checksum  hash the data as it is copied and record it (one read)
+#   reread    also re-read the copy from disk and compare before deleting the source
+COPY_VERIFICATION_MODES = ("off", "checksum", "reread")
+
+# How sorted files reach the library:
+#   move  rename, or copy and delete the original
+#   link  leave originals from outside MediaSorter in place (e.g. still seeding)
+#         and hardlink, reflink or, failing both, copy them into the library
+PLACEMENT_MODES = ("move", "link")
+
+# Default season folder returned when no valid custom folder is configured
+DEFAULT_SEASON_FOLDER = "0.1 Sorting Folder"
+
+# SETTINGS SERVICE CLASS:
+# Single cached view of the settings file. Without a file watcher the file's
+# mtime is checked at most once every check_interval seconds. Once
+# attach_watcher() is called, reloads are driven by QFileSystemWatcher instead
+# and reads never touch the disk.
+class SettingsService:
+    def __init__(self, path=SETTINGS_FILE, check_interval=2.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._data = None
+        self._mtime = None
+        self._last_check = 0.0
+        self._use_season_folder = False
+        self._season_folder_path = DEFAULT_SEASON_FOLDER
+        self._device_concurrency = {}
+        self._copy_verification = DEFAULT_SETTINGS["copy_verification"]
+        self._placement_mode = DEFAULT_SETTINGS["placement_mode"]
+        self._subscribers = []
+        self._watcher = None
+
+    # LOADING AND VALIDATION:
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        data = dict(DEFAULT_SETTINGS)
+        if self.path.exists():
+            try:
+                data.update(json.loads(self.path.read_text(encoding="utf-8")))
+            except Exception as e:
+                logging.error(f"Error reading settings: {e}")
+        self._apply(data)
+
+    def _apply(self, data):
+        # Validate once per load instead of once per call
+        season_path = data.get("season_sort_path") or ""
+        season_path_valid = bool(season_path) and os.path.exists(season_path)
+        if season_path and not season_path_valid:
+            logging.warning(f"Custom season path doesn't exist: {season_path}")
+
+        concurrency = data.get("device_concurrency") or {}
+        if not isinstance(concurrency, dict):
+            logging.warning("device_concurrency setting must map folder paths to worker counts")
+            concurrency = {}
+        try:
+            concurrency = {path: int(workers) for path, workers in concurrency.items()}
+        except (TypeError, ValueError) as e:
+            logging.error(f"Error getting device concurrency: {e}")
+            concurrency = {}
+
+        verification = data.get("copy_verification")
+        if verification not in COPY_VERIFICATION_MODES:
+            logging.warning(f"Unknown copy_verification setting {verification!r}, "
+                            f"using {DEFAULT_SETTINGS['copy_verification']!r}")
+            verification = DEFAULT_SETTINGS["copy_verification"]
+
+        placement = data.get("placement_mode")
+        if placement not in PLACEMENT_MODES:
+            logging.warning(f"Unknown placement_mode setting {placement!r}, "
+                            f"using {DEFAULT_SETTINGS['placement_mode']!r}")
+            placement = DEFAULT_SETTINGS["placement_mode"]
+
+        self._data = data
+        self._use_season_folder = bool(data.get("use_season_folder")) and season_path_valid
+        self._season_folder_path = season_path if season_path_valid else DEFAULT_SEASON_FOLDER
+        self._device_concurrency = concurrency
+        self._copy_verification = verification
+        self._placement_mode = placement
+
+    def _ensure_fresh(self):
+        changed = False
+        with self._lock:
+            if self._data is None:
+                self._mtime = self._file_mtime()
+                self._last_check = time.monotonic()
+                self._load()
+                return
+            if self._watcher is not None:
+                return
+            now = time.monotonic()
+            if now - self._last_check < self.check_interval:
+                return
+            self._last_check = now
+            mtime = self._file_mtime()
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self._load()
+                changed = True
+        if changed:
+            self._notify()
+
+    def reload(self):
+        """Force a re-read of the settings file and notify subscribers."""
+        with self._lock:
+            self._mtime = self._file_mtime()
+            self._last_check = time.monotonic()
+            self._load()
+        self._notify()
+
+    # READ ACCESS:
+    def all(self):
+        """Return a copy of the raw settings dict."""
+        self._ensure_fresh()
+        with self._lock:
+            return dict(self._data)
+
+    def get(self, key, default=None):
+        self._ensure_fresh()
+        with self._lock:
+            return self._data.get(key, default)
+
+    def use_season_folder(self):
+        self._ensure_fresh()
+        return self._use_season_folder
+
+    def season_folder_path(self):
+        self._ensure_fresh()
+        return self._season_folder_path
+
+    def device_concurrency(self):
+        self._ensure_fresh()
+        return dict(self._device_concurrency)
+
+    def copy_verification(self):
+        self._ensure_fresh()
+        return self._copy_verification
+
+    def placement_mode(self):
+        self._ensure_fresh()
+        return self._placement_mode
+
+    # WRITE ACCESS:
+    def save(self, data):
+        """Write data to the settings file, update the cache and notify subscribers."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+        except Exception as e:
+            logging.error(f"Error saving settings: {e}")
+            return False
+        with self._lock:
+            merged = dict(DEFAULT_SETTINGS)
+            merged.update(data)
+            self._apply(merged)
+            self._mtime = self._file_mtime()
+            self._last_check = time.monotonic()
+        self._notify()
+        return True
+
+    def update(self, **changes):
+        data = self.all()
+        data.update(changes)
+        return self.save(data)
+
+    # CHANGE NOTIFICATION:
+    # Subscribers are called with a copy of the settings dict, on the thread that
+    # noticed the change. Before attach_watcher() that can be any thread that
+    # reads a setting, so Qt subscribers must hand the change to the GUI thread
+    # themselves (settings_manager does it with a queued signal)
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _notify(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            data = dict(self._data)
+        for callback in subscribers:
+            try:
+                callback(data)
+            except Exception as e:
+                logging.error(f"Settings subscriber failed: {e}")
+
+    def attach_watcher(self):
+        """Use a QFileSystemWatcher to drive reloads. Needs a running QApplication."""
+        if self._watcher is not None:
+            return self._watcher
+        from PyQt5.QtCore import QFileSystemWatcher
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        watcher = QFileSystemWatcher()
+        watcher.addPath(str(self.path.parent))
+        if self.path.exists():
+            watcher.addPath(str(self.path))
+
+        def on_change(_):
+            # Editors that replace the file drop it from the watch list
+            if self.path.exists() and str(self.path) not in watcher.files():
+                watcher.addPath(str(self.path))
+            if self._file_mtime() != self._mtime:
+                self.reload()
+
+        watcher.fileChanged.connect(on_change)
+        watcher.directoryChanged.connect(on_change)
+        self._ensure_fresh()
+        self._watcher = watcher
+        return watcher
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_settings_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SettingsService()
+        return _service
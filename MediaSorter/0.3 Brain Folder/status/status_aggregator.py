@@ -0,0 +1,176 @@
+# status_aggregator.py v1.2
+# Keeps running status counters from the sort events log (sort_events.jsonl).
+# Only the part of the log written since the last refresh is read; counters
+# and the byte offset are kept in a small state file next to the log.
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+
+from log_code.log_setup import EVENTS_FILE
+
+LOG_FILE = EVENTS_FILE
+STATE_FILE_NAME = "status_state.json"
+
+# Pipelines whose events count as processed files (ingest moves don't)
+COUNTED_PIPELINES = {"tv", "movies"}
+
+# Bytes at the start of the log used to notice a log that was truncated and rewritten
+SIGNATURE_SIZE = 64
+
+# STATUS AGGREGATOR CLASS:
+class StatusAggregator:
+    def __init__(self, log_path=LOG_FILE, state_path=None):
+        self.log_path = Path(log_path)
+        self.state_path = Path(state_path) if state_path else self.log_path.with_name(STATE_FILE_NAME)
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+
+    # STATE FILE:
+    def _empty_state(self):
+        return {"inode": None, "offset": 0, "signature": "",
+                "total": 0, "sorted": 0, "unsorted": 0, "bytes": 0, "last_file": "N/A"}
+
+    def _load_state(self):
+        state = self._empty_state()
+        try:
+            state.update(json.loads(self.state_path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Status state unreadable, rebuilding from log: {e}")
+        return state
+
+    def _save_state(self):
+        try:
+            tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+            tmp_path.write_text(json.dumps(self._state), encoding="utf-8")
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logging.error(f"Failed to save status state: {e}")
+
+    # LOG READING:
+    def _signature(self, path):
+        try:
+            with open(path, "rb") as f:
+                return f.read(SIGNATURE_SIZE).hex()
+        except OSError:
+            return ""
+
+    def _consume(self, path, offset):
+        """Count complete lines from offset onward. Returns the new offset."""
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for raw_line in f:
+                # Leave a half-written last line for the next refresh
+                if not raw_line.endswith(b"\n"):
+                    break
+                offset += len(raw_line)
+                self._count_line(raw_line.decode("utf-8", errors="replace").rstrip("\r\n"))
+        return offset
+
+    def _count_line(self, line):
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return
+        if event.get("pipeline") not in COUNTED_PIPELINES:
+            return
+        state = self._state
+        state["total"] += 1
+        state["last_file"] = os.path.basename(event.get("file") or "") or state["last_file"]
+        if event.get("outcome") == "sorted":
+            state["sorted"] += 1
+            state["bytes"] += event.get("bytes") or 0
+        elif event.get("outcome") in ("unsorted", "failed"):
+            state["unsorted"] += 1
+
+    def _rotated_paths(self):
+        """Rotated copies of the log (sort_events.jsonl.1, .2, ...), oldest first."""
+        numbered = []
+        for candidate in self.log_path.parent.glob(self.log_path.name + ".*"):
+            suffix = candidate.name[len(self.log_path.name) + 1:]
+            if suffix.isdigit():
+                numbered.append((int(suffix), candidate))
+        return [path for _, path in sorted(numbered, reverse=True)]
+
+    def _consume_rotated(self, inode, offset):
+        """
+        Finish the rotated copy of the log we were reading, then every copy
+        rotated after it. If that copy is gone (rotated past backupCount),
+        every rotated copy left is newer and is read whole.
+        """
+        rotated = self._rotated_paths()
+        start = 0
+        for index, path in enumerate(rotated):
+            try:
+                if os.stat(path).st_ino == inode:
+                    start = index
+                    break
+            except OSError:
+                continue
+        else:
+            offset = 0
+        for path in rotated[start:]:
+            try:
+                self._consume(path, offset)
+            except OSError as e:
+                logging.warning(f"Could not read rotated log {path}: {e}")
+            offset = 0
+
+    # PUBLIC API:
+    def refresh(self):
+        """Read any new log lines and return the current counters."""
+        with self._lock:
+            state = self._state
+            try:
+                stat = os.stat(self.log_path)
+            except FileNotFoundError:
+                return self.counts()
+
+            signature = self._signature(self.log_path)
+            same_file = stat.st_ino == state["inode"]
+            overlap = min(len(signature), len(state["signature"]))
+            truncated = stat.st_size < state["offset"] or signature[:overlap] != state["signature"][:overlap]
+
+            if state["inode"] is not None and not same_file:
+                # Rotated (maybe more than once): catch up on the rotated copies first
+                self._consume_rotated(state["inode"], state["offset"])
+                state["offset"] = 0
+            elif truncated:
+                state["offset"] = 0
+
+            state["offset"] = self._consume(self.log_path, state["offset"])
+            state["inode"] = stat.st_ino
+            state["signature"] = self._signature(self.log_path)
+            self._save_state()
+            return self.counts()
+
+    def counts(self):
+        state = self._state
+        return {"total": state["total"], "sorted": state["sorted"], "unsorted": state["unsorted"],
+                "bytes": state.get("bytes", 0), "last_file": state["last_file"]}
+
+    def reset(self):
+        """Forget all counters and re-read the current log from the start."""
+        with self._lock:
+            self._state = self._empty_state()
+        return self.refresh()
+
+# SUMMARY FORMATTING:
+def format_summary(counts):
+    return (f"Total Files Processed: {counts['total']}\nSorted: {counts['sorted']}\n"
+            f"Unsorted: {counts['unsorted']}\nData Sorted: {counts['bytes'] / (1024 ** 3):.2f} GB\n"
+            f"Last File: {counts['last_file']}")
+
+_aggregators = {}
+_aggregators_lock = threading.Lock()
+
+def get_status_aggregator(log_path=LOG_FILE):
+    key = str(Path(log_path).resolve())
+    with _aggregators_lock:
+        if key not in _aggregators:
+            _aggregators[key] = StatusAggregator(log_path)
+        return _aggregators[key]